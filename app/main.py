@@ -14,8 +14,10 @@ from app.ui.sidebar import render_sidebar
 from app.ui.context_input import render_context_input
 from app.ui.property_input import render_property_input
 from app.ui.template_input import render_template_input
-from app.ui.render_output import render_output
+from app.ui.render_output import render_output_section
 from app.ui.api_actions import render_api_actions
+from app.utils.ui.sections import render_section, start_app_run, finish_app_run
+from app.utils.diagnostics.metrics import start_metrics_exporters
 
 def main():
     """
@@ -24,7 +26,8 @@ def main():
     This function:
     1. Sets up the page configuration
     2. Initializes the session state
-    3. Renders the UI components in the correct order
+    3. Renders the UI components in the correct order, each section as a
+       fragment so interacting with it reruns only that section
     
     Returns:
         None
@@ -42,53 +45,72 @@ def main():
     # Initialize session state
     initialize_session_state()
     
-    # Render sidebar (login and connection controls)
-    render_sidebar()
+    # Start the Prometheus metrics endpoint or file, if configured (once per process)
+    start_metrics_exporters()
+    start_app_run()
     
-    # Create a container for the main content
-    with st.container():
-        # Apply custom CSS for bordered containers
-        st.markdown(
-            '''
-            <style>
-            .bordered-container {
-                border: 1px solid #CCCCCC;
-                padding: 10px;
-                border-radius: 5px;
-            }
-            </style>
-            ''',
-            unsafe_allow_html=True,
-        )
+    # Record the run even when a section stops it with st.rerun(), st.stop() or an error
+    try:
+        # Render sidebar (login and connection controls); its selections apply to
+        # every section, so it only runs with the whole app
+        render_section("sidebar", render_sidebar, fragment=False)
         
-        # Create two columns for context and property inputs
-        col1, col2 = st.columns(2)
+        # Create a container for the main content
+        with st.container():
+            # Apply custom CSS for bordered containers
+            st.markdown(
+                '''
+                <style>
+                .bordered-container {
+                    border: 1px solid #CCCCCC;
+                    padding: 10px;
+                    border-radius: 5px;
+                }
+                </style>
+                ''',
+                unsafe_allow_html=True,
+            )
+            
+            # Create two columns for context and property inputs
+            col1, col2 = st.columns(2)
+            
+            with col1:
+                # Render context input component
+                render_section("context", render_context_input)
+            
+            with col2:
+                # Render property input component
+                render_section("property_set", render_property_input)
         
-        with col1:
-            # Render context input component
-            render_context_input()
+        # Add a divider
+        st.divider()
         
-        with col2:
-            # Render property input component
-            render_property_input()
-    
-    # Add a divider
-    st.divider()
-    
-    # Render template input component
+        # Render template input and output components; editing the template
+        # reruns only this section
+        render_section("template", render_template_section)
+        
+        # Add a divider
+        st.divider()
+        
+        # Render API actions component
+        render_section("api_actions", render_api_actions)
+    finally:
+        finish_app_run()
+
+def render_template_section():
+    """
+    Render the template editor and the rendered output.
+
+    Returns:
+        None
+    """
     render_template_input()
     
     # Add a divider
     st.divider()
     
-    # Render output component
-    render_output()
-    
-    # Add a divider
-    st.divider()
-    
-    # Render API actions component
-    render_api_actions()
+    # The output polls a debounced render while it is pending
+    render_output_section()
 
 if __name__ == "__main__":
     main()
\ No newline at end of file
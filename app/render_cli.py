@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Render configlet templates against device context files from the command line.
+
+Renders every template against every context file (and every property set,
+if given) with the same semantics as the app, in parallel across cores. One
+line per render is printed as soon as its context file is done, and the
+exit status is 1 if any render failed, so the command can gate CI.
+
+Usage:
+    python -m app.render_cli templates/ --contexts contexts/ [--property-set props.yaml]
+                             [--output-dir rendered/] [--results results.jsonl]
+                             [--profile profile.json] [--workers 8] [--quiet]
+"""
+
+import argparse
+import sys
+import time
+
+from app.utils.data import json_backend
+from app.utils.data.batch_render import (
+    TEMPLATE_SUFFIXES,
+    CONTEXT_SUFFIXES,
+    PROPERTY_SET_SUFFIXES,
+    find_files,
+    find_output_collisions,
+    relative_names,
+    run_batch,
+    merge_batch_profiles,
+)
+
+def parse_args(argv=None):
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("templates", nargs="+", help="Template files, or directories of .j2 templates")
+    parser.add_argument("--contexts", nargs="+", required=True,
+                        help="Device context JSON files, or directories of them")
+    parser.add_argument("--property-set", nargs="+", default=[], dest="property_sets",
+                        help="Property set JSON/YAML files; every template is rendered once per property set")
+    parser.add_argument("--output-dir", help="Write rendered outputs to <dir>/<context>/<template>.txt, "
+                                             "keeping the directories below the input directories")
+    parser.add_argument("--results", help="Append one JSON line per render to this file as results arrive")
+    parser.add_argument("--profile", help="Profile every render and write the reports merged per template to this JSON file")
+    parser.add_argument("--workers", type=int, help="Number of worker processes (defaults to the CPU count)")
+    parser.add_argument("--quiet", action="store_true", help="Only print failures and the summary")
+    return parser.parse_args(argv)
+
+def format_result(result):
+    """Format one render result as a line of output."""
+    name = f"{result['context']}  {result['template']}"
+    if result["property_set"]:
+        name += f"  {result['property_set']}"
+    if result["error"]:
+        return f"FAIL  {name}: {result['error']}"
+    return f"OK    {name}  {result['lines']} lines  {result['render_time'] * 1000:.1f} ms"
+
+def main(argv=None):
+    """
+    Run the batch render.
+
+    Args:
+        argv (list, optional): Command line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        int: Exit status, 0 if every render succeeded and 1 otherwise
+    """
+    args = parse_args(argv)
+    start = time.perf_counter()
+
+    templates = find_files(args.templates, TEMPLATE_SUFFIXES)
+    contexts = find_files(args.contexts, CONTEXT_SUFFIXES)
+    property_sets = find_files(args.property_sets, PROPERTY_SET_SUFFIXES)
+    if not templates or not contexts:
+        print("No templates or context files found.", file=sys.stderr)
+        return 1
+    if args.output_dir:
+        collisions = find_output_collisions(
+            relative_names(templates), relative_names(contexts), relative_names(property_sets)
+        )
+        if collisions:
+            for collision in collisions:
+                print(f"Output collision: {collision}", file=sys.stderr)
+            return 1
+
+    rendered = failed = 0
+    profiled = []
+    results_file = open(args.results, "a", encoding="utf-8") if args.results else None
+    try:
+        for result in run_batch(templates, contexts, property_sets, args.output_dir, args.workers,
+                                profile=bool(args.profile)):
+            if result["error"]:
+                failed += 1
+            else:
+                rendered += 1
+            if result["error"] or not args.quiet:
+                print(format_result(result), flush=True)
+            if args.profile:
+                profiled.append({"template": result["template"], "profile": result.pop("profile", None)})
+            if results_file:
+                results_file.write(json_backend.dumps(result) + "\n")
+                results_file.flush()
+    finally:
+        if results_file:
+            results_file.close()
+
+    if args.profile:
+        with open(args.profile, "w", encoding="utf-8") as profile_file:
+            profile_file.write(json_backend.dumps(merge_batch_profiles(profiled), indent=True))
+
+    print(f"\n{rendered} rendered, {failed} failed in {time.perf_counter() - start:.2f} s "
+          f"({len(templates)} templates, {len(contexts)} contexts, {max(len(property_sets), 1)} property sets)")
+    return 1 if failed else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
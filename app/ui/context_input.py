@@ -2,13 +2,19 @@ import streamlit as st
 import json
 from typing import Dict, Any, Optional
 import base64
+from functools import partial
 
-from app.utils.config.session_state import get_state
+from app.utils.config.session_state import get_state, get_derived_value
 from app.utils.config.example_data import EXAMPLE_DEVICE_CONTEXT
 from app.utils.api.apstra_client import *
 from app.utils.data.data_helpers import *
-from app.utils.ui.json_display_controls import render_json_controls
+from app.utils.data import json_backend
+from app.utils.data.json_stream import load_json_stream
+from app.utils.data.json_tree import container_depths
+from app.utils.data.search_index import build_search_index, search_json, search_result_depths, SEARCH_MATCH_MODES
+from app.utils.ui.json_viewer import render_json_viewer
 from app.utils.ui.apstra_context_loader import render_apstra_context_loader
+from app.utils.ui.sections import update_render_inputs
 
 
 
@@ -43,21 +49,28 @@ def render_context_input() -> None:
     if state.context_loaded and state.device_context_data:
         with st.expander("View Loaded Device Context", expanded=True):
             # Add search bar
-            search_query = st.text_input("Search Device Context", key="context_search")
+            search_col1, search_col2 = st.columns([4, 1])
             
-            # Filter JSON based on search query
+            with search_col1:
+                search_query = st.text_input("Search Device Context", key="context_search")
+            
+            with search_col2:
+                match_mode = st.selectbox("Match", list(SEARCH_MATCH_MODES), key="context_match_mode",
+                                          help="Match keys, values and paths containing, starting with or equal to the query")
+            
+            # Filter JSON based on search query using an index built once per loaded context
             if search_query:
-                filtered_context = filter_json(state.device_context_data, search_query)
+                search_index = get_derived_value(state, "context_search_index", state.device_context_data, build_search_index)
+                filtered_context = search_json(search_index, state.device_context_data, search_query,
+                                               SEARCH_MATCH_MODES[match_mode])
+                # Depths of the result come from the depths computed with the index
+                compute_depths = partial(search_result_depths, search_index)
             else:
                 filtered_context = state.device_context_data
+                compute_depths = container_depths
             
             # Create a separate container for JSON display and controls
             with st.container():
-                # Add the JSON controls
-                expansion_depth = render_json_controls(
-                    filtered_context, 
-                    prefix="context"
-                )
                 # Apply height constraint to the container
                 st.markdown(f"""
                 <style>
@@ -67,11 +80,15 @@ def render_context_input() -> None:
                     }}
                 </style>
                 """, unsafe_allow_html=True)
-                # Add some space between controls and JSON
-                st.markdown("<div style='margin-top: 1em;'></div>", unsafe_allow_html=True)
-                
-                # Display JSON with the selected expansion depth
-                st.json(filtered_context, expanded=expansion_depth)
+                # Display the JSON controls and the visible part of the context;
+                # search results keep their depths apart from the full context
+                render_json_viewer(
+                    state,
+                    filtered_context,
+                    prefix="context",
+                    depths_key="context_json_depths" if not search_query else "context_search_depths",
+                    compute_depths=compute_depths
+                )
             
             # Create some space before the Clear button
             st.markdown("<div style='margin-top: 1em;'></div>", unsafe_allow_html=True)
@@ -103,7 +120,7 @@ def render_context_input() -> None:
     def process_context_data(data, error_prefix="Error"):
         try:
             if isinstance(data, str):
-                context_data = json.loads(data)
+                context_data = json_backend.loads(data)
             else:
                 context_data = data
                 
@@ -113,11 +130,9 @@ def render_context_input() -> None:
             st.rerun()  # Rerun to show the expander view
             return True
         except json.JSONDecodeError as e:
-            state.context_error = f"{error_prefix} decoding JSON: {e}"
-            state.context_loaded = False
+            update_render_inputs(state, context_error=f"{error_prefix} decoding JSON: {e}", context_loaded=False)
         except Exception as e:
-            state.context_error = f"{error_prefix}: {e}"
-            state.context_loaded = False
+            update_render_inputs(state, context_error=f"{error_prefix}: {e}", context_loaded=False)
         
         return False
     
@@ -132,26 +147,30 @@ def render_context_input() -> None:
         
         if uploaded_context_file:
             try:
-                # Read file content
-                file_content = uploaded_context_file.getvalue().decode('utf-8')
+                # Parse the upload incrementally instead of decoding it to one large string
+                progress_bar = st.progress(0.0, text="Parsing device context...")
+                
+                def report_progress(bytes_read, total_bytes):
+                    if total_bytes:
+                        progress_bar.progress(min(bytes_read / total_bytes, 1.0),
+                                              text=f"Parsing device context... {bytes_read / (1024 * 1024):.1f} MiB")
                 
-                # Use the load_json_file helper function
-                data, error = load_json_file(file_content)
+                uploaded_context_file.seek(0)
+                data, error = load_json_stream(uploaded_context_file, progress=report_progress,
+                                               total_bytes=uploaded_context_file.size)
+                progress_bar.empty()
                 
                 if error:
-                    state.context_error = error
-                    state.context_loaded = False
+                    update_render_inputs(state, context_error=error, context_loaded=False)
                 else:
                     state.device_context_data = data
                     state.context_error = None
                     state.context_loaded = True
                     st.rerun()
             except UnicodeDecodeError:
-                state.context_error = "File encoding issue: Could not decode the file as UTF-8"
-                state.context_loaded = False
+                update_render_inputs(state, context_error="File encoding issue: Could not decode the file as UTF-8", context_loaded=False)
             except Exception as e:
-                state.context_error = f"Error reading file: {str(e)}"
-                state.context_loaded = False
+                update_render_inputs(state, context_error=f"Error reading file: {str(e)}", context_loaded=False)
                 
     elif context_input_method == "Paste Text":
         context_text = st.text_area(
@@ -168,7 +187,7 @@ def render_context_input() -> None:
                 if context_text:
                     success = process_context_data(context_text, "Error processing pasted Device Context")
                 else:
-                    state.context_error = "No JSON data provided"
+                    update_render_inputs(state, context_error="No JSON data provided")
                     
     elif context_input_method == "Example Device Config":
         if st.button("Load Example Data"):
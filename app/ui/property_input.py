@@ -11,13 +11,19 @@ import yaml
 from pathlib import Path
 from typing import Dict, Any, Optional, Tuple, Union
 import base64
+from functools import partial
 
-from app.utils.config.session_state import get_state
+from app.utils.config.session_state import get_state, get_derived_value
 from app.utils.config.example_data import EXAMPLE_PROPERTY_SET
 from app.utils.api.apstra_client import *
 from app.utils.data.data_helpers import *
 from app.utils.ui.json_display_controls import render_json_controls
+from app.utils.ui.json_viewer import render_json_viewer
 from app.utils.data.data_helpers import load_json_file, load_yaml_content
+from app.utils.data import json_backend
+from app.utils.data.json_tree import container_depths
+from app.utils.ui.sections import update_render_inputs
+from app.utils.data.search_index import build_search_index, search_json, search_result_depths, MATCH_EXACT, MATCH_SUBSTRING
 
 
 # Update your property_input.py file to integrate the Apstra property loader
@@ -91,23 +97,25 @@ def render_property_input() -> None:
                     
                     # Filter JSON based on search query
                     if search_query:
-                        filtered_property = filter_json(state.property_set_data, search_query, exact_match)
+                        search_index = get_derived_value(state, "property_search_index", state.property_set_data, build_search_index)
+                        filtered_property = search_json(search_index, state.property_set_data, search_query,
+                                                        MATCH_EXACT if exact_match else MATCH_SUBSTRING)
+                        # Depths of the result come from the depths computed with the index
+                        compute_depths = partial(search_result_depths, search_index)
                     else:
                         filtered_property = state.property_set_data
+                        compute_depths = container_depths
                     
                     # Create a separate container for JSON display
                     with st.container():
-                        # Add the JSON controls
-                        expansion_depth = render_json_controls(
-                            filtered_property, 
-                            prefix="property"
+                        # Display the JSON controls and the visible part of the property set
+                        render_json_viewer(
+                            state,
+                            filtered_property,
+                            prefix="property",
+                            depths_key="property_json_depths" if not search_query else "property_search_depths",
+                            compute_depths=compute_depths
                         )
-                        
-                        # Add some space between controls and JSON
-                        st.markdown("<div style='margin-top: 1em;'></div>", unsafe_allow_html=True)
-                        
-                        # Display JSON with the selected expansion depth
-                        st.json(filtered_property, expanded=expansion_depth)
                 else:  # YAML
                     # Display YAML
                     st.code(state.raw_prop_content_for_display, language='yaml')
@@ -145,9 +153,7 @@ def render_property_input() -> None:
     
     # Handle "None" selection immediately
     if prop_input_method == "None":
-        state.property_set_data = None
-        state.prop_error = None
-        state.prop_set_loaded = False
+        update_render_inputs(state, property_set_data=None, prop_error=None, prop_set_loaded=False)
         state.raw_prop_content_for_display = None
         st.info("No Property Set provided.")
         
@@ -188,8 +194,7 @@ def render_property_input() -> None:
                 
                 # Update state based on results
                 if error:
-                    state.prop_error = error
-                    state.prop_set_loaded = False
+                    update_render_inputs(state, prop_error=error, prop_set_loaded=False)
                 else:
                     state.property_set_data = data
                     state.prop_error = None
@@ -203,11 +208,9 @@ def render_property_input() -> None:
                     st.rerun()
                     
             except UnicodeDecodeError:
-                state.prop_error = "File encoding issue: Could not decode the file as UTF-8"
-                state.prop_set_loaded = False
+                update_render_inputs(state, prop_error="File encoding issue: Could not decode the file as UTF-8", prop_set_loaded=False)
             except Exception as e:
-                state.prop_error = f"Error reading file: {str(e)}"
-                state.prop_set_loaded = False
+                update_render_inputs(state, prop_error=f"Error reading file: {str(e)}", prop_set_loaded=False)
     
     elif prop_input_method == "Paste Text":
         pasted_prop_format = st.radio(
@@ -241,8 +244,7 @@ def render_property_input() -> None:
                         
                         # Update state based on results
                         if error:
-                            state.prop_error = error
-                            state.prop_set_loaded = False
+                            update_render_inputs(state, prop_error=error, prop_set_loaded=False)
                         else:
                             state.property_set_data = data
                             state.prop_error = None
@@ -255,11 +257,9 @@ def render_property_input() -> None:
                             st.rerun()
                             
                     except Exception as e:
-                        state.prop_error = f"Error processing pasted data: {str(e)}"
-                        state.prop_set_loaded = False
+                        update_render_inputs(state, prop_error=f"Error processing pasted data: {str(e)}", prop_set_loaded=False)
                 else:
-                    state.prop_error = "No data provided"
-                    state.prop_set_loaded = False
+                    update_render_inputs(state, prop_error="No data provided", prop_set_loaded=False)
     
     elif prop_input_method == "Example Property Set":
         if st.button("Load Example Data"):
@@ -268,8 +268,7 @@ def render_property_input() -> None:
                 data, error = load_json_file(EXAMPLE_PROPERTY_SET)
                 
                 if error:
-                    state.prop_error = error
-                    state.prop_set_loaded = False
+                    update_render_inputs(state, prop_error=error, prop_set_loaded=False)
                 else:
                     state.property_set_data = data
                     state.raw_prop_content_for_display = None
@@ -281,8 +280,7 @@ def render_property_input() -> None:
                     }
                     st.rerun()
             except Exception as e:
-                state.prop_error = f"Error loading example data: {str(e)}"
-                state.prop_set_loaded = False
+                update_render_inputs(state, prop_error=f"Error loading example data: {str(e)}", prop_set_loaded=False)
     
     # Display error if one occurred
     if state.prop_error:
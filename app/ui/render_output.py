@@ -10,18 +10,37 @@ import jinja2
 import pyperclip
 from typing import Dict, Any, Optional, Tuple
 
-from app.utils.config.session_state import get_state
-from app.utils.data.template_engine import render_template, deep_merge
+from app.utils.config.session_state import get_state, get_derived_value
+from app.utils.data.template_engine import render_template, deep_merge, template_source_hash
+from app.utils.data.data_helpers import fingerprint_data
+from app.utils.data.render_memo import RenderMemo
+from app.utils.data.live_render import DebouncedRenderer, POLL_INTERVAL_SECONDS
+from app.utils.data.template_profiler import TemplateProfiler
+from app.utils.data.output_pages import first_page
+from app.utils.ui.fleet_render_panel import render_fleet_render_panel
+from app.utils.ui.output_page_panel import render_output_page
+from app.utils.ui.profile_report_panel import render_profile_report
+from app.utils.ui.sections import render_section, section_rerunning
 
-def render_output() -> None:
+# How often the output section checks on a pending render
+LIVE_RENDER_POLL_SECONDS = POLL_INTERVAL_SECONDS * 2
+
+def render_output(render_status: Optional[tuple] = None) -> None:
     """
     Render the output UI component.
     
     This function handles:
-    - Template rendering using device context and property set
-    - Displaying rendered output
+    - Template rendering using device context and property set, debounced
+      while the template is being edited
+    - Displaying rendered output one page at a time, and the beginning of
+      large outputs while they are still rendering
     - Error handling for rendering issues
     - Download and copy functionality for output
+    - Optional per-line profile of the render, shown beside the output
+    - Fleet rendering against every switch in the selected blueprint
+    
+    Args:
+        render_status: Result of poll_render() for this run, polled here if omitted
     
     Returns:
         None
@@ -30,53 +49,46 @@ def render_output() -> None:
     state = get_state()
     
     # Get data from session state
-    device_context_data = getattr(state, 'device_context_data', None)
     property_set_data = getattr(state, 'property_set_data', None)
-    context_loaded = getattr(state, 'context_loaded', False)
     template_string = getattr(state, 'template_input', "")
-    
-    # Initialize render variables
-    rendered_output = ""
-    render_error = None
-    
-    # Check prerequisites
-    if not context_loaded:
-        render_error = "Device Context not loaded."
-    elif getattr(state, 'context_error', None):
-        render_error = f"Cannot render: {state.context_error}"
-    elif not isinstance(device_context_data, dict):
-        render_error = "Cannot render: Loaded Device Context is not a valid JSON object (dictionary)."
-    elif not template_string:
-        render_error = "Please provide a Jinja2 template."
-    # Property set check - only error if user *tried* to load one and failed
-    elif getattr(state, 'prop_set_loaded', False) and getattr(state, 'prop_error', None):
-        render_error = f"Cannot merge: {state.prop_error}"
-    elif getattr(state, 'prop_set_loaded', False) and property_set_data is not None and not isinstance(property_set_data, dict):
-        render_error = "Cannot merge: Loaded Property Set is not a valid JSON/YAML object (dictionary)."
-    
-    # If prerequisites are met, proceed with render
-    if not render_error:
-        try:
-            # Call template engine to handle rendering
-            rendered_output, error = render_template(
-                template_string=template_string,
-                device_context=device_context_data,
-                property_set=property_set_data
-            )
-            
-            if error:
-                render_error = error
-        except Exception as e:
-            render_error = f"An unexpected error occurred: {e}"
+    context_loaded = getattr(state, 'context_loaded', False)
+    device_context_data = getattr(state, 'device_context_data', None)
+    if render_status is None:
+        render_status = poll_render(state)
+    rendered_output, render_error, output_stale, render_key, partial_output = render_status
     
     # Display error if any
     if render_error:
         st.error(f"Processing Error: {render_error}")
     
+    # Profile the current render on request; renders without the toggle are not traced
+    profile_report = None
+    profile_enabled = st.toggle(
+        "Profile render", key="profile_render",
+        help="Time every template line, block and loop of the current render"
+    )
+    if profile_enabled and rendered_output and not output_stale and not render_error:
+        profile_report = get_render_profile(
+            state, render_key, template_string, device_context_data, property_set_data
+        )
+    
     # Display rendered output if available
     if rendered_output:
         with st.expander("Rendered Output", expanded=True):
-            st.code(rendered_output, language="text", line_numbers=True)
+            # Keep showing the last good output until the latest edit has rendered
+            if output_stale:
+                if render_error:
+                    st.caption("Stale: showing the last output that rendered without errors.")
+                else:
+                    st.caption("Stale: rendering the latest edits...")
+            if profile_report:
+                col_output, col_profile = st.columns(2)
+                with col_output:
+                    render_output_page(state, rendered_output)
+                with col_profile:
+                    render_profile_report(profile_report, key="render_output")
+            else:
+                render_output_page(state, rendered_output)
             
             # Copy to clipboard button
             if st.button("Copy to Clipboard"):
@@ -87,11 +99,22 @@ def render_output() -> None:
                     st.warning("`pyperclip` not installed. Please install it to use the copy button.")
                 except Exception as e:
                     st.error(f"Copy failed: {e}")
+    elif partial_output:
+        # Show the first page of a large output while the rest renders
+        with st.expander("Rendered Output", expanded=True):
+            rendered_lines = sum(chunk.count("\n") for chunk in partial_output)
+            st.caption(f"Rendering... {rendered_lines:,} lines so far")
+            st.code(first_page(partial_output), language="text", line_numbers=True)
+    elif state.live_render_wait is not None:
+        st.info("Rendering...")
     elif not render_error and context_loaded and template_string:
         st.info("Template rendered successfully, but the output is empty.")
     elif not render_error:
         st.info("Output will appear here once valid context and template are provided.")
     
+    # Render against every switch in the selected blueprint
+    render_fleet_render_panel(state, template_string, property_set_data)
+    
     # Download buttons
     st.divider()
     st.subheader("Download")
@@ -107,10 +130,169 @@ def render_output() -> None:
         )
     
     with col_dl2:
+        # The output is only handed over when the button is clicked, not copied on every rerun
         st.download_button(
             label="Download Rendered Output",
-            data=rendered_output,
+            data=lambda: rendered_output,
             file_name="rendered_config.txt",
             mime="text/plain",
-            disabled=not rendered_output or render_error is not None
-        )
\ No newline at end of file
+            disabled=not rendered_output or render_error is not None or output_stale
+        )
+
+def poll_render(state) -> Tuple[str, Optional[str], bool, Optional[tuple], list]:
+    """
+    Submit the current template, context and property set for rendering and
+    get the latest result.
+
+    Renders are debounced while the template is being edited, so the result
+    may belong to an earlier edit or still be pending; state.live_render_wait
+    is set while it is.
+
+    Args:
+        state: Application state object
+
+    Returns:
+        tuple: (rendered_output, render_error, output_stale, render_key, partial_output)
+    """
+    device_context_data = getattr(state, 'device_context_data', None)
+    property_set_data = getattr(state, 'property_set_data', None)
+    context_loaded = getattr(state, 'context_loaded', False)
+    template_string = getattr(state, 'template_input', "")
+    
+    # Initialize render variables
+    rendered_output = ""
+    render_error = None
+    output_stale = False
+    render_key = None
+    partial_output = []
+    state.live_render_wait = None
+    
+    # Check prerequisites
+    if not context_loaded:
+        render_error = "Device Context not loaded."
+    elif getattr(state, 'context_error', None):
+        render_error = f"Cannot render: {state.context_error}"
+    elif not isinstance(device_context_data, dict):
+        render_error = "Cannot render: Loaded Device Context is not a valid JSON object (dictionary)."
+    elif not template_string:
+        render_error = "Please provide a Jinja2 template."
+    # Property set check - only error if user *tried* to load one and failed
+    elif getattr(state, 'prop_set_loaded', False) and getattr(state, 'prop_error', None):
+        render_error = f"Cannot merge: {state.prop_error}"
+    elif getattr(state, 'prop_set_loaded', False) and property_set_data is not None and not isinstance(property_set_data, dict):
+        render_error = "Cannot merge: Loaded Property Set is not a valid JSON/YAML object (dictionary)."
+    
+    # If prerequisites are met, proceed with render
+    if not render_error:
+        try:
+            # Reruns triggered by unrelated widgets reuse the memoized result.
+            # Fingerprints are derived once per loaded object, not per rerun.
+            render_memo = getattr(state, 'render_memo', None)
+            if not isinstance(render_memo, RenderMemo):
+                render_memo = RenderMemo()
+                state.render_memo = render_memo
+            context_fingerprint = get_derived_value(
+                state, "device_context_fingerprint", device_context_data, fingerprint_data
+            )
+            property_fingerprint = None
+            if property_set_data is not None:
+                property_fingerprint = get_derived_value(
+                    state, "property_set_fingerprint", property_set_data, fingerprint_data
+                )
+            
+            # Edits within the debounce window are coalesced and rendered in the
+            # background; results of superseded edits are dropped
+            live_renderer = getattr(state, 'live_renderer', None)
+            if not isinstance(live_renderer, DebouncedRenderer):
+                live_renderer = DebouncedRenderer(render_memo.render, stream=True)
+                state.live_renderer = live_renderer
+            render_key = (template_source_hash(template_string), context_fingerprint, property_fingerprint)
+            live_renderer.submit(
+                render_key,
+                template_string,
+                device_context_data,
+                property_set_data,
+                context_fingerprint,
+                property_fingerprint
+            )
+            status = live_renderer.poll()
+            
+            rendered_output = status["output"] or ""
+            output_stale = status["stale"]
+            if status["error"]:
+                render_error = status["error"]
+            if status["pending"]:
+                state.live_render_wait = status["wait"]
+                partial_output = status["partial"]
+        except Exception as e:
+            render_error = f"An unexpected error occurred: {e}"
+    
+    return rendered_output, render_error, output_stale, render_key, partial_output
+
+def get_render_profile(state, render_key, template_string, device_context_data, property_set_data) -> Optional[Dict[str, Any]]:
+    """
+    Profile a render of the template, reusing the report while the inputs are unchanged.
+
+    Args:
+        state: Application state object
+        render_key: Hash of the template and fingerprints of the context and property set
+        template_string: The Jinja2 template
+        device_context_data: The device context
+        property_set_data: The property set, or None
+
+    Returns:
+        dict: The profiling report, or None if the profiled render failed
+    """
+    cached = getattr(state, 'render_profile', None)
+    if cached and cached[0] == render_key:
+        return cached[1]
+    
+    profiler = TemplateProfiler(template_string)
+    _, error = render_template(template_string, device_context_data, property_set_data, profiler=profiler)
+    report = None if error else profiler.report()
+    state.render_profile = (render_key, report)
+    return report
+
+def render_output_section() -> None:
+    """
+    Render the output as a section of its own, polling a pending render.
+
+    While a debounced render is pending, the section reruns every
+    LIVE_RENDER_POLL_SECONDS on a timer kept by the browser, so the script
+    thread never waits for it. Once the render has finished, the whole app
+    reruns once to drop the timer, which Streamlit keeps until the enclosing
+    section reruns.
+
+    Returns:
+        None
+    """
+    state = get_state()
+    polled = [poll_render(state)]
+    pending = state.live_render_wait is not None
+
+    def render():
+        # This run draws the status it was decided on; the section's own reruns poll again
+        render_status = polled.pop() if polled else None
+        if pending:
+            render_live_output(render_status)
+        else:
+            render_output(render_status)
+
+    if pending:
+        render_section("output_live", render, run_every=LIVE_RENDER_POLL_SECONDS)
+    else:
+        render_section("output", render)
+
+def render_live_output(render_status: Optional[tuple] = None) -> None:
+    """
+    Render the output while a render is pending, stopping the polling once it finished.
+
+    Args:
+        render_status: Result of poll_render() for this run, polled here if omitted
+
+    Returns:
+        None
+    """
+    render_output(render_status)
+    if get_state().live_render_wait is None and section_rerunning("output_live"):
+        st.rerun()
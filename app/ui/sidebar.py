@@ -15,8 +15,10 @@ from typing import Dict, Any, Optional
 #     get_connection_test, 
 #     get_any_endpoint
 from app.utils.api.apstra_client import *
+from app.utils.api.listing_cache import invalidate_listings
 from app.utils.config.session_state import initialize_session_state, get_state
 from ..utils.ui.blueprint_dropdown import *
+from ..utils.ui.diagnostics_panel import render_diagnostics_panel
 
 
 
@@ -30,6 +32,8 @@ def render_sidebar() -> None:
     - Connection testing
     - API token information display
     - Token management options
+    - Refreshing cached Apstra listings and logging out
+    - The optional diagnostics panel
     
     Returns:
         None
@@ -122,6 +126,21 @@ def render_sidebar() -> None:
         # st.toast("API Token", value=state.api_token)
         st.sidebar.info(state.api_token)
 
+    if state.api_token:
+        # Blueprint, device, configlet and property set listings are cached;
+        # refresh fetches them again, logout drops everything cached for the token
+        if st.sidebar.button("Refresh Apstra Data", help="Fetch blueprints, devices, configlets and property sets again"):
+            invalidate_listings(state.api_ip_url, state.api_token)
+            st.rerun()
+
+        if st.sidebar.button("Logout"):
+            invalidate_listings(token=state.api_token)
+            state.api_token = ""
+            state.api_connected = False
+            state.selected_blueprint = None
+            state.selected_blueprint_id = None
+            st.rerun()
+
 
     if state.api_ip_url and state.api_token:
         st.sidebar.divider()
@@ -140,6 +159,10 @@ def render_sidebar() -> None:
             state.selected_blueprint = None
             state.selected_blueprint_id = None
 
+    # Optional per-run timings of API calls, parsing and rendering
+    st.sidebar.divider()
+    render_diagnostics_panel()
+
 
     # st.sidebar.title("Apstra Configlet Builder")
     
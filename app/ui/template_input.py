@@ -8,10 +8,14 @@ browsing existing configlets, and displaying a reference guide.
 import streamlit as st
 from streamlit_ace import st_ace
 from typing import Dict, Any, Optional
-import re
+from jinja2 import TemplateSyntaxError
 
 from app.utils.config.session_state import get_state
+from app.utils.data.template_engine import get_template_dependencies
+from app.utils.data.template_dependencies import format_dependencies, WHOLE_CONTEXT
 from app.utils.api.apstra_client import get_configlets
+from app.utils.api.listing_cache import cached_listing
+from app.utils.ui.sections import rerun_section
 
 def render_template_input() -> None:
     """
@@ -55,7 +59,7 @@ def render_collapsible_editor(state):
     if st.button("➡️ Show configlet browser" if not st.session_state.show_browser else "⬅️ Hide Configlet Browser", 
                 help="Toggle configlet browser" if st.session_state.show_browser else "Show configlet browser"):
         st.session_state.show_browser = not st.session_state.show_browser
-        st.rerun()
+        rerun_section()
     
     # Conditional layout based on browser visibility
     if st.session_state.show_browser:
@@ -90,7 +94,7 @@ def render_configlet_browser(state):
         try:
             # Fetch configlets from Apstra
             with st.spinner("Fetching configlets from Apstra..."):
-                configlets_response = get_configlets(state.api_ip_url, state.api_token)
+                configlets_response = cached_listing(get_configlets, state.api_ip_url, state.api_token)
             
             if not configlets_response or "items" not in configlets_response or not configlets_response["items"]:
                 st.warning("No configlets found in Apstra.")
@@ -190,31 +194,22 @@ def analyze_template(template_text, negation_text=None, state=None):
         st.warning("Template is empty. Nothing to analyze.")
         return
     
-    # Find all variables in the template using regex
-    # This regex looks for {{ variable }} pattern in Jinja2 templates
-    var_pattern = r'{{\s*([^{}|]+?)(?:\s*\|\s*[^}]+)?\s*}}'
-    main_vars = re.findall(var_pattern, template_text)
-    
-    # Also find variables in negation template if it exists
-    negation_vars = []
-    if negation_text:
-        negation_vars = re.findall(var_pattern, negation_text)
-    
-    # Combine all unique variables
-    all_vars = set(main_vars + negation_vars)
-    
-    # Clean up variable names (remove whitespace, quotes, etc.)
-    clean_vars = set()
-    for var in all_vars:
-        # Remove whitespace and quotes
-        clean_var = var.strip().strip('"\'')
-        
-        # Handle attribute access (dot notation) and array access (square brackets)
-        parts = re.split(r'\.|\[|\]', clean_var)
-        base_var = parts[0].strip()
+    # Find all context paths the templates read from their parsed Jinja2 AST
+    # (cached per template, shared with rendering)
+    try:
+        dependencies = set(get_template_dependencies(template_text))
         
-        if base_var and not base_var.isdigit() and base_var != 'None' and base_var != 'True' and base_var != 'False':
-            clean_vars.add(base_var)
+        # Also include the negation template if it exists
+        if negation_text:
+            dependencies |= get_template_dependencies(negation_text)
+    except TemplateSyntaxError as e:
+        st.error(f"Template Syntax Error: {e.message} (Line: {e.lineno})")
+        return
+    
+    # Top-level variables are the first element of each path; an empty path
+    # means the template reads the whole context (include, extends, import)
+    clean_vars = {path[0] for path in dependencies if path}
+    reads_whole_context = WHOLE_CONTEXT in dependencies
     
     # Get existing variables from device context and property set
     existing_vars = set()
@@ -233,12 +228,21 @@ def analyze_template(template_text, negation_text=None, state=None):
     missing_vars = clean_vars - existing_vars
     
     # Display analysis results
-    if clean_vars:
+    if clean_vars or reads_whole_context:
         st.write("### Template Analysis")
         
+        if reads_whole_context:
+            st.info("The template includes, extends or imports other templates, "
+                    "so it may read any part of the whole context.")
+        
         # Show all variables found in template
-        st.write(f"**Variables found in template:** {len(clean_vars)}")
-        st.code(", ".join(sorted(clean_vars)))
+        if clean_vars:
+            st.write(f"**Variables found in template:** {len(clean_vars)}")
+            st.code(", ".join(sorted(clean_vars)))
+        
+        # Show the full paths read from each variable
+        st.write(f"**Context paths read by template:** {len(dependencies)}")
+        st.code("\n".join(format_dependencies(dependencies)))
         
         # Show existing variables
         if existing_vars:
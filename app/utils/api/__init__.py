@@ -7,7 +7,9 @@ from .http_client import (
     post_request, 
     put_request, 
     delete_request, 
-    patch_request
+    patch_request,
+    configure_http_pool,
+    close_sessions
 )
 from .apstra_client import (
     get_login, 
@@ -25,6 +27,8 @@ __all__ = [
     'put_request', 
     'delete_request', 
     'patch_request',
+    'configure_http_pool',
+    'close_sessions',
     'ApstraClient',
     'get_login',
     "get_design_configlets", 
@@ -6,7 +6,11 @@ This module provides a class for interacting with the Apstra API.
 import datetime
 import jwt
 import json
+from ..data import json_backend
 from .http_client import get_request, post_request, put_request, delete_request, patch_request
+from ..diagnostics.spans import timed
+
+@timed("apstra.get_login")
 def get_login(base_url, username, password):
     """
     Performs a POST request to the login endpoint with a body containing username and password.
@@ -35,6 +39,7 @@ def get_login(base_url, username, password):
     except Exception as e:
         return {"error": f"Login error: {str(e)}"}
 
+@timed("apstra.get_design_configlets")
 def get_design_configlets(base_url, token):
     """
     Performs a GET request to retrieve design configlets.
@@ -61,6 +66,7 @@ def get_design_configlets(base_url, token):
     except Exception as e:
         return {"error": f"Error fetching design configlets: {str(e)}"}
 
+@timed("apstra.get_all_blueprints")
 def get_all_blueprints(base_url, token):
     """
     Performs a GET request to blueprints API.
@@ -87,6 +93,7 @@ def get_all_blueprints(base_url, token):
     except Exception as e:
         return {"error": f"Error fetching blueprints: {str(e)}"}
 
+@timed("apstra.get_blueprint_nodes")
 def get_blueprint_nodes(base_url, token, blueprint_id):
     """
     Performs a POST request to query all blueprint system nodes using the QE API.
@@ -119,6 +126,7 @@ def get_blueprint_nodes(base_url, token, blueprint_id):
     except Exception as e:
         return {"error": f"Error fetching blueprint nodes: {str(e)}"}
 
+@timed("apstra.get_device_context")
 def get_device_context(base_url, token, blueprint_id, node_id):
     """
     Performs a GET request to retrieve device configuration rendering context.
@@ -143,10 +151,11 @@ def get_device_context(base_url, token, blueprint_id, node_id):
     # Perform the GET request
     try:
         response = get_request(url, headers=headers)
-        return json.loads(response['context'])
+        return json_backend.loads(response['context'])
     except Exception as e:
         return {"error": f"Error fetching device context: {str(e)}"}
 
+@timed("apstra.get_property_sets")
 def get_property_sets(base_url, token):
     """
     Performs a GET request to retrieve property sets from Apstra.
@@ -172,6 +181,7 @@ def get_property_sets(base_url, token):
     except Exception as e:
         return {"error": f"Error fetching property sets: {str(e)}"}
 
+@timed("apstra.get_configlets")
 def get_configlets(base_url, token):
     """
     Performs a GET request to retrieve configlets from Apstra.
@@ -197,6 +207,7 @@ def get_configlets(base_url, token):
     except Exception as e:
         return {"error": f"Error fetching configlets: {str(e)}"}
 
+@timed("apstra.get_connection_test")
 def get_connection_test(base_url, token):
     """
     Performs a GET request to api docs to test connection.
@@ -223,6 +234,7 @@ def get_connection_test(base_url, token):
     except Exception as e:
         return {"error": f"Error fetching device context: {str(e)}"}
 
+@timed("apstra.get_any_endpoint")
 def get_any_endpoint(base_url, token, endpoint):
     """
     Performs a GET request to any valid endpoint.
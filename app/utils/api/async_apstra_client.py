@@ -0,0 +1,119 @@
+# app/utils/api/async_apstra_client.py
+"""
+Asyncio Apstra API client.
+
+The coroutines mirror the functions in apstra_client and return the same
+responses, including the {"error": ...} convention, so UI code can switch
+over one call at a time. Each call runs the pooled, keep-alive HTTP client
+in a worker thread, and the number of calls in flight against one Apstra
+host is bounded by a process-wide per-host semaphore, shared by every
+session and event loop, so fan-out operations don't overload the
+controller.
+"""
+import asyncio
+import os
+import threading
+
+from . import apstra_client
+
+# Maximum number of concurrent requests against one Apstra host
+DEFAULT_HOST_CONCURRENCY = int(os.environ.get("CONFIGLET_APSTRA_CONCURRENCY", 8))
+
+_host_concurrency = {}
+# Every run() uses a new event loop, so the limit is a thread semaphore per host
+_semaphores = {}
+_semaphores_lock = threading.Lock()
+
+def set_host_concurrency(base_url, limit):
+    """
+    Set the maximum number of concurrent requests against an Apstra host.
+
+    Args:
+        base_url (str): The base URL of the API
+        limit (int): Maximum number of requests in flight
+
+    Returns:
+        None
+    """
+    with _semaphores_lock:
+        _host_concurrency[base_url] = limit
+        # Requests in flight release the semaphore they acquired
+        _semaphores.pop(base_url, None)
+
+def _get_semaphore(base_url):
+    """Return the semaphore limiting requests to base_url across the process."""
+    with _semaphores_lock:
+        semaphore = _semaphores.get(base_url)
+        if semaphore is None:
+            limit = _host_concurrency.get(base_url, DEFAULT_HOST_CONCURRENCY)
+            semaphore = threading.BoundedSemaphore(limit)
+            _semaphores[base_url] = semaphore
+        return semaphore
+
+def _call_limited(base_url, func, *args):
+    """Call a blocking apstra_client function once the host has a free slot."""
+    with _get_semaphore(base_url):
+        return func(*args)
+
+async def _call(base_url, func, *args):
+    """Run a blocking apstra_client function under the host's concurrency limit."""
+    # The worker thread waits for the slot, so the event loop is never blocked
+    return await asyncio.to_thread(_call_limited, base_url, func, *args)
+
+async def get_login(base_url, username, password):
+    """Async version of apstra_client.get_login."""
+    return await _call(base_url, apstra_client.get_login, base_url, username, password)
+
+async def get_all_blueprints(base_url, token):
+    """Async version of apstra_client.get_all_blueprints."""
+    return await _call(base_url, apstra_client.get_all_blueprints, base_url, token)
+
+async def get_blueprint_nodes(base_url, token, blueprint_id):
+    """Async version of apstra_client.get_blueprint_nodes (QE query for switch nodes)."""
+    return await _call(base_url, apstra_client.get_blueprint_nodes, base_url, token, blueprint_id)
+
+async def get_device_context(base_url, token, blueprint_id, node_id):
+    """Async version of apstra_client.get_device_context."""
+    return await _call(base_url, apstra_client.get_device_context, base_url, token, blueprint_id, node_id)
+
+async def get_property_sets(base_url, token):
+    """Async version of apstra_client.get_property_sets."""
+    return await _call(base_url, apstra_client.get_property_sets, base_url, token)
+
+async def get_configlets(base_url, token):
+    """Async version of apstra_client.get_configlets."""
+    return await _call(base_url, apstra_client.get_configlets, base_url, token)
+
+async def get_design_configlets(base_url, token):
+    """Async version of apstra_client.get_design_configlets."""
+    return await _call(base_url, apstra_client.get_design_configlets, base_url, token)
+
+async def get_device_contexts(base_url, token, blueprint_id, node_ids):
+    """
+    Fetch the config-context of many nodes concurrently.
+
+    Parameters:
+    - base_url (str): The base URL of the API.
+    - token (str): Apstra API Token.
+    - blueprint_id (str): ID of the blueprint.
+    - node_ids (list): IDs of the nodes to get context for.
+
+    Returns:
+    - dict: Node ID to device context, or to {"error": ...} if that fetch failed.
+    """
+    contexts = await asyncio.gather(*(
+        get_device_context(base_url, token, blueprint_id, node_id) for node_id in node_ids
+    ))
+    return dict(zip(node_ids, contexts))
+
+def run(coroutine):
+    """
+    Run a coroutine from synchronous code such as a Streamlit script.
+
+    Args:
+        coroutine: Coroutine returned by one of the functions in this module
+
+    Returns:
+        The coroutine's result
+    """
+    return asyncio.run(coroutine)
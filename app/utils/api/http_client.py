@@ -1,16 +1,103 @@
 # app/utils/api/http_client.py
 """
 Base HTTP client functions for making API requests.
+
+Requests go through one pooled, keep-alive requests.Session per host, so
+consecutive calls to the same Apstra server reuse TCP and TLS connections.
+The sessions are shared by every user of the app, so they never store
+cookies; authentication is passed per request in the headers.
 """
+import http.cookiejar
+import os
+import threading
+from urllib.parse import urlsplit
+
 import requests
 import json
+from requests.adapters import HTTPAdapter
+
+from ..data import json_backend
+
+# Maximum number of connections open per host; further requests wait for one
+DEFAULT_POOL_SIZE = int(os.environ.get("CONFIGLET_HTTP_POOL_SIZE", 16))
+
+# (connect, read) timeouts in seconds applied to every request
+DEFAULT_TIMEOUT = (
+    float(os.environ.get("CONFIGLET_HTTP_CONNECT_TIMEOUT", 10)),
+    float(os.environ.get("CONFIGLET_HTTP_READ_TIMEOUT", 120))
+)
+
+_pool_size = DEFAULT_POOL_SIZE
+_timeout = DEFAULT_TIMEOUT
+_sessions = {}
+_sessions_lock = threading.Lock()
+
+def configure_http_pool(pool_size=None, timeout=None):
+    """
+    Configure the connection pools used for API requests.
+
+    Existing sessions are closed so the new settings apply to the next request.
+
+    Args:
+        pool_size (int, optional): Maximum number of pooled connections per host
+        timeout (float or tuple, optional): Timeout in seconds, or (connect, read) timeouts
+
+    Returns:
+        None
+    """
+    global _pool_size, _timeout
+    if pool_size is not None:
+        _pool_size = pool_size
+    if timeout is not None:
+        _timeout = timeout
+    close_sessions()
+
+def get_session(url):
+    """
+    Get the pooled session for the host of a URL, creating it on first use.
+
+    The session keeps connections only; cookies set by responses are dropped.
+
+    Args:
+        url (str): Request URL
+
+    Returns:
+        requests.Session: Keep-alive session owned by the URL's host
+    """
+    parts = urlsplit(url)
+    host = (parts.scheme, parts.netloc)
+    with _sessions_lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = requests.Session()
+            # Shared by all users: refuse cookies so none leak into another user's requests
+            session.cookies.set_policy(http.cookiejar.DefaultCookiePolicy(allowed_domains=[]))
+            # Block when all pooled connections are in use instead of opening more
+            adapter = HTTPAdapter(pool_connections=1, pool_maxsize=_pool_size, pool_block=True)
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+            _sessions[host] = session
+        return session
+
+def close_sessions():
+    """
+    Close all pooled sessions and their open connections.
+
+    Returns:
+        None
+    """
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
 
-def get_request(url, headers=None, verify=False):
+def get_request(url, headers=None, verify=False, timeout=None):
     """Makes a GET request with error handling and returns JSON response."""
     try:
-        response = requests.get(url, headers=headers, verify=verify)
+        response = get_session(url).get(url, headers=headers, verify=verify, timeout=timeout or _timeout)
         response.raise_for_status()
-        return response.json()
+        return json_backend.loads(response.content)
     except requests.exceptions.HTTPError as errh:
         return {"error": f"HTTP Error: {errh}", "status_code": response.status_code}
     except requests.exceptions.ConnectionError as errc:
@@ -22,15 +109,15 @@ def get_request(url, headers=None, verify=False):
     except json.JSONDecodeError:
         return {"error": "Error decoding JSON response", "response_text": response.text}
 
-def post_request(url, body, headers=None, verify=False):
+def post_request(url, body, headers=None, verify=False, timeout=None):
     """Makes a POST request with error handling and returns JSON response."""
     try:
-        response = requests.post(url, json=body, headers=headers, verify=verify)
+        response = get_session(url).post(url, json=body, headers=headers, verify=verify, timeout=timeout or _timeout)
         response.raise_for_status()
-        return response.json()
+        return json_backend.loads(response.content)
     except requests.exceptions.HTTPError as errh:
         try:
-            error_resp = response.json()
+            error_resp = json_backend.loads(response.content)
             return {"error": f"HTTP Error: {errh}", "status_code": response.status_code, "details": error_resp}
         except:
             return {"error": f"HTTP Error: {errh}", "status_code": response.status_code, "response_text": response.text}
@@ -43,15 +130,15 @@ def post_request(url, body, headers=None, verify=False):
     except json.JSONDecodeError:
         return {"error": "Error decoding JSON response", "response_text": response.text}
 
-def put_request(url, body, headers=None, verify=False):
+def put_request(url, body, headers=None, verify=False, timeout=None):
     """Makes a PUT request with error handling and returns JSON response."""
     try:
-        response = requests.put(url, json=body, headers=headers, verify=verify)
+        response = get_session(url).put(url, json=body, headers=headers, verify=verify, timeout=timeout or _timeout)
         response.raise_for_status()
-        return response.json()
+        return json_backend.loads(response.content)
     except requests.exceptions.HTTPError as errh:
         try:
-            error_resp = response.json()
+            error_resp = json_backend.loads(response.content)
             return {"error": f"HTTP Error: {errh}", "status_code": response.status_code, "details": error_resp}
         except:
             return {"error": f"HTTP Error: {errh}", "status_code": response.status_code, "response_text": response.text}
@@ -64,13 +151,13 @@ def put_request(url, body, headers=None, verify=False):
     except json.JSONDecodeError:
         return {"error": "Error decoding JSON response", "response_text": response.text}
 
-def delete_request(url, headers=None, verify=False):
+def delete_request(url, headers=None, verify=False, timeout=None):
     """Makes a DELETE request with error handling and returns status code or JSON if available."""
     try:
-        response = requests.delete(url, headers=headers, verify=verify)
+        response = get_session(url).delete(url, headers=headers, verify=verify, timeout=timeout or _timeout)
         response.raise_for_status()
         try:
-            return response.json()  # Some APIs return JSON even for DELETE
+            return json_backend.loads(response.content)  # Some APIs return JSON even for DELETE
         except json.JSONDecodeError:
             return {"status_code": response.status_code, "message": "Delete successful"}
     except requests.exceptions.HTTPError as errh:
@@ -82,15 +169,15 @@ def delete_request(url, headers=None, verify=False):
     except requests.exceptions.RequestException as err:
         return {"error": f"Request Error: {err}"}
 
-def patch_request(url, body, headers=None, verify=False):
+def patch_request(url, body, headers=None, verify=False, timeout=None):
     """Makes a PATCH request with error handling and returns JSON response."""
     try:
-        response = requests.patch(url, json=body, headers=headers, verify=verify)
+        response = get_session(url).patch(url, json=body, headers=headers, verify=verify, timeout=timeout or _timeout)
         response.raise_for_status()
-        return response.json()
+        return json_backend.loads(response.content)
     except requests.exceptions.HTTPError as errh:
         try:
-            error_resp = response.json()
+            error_resp = json_backend.loads(response.content)
             return {"error": f"HTTP Error: {errh}", "status_code": response.status_code, "details": error_resp}
         except:
             return {"error": f"HTTP Error: {errh}", "status_code": response.status_code, "response_text": response.text}
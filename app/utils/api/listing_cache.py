@@ -0,0 +1,92 @@
+# app/utils/api/listing_cache.py
+"""
+TTL cache for Apstra listing calls made on every Streamlit rerun.
+
+Blueprints, blueprint nodes, configlets and property sets are fetched each
+time the script reruns. This module caches those responses for a short time,
+keyed on the Apstra host, the identity of the API token and the call
+arguments. Error responses are never cached.
+"""
+import hashlib
+import os
+import threading
+import time
+
+# Seconds a cached listing stays fresh
+DEFAULT_TTL = float(os.environ.get("CONFIGLET_LISTING_CACHE_TTL", 300))
+
+_cache = {}
+_cache_lock = threading.Lock()
+_cache_stats = {"hits": 0, "misses": 0}
+
+def _token_identity(token):
+    """Return a short hash identifying a token without keeping the token itself."""
+    return hashlib.sha256((token or "").encode("utf-8")).hexdigest()[:16]
+
+def cached_listing(fetch, base_url, token, *args, ttl=None):
+    """
+    Call an apstra_client listing function, reusing a fresh cached response.
+
+    Args:
+        fetch: apstra_client function called as fetch(base_url, token, *args)
+        base_url (str): The base URL of the API
+        token (str): Apstra API Token
+        *args: Additional arguments for fetch (e.g. blueprint ID)
+        ttl (float, optional): Seconds the response stays fresh (defaults to DEFAULT_TTL)
+
+    Returns:
+        dict: The response from the server, possibly from the cache
+    """
+    key = (fetch.__name__, base_url, _token_identity(token), args)
+    now = time.monotonic()
+
+    with _cache_lock:
+        entry = _cache.get(key)
+        if entry is not None and entry[0] > now:
+            _cache_stats["hits"] += 1
+            return entry[1]
+        _cache_stats["misses"] += 1
+
+    response = fetch(base_url, token, *args)
+
+    if response and "error" not in response:
+        expires_at = now + (DEFAULT_TTL if ttl is None else ttl)
+        with _cache_lock:
+            # Drop expired entries so the cache doesn't grow with old tokens
+            for stale_key in [k for k, (expiry, _) in _cache.items() if expiry <= now]:
+                del _cache[stale_key]
+            _cache[key] = (expires_at, response)
+
+    return response
+
+def invalidate_listings(base_url=None, token=None):
+    """
+    Remove cached listings, e.g. on a manual refresh or when the user logs out.
+
+    Args:
+        base_url (str, optional): Only remove listings for this host
+        token (str, optional): Only remove listings fetched with this token
+
+    Returns:
+        int: Number of cached listings removed
+    """
+    token_identity = _token_identity(token) if token is not None else None
+    with _cache_lock:
+        keys = [
+            key for key in _cache
+            if (base_url is None or key[1] == base_url)
+            and (token_identity is None or key[2] == token_identity)
+        ]
+        for key in keys:
+            del _cache[key]
+    return len(keys)
+
+def get_listing_cache_stats():
+    """
+    Get statistics for the listing cache.
+
+    Returns:
+        dict: Number of cached listings, hit and miss counters
+    """
+    with _cache_lock:
+        return {"size": len(_cache), "hits": _cache_stats["hits"], "misses": _cache_stats["misses"]}
@@ -6,7 +6,7 @@ providing a consistent way for UI components to share data.
 """
 
 import streamlit as st
-from typing import Any
+from typing import Any, Callable
 
 def initialize_session_state() -> None:
     """
@@ -69,4 +69,31 @@ def get_state() -> Any:
     Returns:
         The Streamlit session state object
     """
-    return st.session_state
\ No newline at end of file
+    return st.session_state
+
+def get_derived_value(state: Any, key: str, data: Any, compute: Callable[[Any], Any]) -> Any:
+    """
+    Get a value derived from loaded data, computing it only once per data object.
+
+    Derived values (fingerprints, search indexes, depth information) are stored
+    in session state next to a reference to the data they were computed from.
+    They are recomputed only when the data is replaced, not on every rerun.
+
+    Args:
+        state: Application state object
+        key: Name of the derived value
+        data: The loaded data the value is derived from
+        compute: Function computing the derived value from data
+
+    Returns:
+        The derived value
+    """
+    cache_key = f"_derived_{key}"
+    cached = state[cache_key] if cache_key in state else None
+    if isinstance(cached, tuple) and len(cached) == 2 and cached[0] is data:
+        return cached[1]
+
+    value = compute(data)
+    # Keep a reference to the data so its identity can't be reused by a new object
+    state[cache_key] = (data, value)
+    return value
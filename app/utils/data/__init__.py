@@ -8,12 +8,24 @@ from .data_helpers import (
     load_yaml_content,
     filter_json
 )
-from .template_engine import render_template
+from .template_engine import (
+    render_template,
+    get_template_cache_stats,
+    clear_template_cache,
+    configure_bytecode_cache,
+    get_bytecode_cache_stats,
+    get_template_dependencies
+)
 
 __all__ = [
     'deep_merge',
     'load_json_file',
     'load_yaml_content',
     'filter_json',
-    'render_template'
+    'render_template',
+    'get_template_cache_stats',
+    'clear_template_cache',
+    'configure_bytecode_cache',
+    'get_bytecode_cache_stats',
+    'get_template_dependencies'
 ]
\ No newline at end of file
@@ -0,0 +1,306 @@
+# app/utils/data/batch_render.py
+"""
+Batch rendering of templates against context files, without the app.
+
+Every context file is one job: a worker process loads it once and renders
+each template, with each property set, against it using render_template.
+Outputs are written by the worker, so neither contexts nor rendered
+configs are copied between processes; only small result records are sent
+back, as soon as each context file is done.
+
+Files are named by their path relative to the deepest directory containing
+all files of their kind, so leaf1.json files in different directories keep
+apart, and the output directory mirrors the input directories.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+from .data_helpers import load_json_file, load_yaml_content
+from .output_pages import count_lines
+from .template_engine import render_template
+from .template_profiler import TemplateProfiler, merge_profile_reports
+
+# File suffixes picked up when a directory is given
+TEMPLATE_SUFFIXES = (".j2", ".jinja", ".jinja2")
+CONTEXT_SUFFIXES = (".json",)
+PROPERTY_SET_SUFFIXES = (".json", ".yaml", ".yml")
+
+def find_files(paths, suffixes):
+    """
+    Expand files and directories into a sorted list of files.
+
+    Args:
+        paths (list): Files and directories; directories are searched recursively
+        suffixes (tuple): Suffixes of the files taken from directories
+
+    Returns:
+        list: Paths of the files, directories expanded in sorted order
+    """
+    files = []
+    for path in map(Path, paths):
+        if path.is_dir():
+            files.extend(sorted(
+                child for child in path.rglob("*") if child.is_file() and child.suffix.lower() in suffixes
+            ))
+        else:
+            files.append(path)
+    return files
+
+def relative_names(paths):
+    """
+    Name files by their path relative to the deepest directory containing all of them.
+
+    Args:
+        paths (list): File paths
+
+    Returns:
+        list: POSIX-style names in the order of paths, such as "a/leaf1.json"
+    """
+    absolute = [Path(os.path.abspath(path)) for path in paths]
+    try:
+        root = os.path.commonpath([path.parent for path in absolute])
+    except ValueError:
+        # Paths on different drives have no common directory
+        return [path.name for path in absolute]
+    return [path.relative_to(root).as_posix() for path in absolute]
+
+def _output_stem(name):
+    """Strip the suffix of a file name, keeping its directories."""
+    return Path(name).with_suffix("").as_posix()
+
+def _output_file_name(template_name, property_set_name=None):
+    """Get the output file of a render below its context's output directory."""
+    name = _output_stem(template_name)
+    if property_set_name:
+        name += "__" + _output_stem(property_set_name).replace("/", "__")
+    return f"{name}.txt"
+
+def find_output_collisions(template_names, context_names, property_set_names=()):
+    """
+    Find renders that would write to the same output file.
+
+    Output paths drop file suffixes, so base.j2 and base.jinja in one
+    directory, for example, would overwrite each other.
+
+    Args:
+        template_names (list): Template names, see relative_names()
+        context_names (list): Context file names
+        property_set_names (list, optional): Property set names
+
+    Returns:
+        list: A message per output file written by more than one render
+    """
+    outputs = {}
+    for name in context_names:
+        outputs.setdefault(_output_stem(name), []).append(name)
+    collisions = [f"contexts {' and '.join(names)} write to the same output directory"
+                  for names in outputs.values() if len(names) > 1]
+
+    outputs = {}
+    for template_name in template_names:
+        for property_set_name in property_set_names or [None]:
+            path = _output_file_name(template_name, property_set_name)
+            outputs.setdefault(path, []).append(
+                template_name + (f" with {property_set_name}" if property_set_name else "")
+            )
+    collisions.extend(f"templates {' and '.join(names)} write to the same output file"
+                      for names in outputs.values() if len(names) > 1)
+    return collisions
+
+def load_data_file(path):
+    """
+    Load a JSON or YAML file.
+
+    Args:
+        path (str or Path): File to load; .yaml and .yml files are parsed as YAML
+
+    Returns:
+        tuple: (data, error) where data is the parsed document or None if error occurred,
+               and error is an error message or None if successful
+    """
+    try:
+        content = Path(path).read_bytes()
+    except OSError as e:
+        return None, f"Error reading file: {e}"
+    if Path(path).suffix.lower() in (".yaml", ".yml"):
+        return load_yaml_content(content)
+    return load_json_file(content)
+
+def output_path(output_dir, context_name, template_name, property_set_name=None):
+    """
+    Get the file a rendered output is written to.
+
+    Args:
+        output_dir (str or Path): Root directory of the outputs
+        context_name (str): Name of the context file, see relative_names()
+        template_name (str): Name of the template file
+        property_set_name (str, optional): Name of the property set file
+
+    Returns:
+        Path: <output_dir>/<context>/<template>[__<property set>].txt, without file suffixes;
+              directories in the context and template names are kept
+    """
+    return Path(output_dir) / _output_stem(context_name) / _output_file_name(template_name, property_set_name)
+
+def _render_context_file(job):
+    """
+    Render every template and property set against one context file. Runs in a worker process.
+
+    Args:
+        job (tuple): (context_path, context_name, templates, property_sets, output_dir, profile) where
+            templates is a list of (name, source) and property_sets a list of (name, data),
+            with (None, None) for rendering without a property set
+
+    Returns:
+        list: Result dicts, see run_batch()
+    """
+    context_path, context_name, templates, property_sets, output_dir, profile = job
+    device_context, error = load_data_file(context_path)
+    if not error and not isinstance(device_context, dict):
+        error = f"expected a JSON object, got {type(device_context).__name__}"
+    if error:
+        error = f"Error loading device context: {error}"
+
+    results = []
+    for property_set_name, property_set in property_sets:
+        for template_name, template_string in templates:
+            result = {
+                "context": context_name,
+                "template": template_name,
+                "property_set": property_set_name,
+                "output": None,
+                "lines": 0,
+                "error": error,
+                "render_time": 0.0,
+            }
+            results.append(result)
+            if error:
+                continue
+
+            profiler = TemplateProfiler(template_string) if profile else None
+            start = time.perf_counter()
+            rendered_output, result["error"] = render_template(
+                template_string, device_context, property_set, profiler=profiler
+            )
+            result["render_time"] = time.perf_counter() - start
+            if result["error"]:
+                continue
+
+            result["lines"] = count_lines(rendered_output)
+            if profiler:
+                result["profile"] = profiler.report()
+            if output_dir:
+                path = output_path(output_dir, context_name, template_name, property_set_name)
+                path.parent.mkdir(parents=True, exist_ok=True)
+                path.write_text(rendered_output, encoding="utf-8")
+                result["output"] = str(path)
+    return results
+
+def run_batch(template_paths, context_paths, property_set_paths=None, output_dir=None, max_workers=None,
+              profile=False):
+    """
+    Render templates against context files in parallel, yielding results as they finish.
+
+    Templates and property sets are read up front; files that can't be
+    loaded are reported as failed results for every render that needs them.
+    Files are named relative to the directory containing all files of their
+    kind (see relative_names), and outputs are written below output_dir
+    under the same names.
+
+    Args:
+        template_paths (list): Template files
+        context_paths (list): Device context JSON files
+        property_set_paths (list, optional): Property set JSON/YAML files; every template
+            is rendered once per property set, or once without one if none are given
+        output_dir (str or Path, optional): Write rendered outputs below this directory
+        max_workers (int, optional): Number of worker processes (defaults to the CPU count);
+            1 renders in this process
+        profile (bool): Profile every render (see template_profiler)
+
+    Raises:
+        ValueError: If output_dir is given and two renders would write the same output file
+
+    Yields:
+        dict: One result per template, context file and property set with keys:
+            - context, template, property_set: file names, see relative_names() (property_set
+              is None without one)
+            - output: path of the written output, or None
+            - lines: number of lines rendered
+            - error: error message, or None if the render succeeded
+            - render_time: seconds spent in render_template
+            - profile: the render's profile report, only when profiling
+    """
+    template_names = relative_names(template_paths)
+    context_names = relative_names(context_paths)
+    property_set_names = relative_names(property_set_paths or [])
+    if output_dir:
+        collisions = find_output_collisions(template_names, context_names, property_set_names)
+        if collisions:
+            raise ValueError("; ".join(collisions))
+
+    templates = []
+    for path, name in zip(template_paths, template_names):
+        try:
+            templates.append((name, Path(path).read_text(encoding="utf-8")))
+        except (OSError, UnicodeDecodeError) as e:
+            for context_name in context_names:
+                yield _failed(context_name, name, None, f"Error reading template: {e}")
+
+    property_sets = []
+    for path, name in zip(property_set_paths or [], property_set_names):
+        data, error = load_data_file(path)
+        if not error and not isinstance(data, dict):
+            error = f"expected a JSON/YAML object, got {type(data).__name__}"
+        if error:
+            for context_name in context_names:
+                for template_name, _ in templates:
+                    yield _failed(context_name, template_name, name, f"Error loading property set: {error}")
+        else:
+            property_sets.append((name, data))
+    if not property_set_paths:
+        property_sets.append((None, None))
+
+    if not templates or not property_sets:
+        return
+    jobs = [
+        (str(path), name, templates, property_sets, output_dir, profile)
+        for path, name in zip(context_paths, context_names)
+    ]
+    workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+    if workers <= 1:
+        for job in jobs:
+            yield from _render_context_file(job)
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for future in as_completed([executor.submit(_render_context_file, job) for job in jobs]):
+            yield from future.result()
+
+def merge_batch_profiles(results):
+    """
+    Merge the profile reports of batch results per template.
+
+    Args:
+        results (iterable): Results yielded by run_batch(profile=True)
+
+    Returns:
+        dict: Template name to the merged profile report of its renders
+    """
+    reports = {}
+    for result in results:
+        reports.setdefault(result["template"], []).append(result.get("profile"))
+    return {template: merge_profile_reports(template_reports) for template, template_reports in reports.items()}
+
+def _failed(context_name, template_name, property_set_name, error):
+    """Build the result of a render that could not be attempted."""
+    return {
+        "context": context_name,
+        "template": template_name,
+        "property_set": property_set_name,
+        "output": None,
+        "lines": 0,
+        "error": error,
+        "render_time": 0.0,
+    }
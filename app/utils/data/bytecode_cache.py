@@ -0,0 +1,126 @@
+# app/utils/data/bytecode_cache.py
+"""
+Persistent on-disk bytecode cache for compiled Jinja2 templates.
+"""
+import hashlib
+import os
+import threading
+
+import jinja2
+from jinja2.bccache import FileSystemBytecodeCache
+
+# Default size limit for the cache directory (64 MB)
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+class ConfigletBytecodeCache(FileSystemBytecodeCache):
+    """
+    Filesystem bytecode cache with a size limit and LRU eviction.
+
+    Entries are keyed by the template source hash, the installed Jinja2
+    version and the code-generation options of the environment, so upgrading
+    Jinja2 or switching between a sandboxed and a plain environment never
+    loads bytecode generated for the other. The modification time of an
+    entry is refreshed on every hit and the least recently used entries are
+    removed once the directory grows beyond max_bytes.
+    """
+
+    def __init__(self, directory, max_bytes=DEFAULT_MAX_BYTES):
+        """
+        Args:
+            directory (str): Directory to store the bytecode files in (created if missing)
+            max_bytes (int): Maximum total size of the cache directory in bytes
+        """
+        os.makedirs(directory, exist_ok=True)
+        super().__init__(directory, pattern="configlet_%s.jbc")
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def get_bucket(self, environment, name, filename, source):
+        """Return the bucket for a template, keyed on how the environment generates code."""
+        # Sandboxed environments compile attribute access, calls and operators differently
+        variant = "sandboxed:" + ",".join(sorted(environment.intercepted_binops)) if environment.sandboxed else "plain"
+        if getattr(environment, "budgeted_loops", False):
+            variant += ":loops"
+        return super().get_bucket(environment, f"{variant}|{name}", filename, source)
+
+    def get_cache_key(self, name, filename=None):
+        """Return the cache key for a template source hash and the Jinja2 version."""
+        return hashlib.sha256(f"{jinja2.__version__}|{name}".encode("utf-8")).hexdigest()
+
+    def load_bytecode(self, bucket):
+        """Load bytecode for a bucket and record a hit or a miss."""
+        super().load_bytecode(bucket)
+        with self._lock:
+            if bucket.code is None:
+                self.misses += 1
+                return
+            self.hits += 1
+        # Mark the entry as recently used
+        try:
+            os.utime(self._get_cache_filename(bucket))
+        except OSError:
+            pass
+
+    def dump_bytecode(self, bucket):
+        """Write bytecode for a bucket and evict old entries if over the size limit."""
+        super().dump_bytecode(bucket)
+        self.evict()
+
+    def _entries(self):
+        """Return (path, size, mtime) for every cache file in the directory."""
+        prefix, suffix = self.pattern.split("%s")
+        entries = []
+        for filename in os.listdir(self.directory):
+            if not (filename.startswith(prefix) and filename.endswith(suffix)):
+                continue
+            path = os.path.join(self.directory, filename)
+            try:
+                stat = os.stat(path)
+            except OSError:
+                continue
+            entries.append((path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def evict(self):
+        """
+        Remove least recently used entries until the cache fits in max_bytes.
+
+        Returns:
+            int: Number of entries removed
+        """
+        entries = self._entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        for path, size, _ in sorted(entries, key=lambda entry: entry[2]):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            removed += 1
+        return removed
+
+    def stats(self):
+        """
+        Get statistics for the cache.
+
+        Returns:
+            dict: Directory, entry count, size on disk, size limit, hits, misses and hit rate
+        """
+        entries = self._entries()
+        with self._lock:
+            hits, misses = self.hits, self.misses
+        lookups = hits + misses
+        return {
+            "directory": self.directory,
+            "entries": len(entries),
+            "size_bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / lookups if lookups else 0.0,
+        }
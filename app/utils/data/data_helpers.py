@@ -2,10 +2,26 @@
 """
 Data manipulation utility functions.
 """
+import hashlib
 import json
 import yaml
+from collections.abc import Mapping
 from pathlib import Path
 
+from . import json_backend
+from ..diagnostics.spans import timed
+
+# Use the libyaml-backed safe loader when PyYAML was built with libyaml. It
+# constructs the same data as the pure-Python SafeLoader but parses many
+# times faster.
+try:
+    from yaml import CSafeLoader as YamlSafeLoader
+    YAML_BACKEND = "libyaml"
+except ImportError:
+    from yaml import SafeLoader as YamlSafeLoader
+    YAML_BACKEND = "python"
+
+@timed("data.deep_merge")
 def deep_merge(dict1, dict2):
     """
     Recursively merge two dictionaries, with dict2 values taking precedence.
@@ -25,6 +41,113 @@ def deep_merge(dict1, dict2):
             result[key] = value
     return result
 
+def fingerprint_data(data):
+    """
+    Compute a content fingerprint of JSON-like data.
+
+    Parameters:
+    - data: Parsed JSON/YAML data
+
+    Returns:
+    - str: Hex digest that changes whenever the content changes
+    """
+    try:
+        serialized = json_backend.dumps_bytes(data, sort_keys=True)
+    except TypeError:
+        # Keys of mixed types (e.g. YAML integers and strings) can't be sorted
+        serialized = repr(data).encode("utf-8")
+    return hashlib.sha256(serialized).hexdigest()
+
+# Sentinel for keys missing from a layer
+_MISSING = object()
+
+class LayeredContext(Mapping):
+    """
+    Read-only merged view over several dictionaries without copying them.
+
+    Lookups go through the layers in order and the first layer containing a key
+    wins, matching deep_merge(base, overlay) for LayeredContext(overlay, base).
+    When the winning value is a dict and the next layers hold dicts for the
+    same key, a nested LayeredContext over them is created on first access, so
+    keys the template never reads cost nothing.
+    """
+
+    __slots__ = ("_layers", "_children")
+
+    def __init__(self, *layers):
+        """
+        Args:
+            *layers (dict): Dictionaries to merge, highest precedence first
+        """
+        self._layers = layers
+        self._children = {}
+
+    def __getitem__(self, key):
+        child = self._children.get(key)
+        if child is not None:
+            return child
+
+        dict_values = []
+        for layer in self._layers:
+            value = layer.get(key, _MISSING)
+            if value is _MISSING:
+                continue
+            if not isinstance(value, (dict, LayeredContext)):
+                if dict_values:
+                    break
+                return value
+            dict_values.append(value)
+
+        if not dict_values:
+            raise KeyError(key)
+        if len(dict_values) == 1:
+            return dict_values[0]
+
+        child = LayeredContext(*dict_values)
+        self._children[key] = child
+        return child
+
+    def __iter__(self):
+        layers = self._layers
+        if layers:
+            yield from layers[0]
+        for index in range(1, len(layers)):
+            previous = layers[:index]
+            for key in layers[index]:
+                if not any(key in layer for layer in previous):
+                    yield key
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def __contains__(self, key):
+        return any(key in layer for layer in self._layers)
+
+    def __repr__(self):
+        return f"LayeredContext({dict(self)!r})"
+
+    def copy(self):
+        """
+        Return a shallow copy of the merged top level, like dict.copy().
+
+        Returns:
+            dict: Top-level keys mapped to their merged values
+        """
+        return dict(self)
+
+    def to_dict(self):
+        """
+        Materialize the merged view as plain nested dictionaries.
+
+        Returns:
+            dict: The same result deep_merge would produce
+        """
+        return {
+            key: value.to_dict() if isinstance(value, LayeredContext) else value
+            for key, value in self.items()
+        }
+
+@timed("data.load_json_file")
 def load_json_file(file_content):
     """
     Load and parse a JSON file content.
@@ -37,13 +160,14 @@ def load_json_file(file_content):
                and error is an error message or None if successful
     """
     try:
-        data = json.loads(file_content)
+        data = json_backend.loads(file_content)
         return data, None
     except json.JSONDecodeError as e:
         return None, f"Error decoding JSON: {e}"
     except Exception as e:
         return None, f"Error processing data: {e}"
 
+@timed("data.load_yaml_content")
 def load_yaml_content(file_content):
     """
     Load and parse YAML content.
@@ -56,40 +180,52 @@ def load_yaml_content(file_content):
                and error is an error message or None if successful
     """
     try:
-        data = yaml.safe_load(file_content)
+        data = yaml.load(file_content, Loader=YamlSafeLoader)
         return data, None
     except yaml.YAMLError as e:
         return None, f"Error decoding YAML: {e}"
     except Exception as e:
         return None, f"Error processing data: {e}"
 
-def filter_json(data, query):
+@timed("data.filter_json")
+def filter_json(data, query, exact_match=False):
     """
     Filter a JSON object for keys/values that match a search query.
     
+    For repeated searches over large documents use search_index.search_json,
+    which answers from an index built once instead of walking the data.
+    
     Args:
         data: JSON object (dict or list)
         query: Search query string
+        exact_match: Only match keys/values equal to the query (case-insensitive)
         
     Returns:
         filtered object of the same type as input
     """
     if not query:
         return data
+    
+    query = query.lower()
+    
+    def matches(item):
+        if exact_match:
+            return not isinstance(item, (dict, list)) and str(item).lower() == query
+        return query in str(item).lower()
         
     filtered_data = {}
     if isinstance(data, dict):
         for key, value in data.items():
-            if query.lower() in str(key).lower() or query.lower() in str(value).lower():
+            if matches(key) or matches(value):
                 filtered_data[key] = value
             elif isinstance(value, (dict, list)):
-                result = filter_json(value, query)
+                result = filter_json(value, query, exact_match)
                 if result:
                     filtered_data[key] = result
     elif isinstance(data, list):
         filtered_list = []
         for item in data:
-            result = filter_json(item, query)
+            result = filter_json(item, query, exact_match)
             if result:
                 filtered_list.append(result)
         return filtered_list
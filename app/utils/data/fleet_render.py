@@ -0,0 +1,213 @@
+# app/utils/data/fleet_render.py
+"""
+Fleet rendering: render one template against every switch in a blueprint.
+"""
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import jinja2
+
+from ..api.apstra_client import get_blueprint_nodes
+from ..api import async_apstra_client
+from .template_engine import render_template, slice_render_context, DEFAULT_SLICE_CONTEXT
+from .template_profiler import TemplateProfiler, merge_profile_reports
+
+def get_blueprint_switches(base_url, token, blueprint_id):
+    """
+    Get the switch nodes of a blueprint.
+
+    Args:
+        base_url (str): The base URL of the API
+        token (str): Apstra API Token
+        blueprint_id (str): ID of the blueprint
+
+    Returns:
+        tuple: (switches, error) where switches is a list of dicts with id, label,
+               hostname and role or None if error occurred, and error is an error
+               message or None if successful
+    """
+    nodes_response = get_blueprint_nodes(base_url, token, blueprint_id)
+    if not nodes_response or "error" in nodes_response:
+        return None, (nodes_response or {}).get("error", "Empty response from Apstra")
+
+    switches = []
+    for node_item in nodes_response.get("items", []):
+        node = node_item.get("switch_nodes")
+        if node and "id" in node and "label" in node:
+            switches.append({
+                "id": node["id"],
+                "label": node["label"],
+                "hostname": node.get("hostname", "Unknown"),
+                "role": node.get("role", "unknown")
+            })
+    return switches, None
+
+def fetch_fleet_contexts(base_url, token, blueprint_id, node_ids):
+    """
+    Fetch the config-context of many nodes concurrently.
+
+    The number of requests in flight is bounded by the per-host limit of
+    async_apstra_client.
+
+    Args:
+        base_url (str): The base URL of the API
+        token (str): Apstra API Token
+        blueprint_id (str): ID of the blueprint
+        node_ids (list): IDs of the nodes to fetch
+
+    Returns:
+        dict: Node ID to device context, or to {"error": ...} if the fetch failed
+    """
+    if not node_ids:
+        return {}
+    return async_apstra_client.run(
+        async_apstra_client.get_device_contexts(base_url, token, blueprint_id, node_ids)
+    )
+
+def _render_device(job):
+    """
+    Render the template for one device. Runs in a worker process.
+
+    Args:
+        job (tuple): (node_id, template_string, device_context, property_set, profile)
+
+    Returns:
+        tuple: (node_id, rendered_output, error, render_time, profile_report) where
+               profile_report is None unless profile is set
+    """
+    node_id, template_string, device_context, property_set, profile = job
+    profiler = TemplateProfiler(template_string) if profile else None
+    start = time.perf_counter()
+    rendered_output, error = render_template(
+        template_string, device_context, property_set, slice_context=False, profiler=profiler
+    )
+    render_time = time.perf_counter() - start
+    return node_id, rendered_output, error, render_time, profiler.report() if profiler and not error else None
+
+def render_fleet(template_string, device_contexts, property_set=None, max_workers=None, slice_context=None,
+                 profile=False):
+    """
+    Render a template against many device contexts in a process pool.
+
+    With slicing enabled every device context is sliced to the paths the
+    template reads before it is sent to a worker, so only those parts are
+    pickled and copied between processes.
+
+    Args:
+        template_string (str): Jinja2 template
+        device_contexts (dict): Node ID to device context (or {"error": ...} for failed fetches)
+        property_set (dict, optional): Property set merged into every device context
+        max_workers (int, optional): Number of worker processes (defaults to the CPU count)
+        slice_context (bool, optional): Send workers only the context paths the template reads
+            (defaults to DEFAULT_SLICE_CONTEXT)
+        profile (bool): Profile every render (see template_profiler); slows rendering down
+
+    Returns:
+        dict: Render results with keys:
+            - results: node ID to {"output", "error", "render_time"}, plus "profile"
+              with the device's profile report when profiling
+            - failures: error message to list of node IDs
+            - wall_time: total time in seconds
+            - profile: profile reports of all devices merged, only when profiling
+    """
+    start = time.perf_counter()
+    results = {}
+
+    jobs = []
+    for node_id, device_context in device_contexts.items():
+        if not isinstance(device_context, dict) or "error" in device_context:
+            error = device_context.get("error") if isinstance(device_context, dict) else "Invalid device context"
+            results[node_id] = {"output": None, "error": f"Error fetching device context: {error}", "render_time": 0.0}
+        else:
+            jobs.append((node_id, template_string, device_context, property_set, profile))
+
+    if slice_context is None:
+        slice_context = DEFAULT_SLICE_CONTEXT
+    if jobs and slice_context:
+        try:
+            jobs = [
+                (node_id, template_string)
+                + slice_render_context(template_string, device_context, property_set)
+                + (profile,)
+                for node_id, template_string, device_context, property_set, profile in jobs
+            ]
+        except jinja2.exceptions.TemplateSyntaxError:
+            # Let the workers report the syntax error for every device
+            pass
+
+    if jobs:
+        workers = min(max_workers or os.cpu_count() or 1, len(jobs))
+        # Send jobs in batches to keep inter-process overhead low on large fabrics
+        chunksize = max(1, len(jobs) // (workers * 4))
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            for node_id, rendered_output, error, render_time, profile_report in executor.map(
+                _render_device, jobs, chunksize=chunksize
+            ):
+                results[node_id] = {"output": rendered_output, "error": error, "render_time": render_time}
+                if profile:
+                    results[node_id]["profile"] = profile_report
+
+    report = {
+        "results": results,
+        "failures": group_failures(results),
+        "wall_time": time.perf_counter() - start
+    }
+    if profile:
+        report["profile"] = merge_profile_reports(result.get("profile") for result in results.values())
+    return report
+
+def group_failures(results):
+    """
+    Group failed devices by their error message.
+
+    Args:
+        results (dict): Node ID to {"output", "error", "render_time"}
+
+    Returns:
+        dict: Error message to sorted list of node IDs, most common error first
+    """
+    failures = {}
+    for node_id, result in results.items():
+        if result["error"]:
+            failures.setdefault(result["error"], []).append(node_id)
+    return {
+        error: sorted(node_ids)
+        for error, node_ids in sorted(failures.items(), key=lambda item: -len(item[1]))
+    }
+
+def run_fleet_render(base_url, token, blueprint_id, template_string, property_set=None, render_workers=None,
+                     profile=False):
+    """
+    Render a template against every switch in a blueprint.
+
+    Args:
+        base_url (str): The base URL of the API
+        token (str): Apstra API Token
+        blueprint_id (str): ID of the blueprint
+        template_string (str): Jinja2 template
+        property_set (dict, optional): Property set merged into every device context
+        render_workers (int, optional): Number of render worker processes
+        profile (bool): Profile every render and add the merged report as "profile"
+
+    Returns:
+        tuple: (report, error) where report is the render_fleet() result extended with
+               "switches", "fetch_time" and a total "wall_time", or None if error occurred
+    """
+    start = time.perf_counter()
+
+    switches, error = get_blueprint_switches(base_url, token, blueprint_id)
+    if error:
+        return None, f"Error fetching blueprint nodes: {error}"
+
+    device_contexts = fetch_fleet_contexts(
+        base_url, token, blueprint_id, [switch["id"] for switch in switches]
+    )
+    fetch_time = time.perf_counter() - start
+
+    report = render_fleet(template_string, device_contexts, property_set, render_workers, profile=profile)
+    report["switches"] = switches
+    report["fetch_time"] = fetch_time
+    report["render_wall_time"] = report["wall_time"]
+    report["wall_time"] = time.perf_counter() - start
+    return report, None
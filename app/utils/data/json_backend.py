@@ -0,0 +1,104 @@
+# app/utils/data/json_backend.py
+"""
+JSON decoding and encoding with an optional fast backend.
+
+orjson is used when it is installed, otherwise the standard library json
+module. Set CONFIGLET_JSON_BACKEND=json to force the standard library.
+Documents orjson rejects but the standard library accepts (NaN, integers
+wider than 64 bits, non-string keys) are handed to the standard library, so
+both backends accept and produce the same data.
+"""
+import json
+import os
+from collections.abc import Mapping
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - depends on the installed packages
+    orjson = None
+
+if os.environ.get("CONFIGLET_JSON_BACKEND", "").lower() == "json":
+    orjson = None
+
+# Name of the active backend ("orjson" or "json")
+JSON_BACKEND = "orjson" if orjson is not None else "json"
+
+# Raised by loads for invalid documents with either backend
+JSONDecodeError = json.JSONDecodeError
+
+def _default(value):
+    """Serialize merged context views and other mappings as dictionaries."""
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def loads(data):
+    """
+    Parse a JSON document.
+
+    Args:
+        data (str or bytes): JSON document
+
+    Returns:
+        The parsed object
+
+    Raises:
+        JSONDecodeError: If the document is not valid JSON
+    """
+    if orjson is not None:
+        try:
+            return orjson.loads(data)
+        except orjson.JSONDecodeError:
+            # Let the standard library accept its extensions (NaN, big integers)
+            # or raise its usual error message
+            pass
+    if isinstance(data, (bytes, bytearray, memoryview)):
+        data = bytes(data).decode("utf-8")
+    return json.loads(data)
+
+def dumps_bytes(data, indent=False, sort_keys=False):
+    """
+    Serialize an object to UTF-8 encoded JSON.
+
+    Args:
+        data: Object to serialize
+        indent (bool): Indent nested structures by two spaces
+        sort_keys (bool): Sort dictionary keys
+
+    Returns:
+        bytes: The JSON document
+
+    Raises:
+        TypeError: If the object cannot be serialized
+    """
+    if orjson is not None:
+        option = orjson.OPT_NON_STR_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        if sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        try:
+            return orjson.dumps(data, default=_default, option=option)
+        except TypeError:
+            # Fall through for values only the standard library handles
+            pass
+    return json.dumps(
+        data, indent=2 if indent else None, sort_keys=sort_keys, default=_default, ensure_ascii=False
+    ).encode("utf-8")
+
+def dumps(data, indent=False, sort_keys=False):
+    """
+    Serialize an object to a JSON string.
+
+    Args:
+        data: Object to serialize
+        indent (bool): Indent nested structures by two spaces
+        sort_keys (bool): Sort dictionary keys
+
+    Returns:
+        str: The JSON document
+
+    Raises:
+        TypeError: If the object cannot be serialized
+    """
+    return dumps_bytes(data, indent, sort_keys).decode("utf-8")
@@ -0,0 +1,326 @@
+# app/utils/data/json_stream.py
+"""
+Incremental JSON parsing from a byte stream.
+
+Large config-contexts are parsed straight from the uploaded file in chunks,
+so the raw bytes, a decoded copy of the whole document and the parsed tree
+never have to be held in memory at the same time. Only the current chunk
+and the tree being built are kept.
+
+The incremental parser is several times slower than json_backend.loads, so
+load_json_stream only streams documents larger than STREAM_THRESHOLD_BYTES
+and parses smaller ones in one go.
+"""
+import codecs
+import json
+import os
+import re
+from json.decoder import scanstring
+from json.scanner import make_scanner
+
+from . import json_backend
+
+# Number of bytes read from the stream at a time
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+
+# Documents of known size up to this many bytes are parsed at once instead of streamed
+STREAM_THRESHOLD_BYTES = int(os.environ.get("CONFIGLET_JSON_STREAM_THRESHOLD", 4 * 1024 * 1024))
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_NUMBER = re.compile(r"-?(?:0|[1-9]\d*)(\.\d+)?([eE][-+]?\d+)?")
+# Characters that could still extend a number at the end of a chunk
+_NUMBER_TAIL = re.compile(r"[0-9.eE+-]*\Z")
+_CONSTANTS = {
+    "true": True,
+    "false": False,
+    "null": None,
+    "NaN": float("nan"),
+    "Infinity": float("inf"),
+    "-Infinity": float("-inf"),
+}
+
+# Parser states
+_VALUE = 0        # expecting a value
+_KEY = 1          # expecting an object key (or "}" right after "{")
+_COLON = 2        # expecting ":" after a key
+_SEPARATOR = 3    # expecting "," or the end of the enclosing container
+_FIRST_VALUE = 4  # expecting a value or "]" right after "["
+
+class _NeedMoreData(Exception):
+    """Raised when a token may continue in the next chunk."""
+
+class _Reader:
+    """Decodes a byte stream chunk by chunk and tracks positions for error messages."""
+
+    def __init__(self, stream, chunk_size, progress, total_bytes):
+        self.stream = stream
+        self.chunk_size = chunk_size
+        self.progress = progress
+        self.total_bytes = total_bytes
+        self.bytes_read = 0
+        self.decoder = codecs.getincrementaldecoder("utf-8-sig")()
+        self.text = ""
+        self.eof = False
+        # Characters and lines dropped from the front of text
+        self.offset = 0
+        self.lines = 0
+        self.line_start = 0
+
+    def fill(self, position):
+        """
+        Drop text before position and append the next chunk.
+
+        Returns:
+            int: The new position of the first kept character (always 0)
+        """
+        dropped = self.text[:position]
+        newlines = dropped.count("\n")
+        if newlines:
+            self.lines += newlines
+            self.line_start = self.offset + dropped.rindex("\n") + 1
+        self.offset += position
+
+        chunk = self.stream.read(self.chunk_size)
+        if not chunk:
+            self.eof = True
+            self.text = self.text[position:] + self.decoder.decode(b"", final=True)
+        else:
+            self.bytes_read += len(chunk)
+            self.text = self.text[position:] + self.decoder.decode(chunk)
+            if self.progress is not None:
+                self.progress(self.bytes_read, self.total_bytes)
+        return 0
+
+    def error(self, message, position):
+        """Build a JSONDecodeError with the position in the whole document."""
+        absolute = self.offset + position
+        newlines = self.text.count("\n", 0, position)
+        if newlines:
+            line = self.lines + newlines + 1
+            column = position - self.text.rindex("\n", 0, position)
+        else:
+            line = self.lines + 1
+            column = absolute - self.line_start + 1
+        error = json.JSONDecodeError(message, "", 0)
+        error.msg, error.pos, error.lineno, error.colno = message, absolute, line, column
+        error.args = (f"{message}: line {line} column {column} (char {absolute})",)
+        return error
+
+def parse_json_stream(stream, progress=None, total_bytes=None, chunk_size=DEFAULT_CHUNK_SIZE):
+    """
+    Parse a JSON document incrementally from a binary stream.
+
+    Args:
+        stream: Binary file-like object with a read(size) method
+        progress (callable, optional): Called as progress(bytes_read, total_bytes) after every chunk
+        total_bytes (int, optional): Size of the stream, passed through to progress
+        chunk_size (int): Number of bytes to read at a time
+
+    Returns:
+        The parsed object
+
+    Raises:
+        json.JSONDecodeError: If the document is not valid JSON
+        UnicodeDecodeError: If the stream is not UTF-8
+    """
+    reader = _Reader(stream, chunk_size, progress, total_bytes)
+    position = reader.fill(0)
+
+    # Objects share one string per distinct key, as with json.loads. Values that
+    # fit in the buffer are parsed by the C-accelerated scanner of the json module.
+    keys = {}
+    def share_keys(pairs):
+        share = keys.setdefault
+        return {share(key, key): value for key, value in pairs}
+    scan_once = make_scanner(json.JSONDecoder(object_pairs_hook=share_keys))
+
+    # Each stack entry is [container, pending key]; the key is unused for lists
+    stack = []
+    state = _VALUE
+    root = None
+    done = False
+
+    while True:
+        text = reader.text
+        position = _WHITESPACE.match(text, position).end()
+        if position == len(text):
+            if reader.eof:
+                break
+            position = reader.fill(position)
+            continue
+
+        if done:
+            raise reader.error("Extra data", position)
+
+        char = text[position]
+        try:
+            if state == _SEPARATOR:
+                container = stack[-1][0]
+                if char == ",":
+                    state = _KEY if isinstance(container, dict) else _VALUE
+                    position += 1
+                    continue
+                if char == ("}" if isinstance(container, dict) else "]"):
+                    position += 1
+                    stack.pop()
+                    if not stack:
+                        done = True
+                    continue
+                raise reader.error("Expecting ',' delimiter", position)
+
+            if state == _COLON:
+                if char != ":":
+                    raise reader.error("Expecting ':' delimiter", position)
+                position += 1
+                state = _VALUE
+                continue
+
+            if state == _KEY:
+                if char == '"':
+                    key, position = _scan_string(reader, position)
+                    stack[-1][1] = keys.setdefault(key, key)
+                    state = _COLON
+                    continue
+                # "}" is only allowed right after "{", not after a trailing comma
+                if char == "}" and not stack[-1][0]:
+                    position += 1
+                    stack.pop()
+                    state = _SEPARATOR
+                    if not stack:
+                        done = True
+                    continue
+                raise reader.error("Expecting property name enclosed in double quotes", position)
+
+            if state == _FIRST_VALUE and char == "]":
+                position += 1
+                stack.pop()
+                state = _SEPARATOR
+                if not stack:
+                    done = True
+                continue
+
+            # Parse a value. Objects and arrays that end inside the buffer are
+            # parsed whole by the json module; only the ones crossing a chunk
+            # boundary are opened here and parsed token by token.
+            scanned = _scan_container(scan_once, text, position) if char in "{[" else None
+            if scanned is not None:
+                value, position = scanned
+                next_state = _SEPARATOR
+            elif char == "{":
+                value = {}
+                next_state = _KEY
+            elif char == "[":
+                value = []
+                next_state = _FIRST_VALUE
+            elif char == '"':
+                value, position = _scan_string(reader, position)
+                next_state = _SEPARATOR
+            else:
+                value, position = _scan_scalar(reader, position)
+                next_state = _SEPARATOR
+
+            if next_state != _SEPARATOR:
+                position += 1
+
+            if stack:
+                container, key = stack[-1]
+                if isinstance(container, dict):
+                    container[key] = value
+                else:
+                    container.append(value)
+            else:
+                root = value
+
+            if next_state != _SEPARATOR:
+                stack.append([value, None])
+            state = next_state
+            if state == _SEPARATOR and not stack:
+                done = True
+
+        except _NeedMoreData:
+            # The token continues in the next chunk: refill and parse it again
+            position = reader.fill(position)
+
+    if stack or (not done and root is None):
+        messages = {
+            _KEY: "Expecting property name enclosed in double quotes",
+            _COLON: "Expecting ':' delimiter",
+            _SEPARATOR: "Expecting ',' delimiter",
+        }
+        raise reader.error(messages.get(state, "Expecting value"), len(reader.text))
+    return root
+
+def _scan_container(scan_once, text, position):
+    """Parse the object or array at position if it ends inside text, else return None."""
+    try:
+        return scan_once(text, position)
+    except (StopIteration, json.JSONDecodeError):
+        # Incomplete in this chunk, or invalid: parse it token by token
+        return None
+
+def _scan_string(reader, position):
+    """Parse the string starting at position (the opening quote)."""
+    try:
+        return scanstring(reader.text, position + 1, True)
+    except json.JSONDecodeError as error:
+        if not reader.eof:
+            raise _NeedMoreData()
+        raise reader.error(error.msg, error.pos)
+
+def _scan_scalar(reader, position):
+    """Parse the number or constant starting at position."""
+    text = reader.text
+    match = _NUMBER.match(text, position)
+    if match:
+        end = match.end()
+        if not reader.eof and _NUMBER_TAIL.match(text, end):
+            raise _NeedMoreData()
+        integer = match.group()
+        if match.group(1) or match.group(2):
+            return float(integer), end
+        return int(integer), end
+
+    remaining = len(text) - position
+    for literal, value in _CONSTANTS.items():
+        if text.startswith(literal, position):
+            return value, position + len(literal)
+        if not reader.eof and remaining < len(literal) and literal.startswith(text[position:]):
+            raise _NeedMoreData()
+    raise reader.error("Expecting value", position)
+
+def load_json_stream(stream, progress=None, total_bytes=None, chunk_size=DEFAULT_CHUNK_SIZE,
+                     stream_threshold=STREAM_THRESHOLD_BYTES):
+    """
+    Load and parse a JSON document from a binary stream.
+
+    Streaming trades speed for memory: documents whose total_bytes is known
+    and at most stream_threshold are read whole and parsed with
+    json_backend.loads, which is several times faster, while larger or
+    unsized streams are parsed incrementally so their raw bytes, decoded
+    text and parsed tree are never held at the same time.
+
+    Args:
+        stream: Binary file-like object with a read(size) method
+        progress (callable, optional): Called as progress(bytes_read, total_bytes) after every chunk
+        total_bytes (int, optional): Size of the stream, passed through to progress
+        chunk_size (int): Number of bytes to read at a time
+        stream_threshold (int): Largest total_bytes parsed at once instead of streamed
+
+    Returns:
+        tuple: (data, error) where data is the parsed JSON or None if error occurred
+               and error is an error message or None if successful
+
+    Raises:
+        UnicodeDecodeError: If the stream is not UTF-8
+    """
+    try:
+        if total_bytes is not None and total_bytes <= stream_threshold:
+            document = stream.read()
+            if progress is not None:
+                progress(len(document), total_bytes)
+            data = json_backend.loads(document.decode("utf-8-sig"))
+        else:
+            data = parse_json_stream(stream, progress, total_bytes, chunk_size)
+        return data, None
+    except json.JSONDecodeError as e:
+        return None, f"Error decoding JSON: {e}"
@@ -0,0 +1,167 @@
+# app/utils/data/json_tree.py
+"""
+Bounded views of large JSON documents for display.
+
+Passing a whole device context to st.json serializes and ships the entire
+tree to the browser on every rerun, even though only the first levels are
+expanded. visible_tree() builds the part of a document that is actually
+shown instead: containers below the expansion depth are replaced by a
+short summary, containers with many children show one page of them, and
+the total number of nodes is capped. Children of a collapsed container are
+only loaded when the viewer opens it.
+
+The depth of every container is computed once per loaded document by
+container_depths(), so the depth controls don't walk the tree on every
+rerun.
+"""
+import itertools
+import os
+from collections import deque
+
+# Maximum number of nodes sent to the browser per viewer
+DEFAULT_MAX_NODES = int(os.environ.get("CONFIGLET_JSON_VIEWER_MAX_NODES", "2000"))
+
+# Children shown per container; the rest are summarized
+DEFAULT_PAGE_SIZE = 100
+
+# Deepest expansion offered by the depth controls
+MAX_DISPLAY_DEPTH = 10
+
+def container_depths(data):
+    """
+    Compute the nesting depth of every non-empty container in one pass.
+
+    Args:
+        data: Parsed JSON document
+
+    Returns:
+        dict: id() of each non-empty dict and list to the number of nested
+              non-empty container levels it holds, counting itself (1 for a
+              container holding only scalars or empty containers)
+    """
+    depths = {}
+
+    def walk(node):
+        deepest = 0
+        for child in node.values() if isinstance(node, dict) else node:
+            if isinstance(child, (dict, list)) and child:
+                child_depth = walk(child)
+                if child_depth > deepest:
+                    deepest = child_depth
+        depths[id(node)] = deepest + 1
+        return deepest + 1
+
+    if isinstance(data, (dict, list)) and data:
+        walk(data)
+    return depths
+
+def display_depth(depths, node):
+    """
+    Get the deepest useful expansion of a node from precomputed depths.
+
+    Matches calculate_max_depth() in json_display_controls without walking
+    the node.
+
+    Args:
+        depths (dict): Result of container_depths() for the document holding node
+        node: A value of that document
+
+    Returns:
+        int: Expansion depth that shows the whole node, capped at MAX_DISPLAY_DEPTH
+    """
+    return min(depths.get(id(node), 0) + 1, MAX_DISPLAY_DEPTH)
+
+def summarize(value):
+    """
+    Describe a collapsed container in a few characters.
+
+    Args:
+        value: A dict or list
+
+    Returns:
+        str: For example "{…} 12 keys" or "[…] 340 items"
+    """
+    if isinstance(value, dict):
+        return f"{{…}} {len(value)} key{'s' if len(value) != 1 else ''}"
+    return f"[…] {len(value)} item{'s' if len(value) != 1 else ''}"
+
+def resolve_path(data, path):
+    """
+    Get the value at a path of keys and list indexes.
+
+    Args:
+        data: Parsed JSON document
+        path (list): Keys and list indexes from the root
+
+    Returns:
+        tuple: (value, path) for the deepest existing prefix of path, so a
+               path left over from a previous document falls back to its
+               nearest existing ancestor
+    """
+    node = data
+    for depth, key in enumerate(path):
+        if isinstance(node, dict) and key in node:
+            node = node[key]
+        elif isinstance(node, list) and isinstance(key, int) and 0 <= key < len(node):
+            node = node[key]
+        else:
+            return node, list(path[:depth])
+    return node, list(path)
+
+def visible_tree(data, depth, offset=0, page_size=DEFAULT_PAGE_SIZE, max_nodes=DEFAULT_MAX_NODES):
+    """
+    Build the part of a document shown at an expansion depth.
+
+    Levels are filled breadth first, so the top of the document is always
+    shown and the node budget runs out in the deepest levels. Containers at
+    or below depth, or beyond the budget, are replaced by summarize().
+    Containers with more than page_size children show the first page_size
+    and a marker counting the rest.
+
+    Args:
+        data: Parsed JSON document (or the subtree being viewed)
+        depth (int): Expansion depth; the first level is always shown
+        offset (int): Index of the first child of the root to show
+        page_size (int): Children shown per container
+        max_nodes (int): Maximum number of nodes in the result
+
+    Returns:
+        The shown part of data, sharing no containers with it
+    """
+    if not isinstance(data, (dict, list)):
+        return data
+
+    depth = max(depth, 1)
+    budget = max_nodes
+    root = {} if isinstance(data, dict) else []
+    queue = deque([(data, root, 0, offset)])
+    while queue:
+        source, target, level, start = queue.popleft()
+        items = source.items() if isinstance(source, dict) else enumerate(source)
+        shown = 0
+        for key, value in itertools.islice(items, start, None):
+            if shown >= page_size or budget <= 0:
+                break
+            if isinstance(value, (dict, list)) and value:
+                if level + 1 < depth:
+                    # Filled in when its level is reached
+                    child = {} if isinstance(value, dict) else []
+                    queue.append((value, child, level + 1, 0))
+                else:
+                    child = summarize(value)
+            else:
+                child = value
+            if isinstance(target, dict):
+                target[key] = child
+            else:
+                target.append(child)
+            shown += 1
+            budget -= 1
+
+        hidden = len(source) - start - shown
+        if hidden > 0:
+            if isinstance(target, dict):
+                target["…"] = f"{hidden} more key{'s' if hidden != 1 else ''}"
+            else:
+                target.append(f"… {hidden} more item{'s' if hidden != 1 else ''}")
+    return root
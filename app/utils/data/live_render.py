@@ -0,0 +1,180 @@
+# app/utils/data/live_render.py
+"""
+Debounced live rendering for the template editor.
+
+The editor reruns the app on every keystroke. Instead of rendering each
+keystroke in the script run, edits are submitted to a DebouncedRenderer:
+edits arriving within the debounce window replace each other, the latest
+one is rendered in a background thread once the window has passed, and
+results that finish after a newer edit are dropped. Until the latest edit
+has rendered, the last output that rendered without errors is shown as
+stale. Streaming renderers also report the output chunks a background
+render has produced so far, so large outputs can be shown as they grow.
+"""
+import os
+import threading
+import time
+
+# Edits closer together than this are coalesced into one render
+DEFAULT_DEBOUNCE_SECONDS = int(os.environ.get("CONFIGLET_RENDER_DEBOUNCE_MS", "300")) / 1000
+
+# How long a script run waits for a render it started before showing it as pending
+INLINE_RENDER_SECONDS = 0.05
+
+# How often a pending render is checked while it is running
+POLL_INTERVAL_SECONDS = 0.1
+
+class DebouncedRenderer:
+    """
+    Coalesces render requests and renders only the latest one.
+
+    submit() records the inputs of a render and poll() returns the result
+    for the latest inputs, or the last good output marked as stale while
+    that result is pending. With a debounce window of zero every submission
+    is rendered synchronously by poll().
+    """
+
+    def __init__(self, render, debounce_seconds=None, inline_seconds=INLINE_RENDER_SECONDS, clock=time.monotonic,
+                 stream=False):
+        """
+        Args:
+            render (callable): Called with the submitted arguments; returns (output, error)
+            debounce_seconds (float, optional): Debounce window (defaults to DEFAULT_DEBOUNCE_SECONDS)
+            inline_seconds (float): Time poll() waits for a render it started
+            clock (callable): Monotonic clock returning seconds
+            stream (bool): Pass on_chunk to background renders and report their partial output
+        """
+        self.debounce_seconds = DEFAULT_DEBOUNCE_SECONDS if debounce_seconds is None else debounce_seconds
+        self.inline_seconds = inline_seconds
+        self.dropped = 0
+        self._render = render
+        self._stream = stream
+        self._partial = None
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._key = None
+        self._args = None
+        self._edited_at = None
+        self._running = None
+        self._result = None
+        self._last_good = None
+
+    def submit(self, key, *args):
+        """
+        Record the inputs of the render to show next.
+
+        Args:
+            key (hashable): Identifies the inputs; submitting the current key again is a no-op
+            *args: Arguments passed to the render function
+
+        Returns:
+            int: Generation number of the latest inputs
+        """
+        with self._lock:
+            if key != self._key:
+                # The first render is not delayed; later edits wait for the window
+                self._edited_at = None if self._key is None else self._clock()
+                self._generation += 1
+                self._key = key
+                self._args = args
+            return self._generation
+
+    def poll(self):
+        """
+        Get the render result for the latest inputs, starting the render when it is due.
+
+        Returns:
+            dict: Render status with keys:
+                - output: rendered output, or the last good output if stale
+                - error: error of the latest render, or None
+                - stale: True if output was not rendered from the latest inputs
+                - pending: True if the latest inputs have not been rendered yet
+                - wait: seconds until poll() should be called again (0.0 if not pending)
+                - partial: output chunks the running render of the latest inputs has
+                  produced so far (always empty unless streaming)
+        """
+        if self._generation == 0:
+            return {"output": None, "error": None, "stale": False, "pending": False, "wait": 0.0, "partial": []}
+        if self.debounce_seconds <= 0:
+            return self._poll_synchronous()
+
+        with self._lock:
+            status = self._status()
+            if not status["pending"] or self._running is not None or status["wait"] > 0:
+                return status
+            # The debounce window has passed: render the latest inputs
+            thread = threading.Thread(target=self._run, args=(self._generation, self._args), daemon=True)
+            self._running = self._generation
+            thread.start()
+
+        # Fast renders finish within this run instead of waiting for a rerun
+        thread.join(self.inline_seconds)
+        with self._lock:
+            return self._status()
+
+    def _status(self):
+        """Build the poll() status. Must be called with the lock held."""
+        if self._result is not None and self._result[0] == self._generation:
+            output, error = self._result[1]
+            return {
+                "output": self._last_good if error else output,
+                "error": error,
+                "stale": bool(error),
+                "pending": False,
+                "wait": 0.0,
+                "partial": [],
+            }
+
+        if self._running is not None:
+            wait = POLL_INTERVAL_SECONDS
+        elif self._edited_at is None:
+            wait = 0.0
+        else:
+            wait = max(0.0, self._edited_at + self.debounce_seconds - self._clock())
+        partial = []
+        if self._partial is not None and self._partial[0] == self._generation:
+            # Copy the chunk references; the render thread keeps appending
+            partial = list(self._partial[1])
+        return {"output": self._last_good, "error": None, "stale": True, "pending": True, "wait": wait,
+                "partial": partial}
+
+    def _run(self, generation, args):
+        """Render one set of inputs. Runs in a background thread."""
+        try:
+            if self._stream:
+                chunks = []
+                with self._lock:
+                    self._partial = (generation, chunks)
+                # list.extend is atomic, so the chunks can be read while the render appends
+                result = self._render(*args, on_chunk=chunks.extend)
+            else:
+                result = self._render(*args)
+        except Exception as e:
+            result = (None, f"An unexpected error occurred: {e}")
+        with self._lock:
+            self._running = None
+            self._partial = None
+            self._store(generation, result)
+
+    def _store(self, generation, result):
+        """Keep a result unless newer inputs were submitted. Must be called with the lock held."""
+        if generation != self._generation:
+            self.dropped += 1
+            return
+        self._result = (generation, result)
+        if not result[1]:
+            self._last_good = result[0]
+
+    def _poll_synchronous(self):
+        """Render the latest inputs in the calling thread."""
+        with self._lock:
+            if self._result is None or self._result[0] != self._generation:
+                self._running = self._generation
+                try:
+                    result = self._render(*self._args)
+                except Exception as e:
+                    result = (None, f"An unexpected error occurred: {e}")
+                self._running = None
+                self._store(self._generation, result)
+            return self._status()
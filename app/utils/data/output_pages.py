@@ -0,0 +1,91 @@
+# app/utils/data/output_pages.py
+"""
+Paged display of large rendered outputs.
+
+Showing a full-device config in one code block makes the browser lay out
+every line at once. The output is split into pages of a fixed number of
+lines instead, and only the page being viewed is sent to the browser.
+Page boundaries are found once per output, and each page is one slice of
+the output string.
+"""
+import itertools
+import os
+import re
+
+# Lines per page of rendered output
+DEFAULT_PAGE_LINES = int(os.environ.get("CONFIGLET_OUTPUT_PAGE_LINES", "2000"))
+
+_LINE_BREAK = re.compile("\n")
+
+def page_offsets(text, page_lines=None):
+    """
+    Find the offsets at which the pages of an output start.
+
+    Args:
+        text (str): Rendered output
+        page_lines (int, optional): Lines per page (defaults to DEFAULT_PAGE_LINES)
+
+    Returns:
+        list: Start offset of every page followed by len(text); an empty
+              output has a single empty page
+    """
+    page_lines = page_lines or DEFAULT_PAGE_LINES
+    # Every page_lines-th line break ends a page
+    page_ends = itertools.islice(_LINE_BREAK.finditer(text), page_lines - 1, None, page_lines)
+    offsets = [0]
+    offsets.extend(match.end() for match in page_ends)
+    if len(offsets) > 1 and offsets[-1] == len(text):
+        # The output ends exactly on a page boundary
+        offsets.pop()
+    offsets.append(len(text))
+    return offsets
+
+def count_lines(text):
+    """
+    Count the lines of an output.
+
+    Args:
+        text (str): Rendered output
+
+    Returns:
+        int: Number of lines, counting a last line without a line break
+    """
+    if not text:
+        return 0
+    return text.count("\n") + (not text.endswith("\n"))
+
+def get_page(text, offsets, page):
+    """
+    Get one page of an output.
+
+    Args:
+        text (str): Rendered output
+        offsets (list): Page offsets from page_offsets(text)
+        page (int): Zero-based page number, clamped to the available pages
+
+    Returns:
+        str: Text of the page
+    """
+    page = max(0, min(page, len(offsets) - 2))
+    return text[offsets[page]:offsets[page + 1]]
+
+def first_page(chunks, page_lines=None):
+    """
+    Get the first page of an output that is still being rendered.
+
+    Args:
+        chunks (list): Output chunks rendered so far
+        page_lines (int, optional): Lines per page (defaults to DEFAULT_PAGE_LINES)
+
+    Returns:
+        str: The first page, or everything rendered so far if it is shorter
+    """
+    page_lines = page_lines or DEFAULT_PAGE_LINES
+    lines = 0
+    for index, chunk in enumerate(chunks):
+        lines += chunk.count("\n")
+        if lines >= page_lines:
+            # Join only the chunks holding the first page
+            head = "".join(chunks[:index + 1])
+            return get_page(head, page_offsets(head, page_lines), 0)
+    return "".join(chunks)
@@ -0,0 +1,117 @@
+# app/utils/data/render_memo.py
+"""
+Memoization of template renders keyed on content fingerprints.
+"""
+import threading
+from collections import OrderedDict
+
+import jinja2
+
+from .data_helpers import fingerprint_data
+from .template_engine import render_template, template_source_hash, slice_render_context, DEFAULT_SLICE_CONTEXT
+
+# Maximum number of memoized renders kept per session
+RENDER_MEMO_SIZE = 32
+
+# Hits and misses of all sessions' memos, for process-wide metrics
+_memo_stats = {"hits": 0, "misses": 0}
+_memo_stats_lock = threading.Lock()
+
+class RenderMemo:
+    """
+    Bounded LRU memo of render_template results.
+
+    Results are keyed on the hash of the template source and on fingerprints
+    of the device context and property set, so a rerun that changes none of
+    them returns the previous result without rendering. Error results are
+    memoized as well.
+
+    Without precomputed fingerprints the inputs are fingerprinted as they are.
+    When slicing is enabled they are first sliced to the paths the template
+    reads, and the slices are fingerprinted and rendered, so edits to parts
+    of the context the template never reads keep hitting the memo. With
+    precomputed fingerprints, slicing only applies to the render itself.
+    Sliced and unsliced results are memoized apart.
+    """
+
+    def __init__(self, max_size=RENDER_MEMO_SIZE):
+        """
+        Args:
+            max_size (int): Maximum number of memoized results
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._results = OrderedDict()
+
+    def render(self, template_string, device_context, property_set, context_fingerprint=None, property_fingerprint=None,
+               on_chunk=None, slice_context=None):
+        """
+        Render a template, returning the memoized result if the inputs are unchanged.
+
+        Args:
+            template_string (str): Jinja2 template
+            device_context (dict): Base template rendering context (device context)
+            property_set (dict): Additional properties to merge into context, or None
+            context_fingerprint (str, optional): Fingerprint of device_context; computed if omitted
+            property_fingerprint (str, optional): Fingerprint of property_set
+            on_chunk (callable, optional): Passed to render_template; not called for memoized results
+            slice_context (bool, optional): Render only the paths the template reads, and
+                fingerprint only these without fingerprints (defaults to DEFAULT_SLICE_CONTEXT)
+
+        Returns:
+            tuple: (rendered_output, error) as returned by render_template
+        """
+        if slice_context is None:
+            slice_context = DEFAULT_SLICE_CONTEXT
+        # Inputs still to be sliced by render_template
+        render_sliced = slice_context
+        if context_fingerprint is None:
+            try:
+                if slice_context:
+                    device_context, property_set = slice_render_context(template_string, device_context, property_set)
+                    render_sliced = False
+                context_fingerprint = fingerprint_data(device_context)
+                property_fingerprint = fingerprint_data(property_set)
+            except jinja2.exceptions.TemplateSyntaxError:
+                # Memoize the syntax error under the template alone
+                pass
+        key = (template_source_hash(template_string), context_fingerprint, property_fingerprint, bool(slice_context))
+
+        result = self._results.get(key)
+        if result is not None:
+            self._results.move_to_end(key)
+            self.hits += 1
+            _count("hits")
+            return result
+
+        self.misses += 1
+        _count("misses")
+        result = render_template(template_string, device_context, property_set, slice_context=render_sliced,
+                                 on_chunk=on_chunk)
+        self._results[key] = result
+        while len(self._results) > self.max_size:
+            self._results.popitem(last=False)
+        return result
+
+    def clear(self):
+        """Remove all memoized results."""
+        self._results.clear()
+
+    def __len__(self):
+        return len(self._results)
+
+def get_render_memo_stats():
+    """
+    Get the hit and miss counters of the render memos of all sessions.
+
+    Returns:
+        dict: Total hits and misses since the process started
+    """
+    with _memo_stats_lock:
+        return dict(_memo_stats)
+
+def _count(outcome):
+    """Count a memo hit or miss process-wide."""
+    with _memo_stats_lock:
+        _memo_stats[outcome] += 1
@@ -0,0 +1,268 @@
+# app/utils/data/search_index.py
+"""
+Inverted index for searching large JSON documents such as device contexts.
+
+The index is built once when the data is loaded. It maps lowercased keys,
+scalar values and JSON paths to the locations they occur at, so a search
+only scans the distinct terms and returns the matching subtrees straight
+from the original data instead of stringifying the tree on every keystroke.
+The container depths of the document are computed with the index, and the
+results of recent queries are kept in it, so reruns with an unchanged query
+neither search again nor walk the results for the JSON viewer.
+"""
+from bisect import bisect_left, bisect_right
+from collections import ChainMap, OrderedDict
+
+from .json_tree import container_depths
+
+# Match modes supported by search_json
+MATCH_SUBSTRING = "substring"
+MATCH_PREFIX = "prefix"
+MATCH_EXACT = "exact"
+
+# Labels for the match modes shown in search controls
+SEARCH_MATCH_MODES = {
+    "Contains": MATCH_SUBSTRING,
+    "Starts with": MATCH_PREFIX,
+    "Exact": MATCH_EXACT,
+}
+
+# Number of query results kept per index
+SEARCH_RESULT_CACHE_SIZE = 16
+
+# Separates terms in the joined term blob used for substring scans
+_TERM_SEPARATOR = "\x00"
+
+def _format_path(path):
+    """Format a path tuple as a JSON path string, e.g. interface.et-0/0/1.ips[0]."""
+    parts = []
+    for key in path:
+        if isinstance(key, int):
+            parts.append(f"[{key}]")
+        else:
+            parts.append(f".{key}" if parts else str(key))
+    return "".join(parts)
+
+def build_search_index(data):
+    """
+    Build a search index over a JSON document.
+
+    Args:
+        data: JSON object (dict or list)
+
+    Returns:
+        dict: Search index with keys:
+            - paths: list of location tuples (keys and list indexes from the root)
+            - terms: lowercased term to list of positions in paths
+            - sorted_terms: distinct terms in sorted order
+            - term_offsets: start offset of each sorted term in blob
+            - blob: all sorted terms joined for fast substring scanning
+            - depths: container depths of data (see json_tree.container_depths)
+            - results: recent search results, keyed by query and match mode
+    """
+    paths = []
+    terms = {}
+
+    def add_term(term, position):
+        positions = terms.get(term)
+        if positions is None:
+            terms[term] = [position]
+        elif positions[-1] != position:
+            positions.append(position)
+
+    # Iterative walk so deeply nested documents can't hit the recursion limit
+    stack = [((), data)]
+    while stack:
+        path, value = stack.pop()
+        if isinstance(value, dict):
+            children = value.items()
+        elif isinstance(value, list):
+            children = enumerate(value)
+        else:
+            children = ()
+
+        for key, child in children:
+            child_path = path + (key,)
+            position = len(paths)
+            paths.append(child_path)
+
+            if not isinstance(key, int) or isinstance(value, dict):
+                add_term(str(key).lower(), position)
+            add_term(_format_path(child_path).lower(), position)
+            if isinstance(child, (dict, list)):
+                stack.append((child_path, child))
+            else:
+                add_term(str(child).lower(), position)
+
+    sorted_terms = sorted(terms)
+    term_offsets = []
+    offset = 0
+    for term in sorted_terms:
+        term_offsets.append(offset)
+        offset += len(term) + len(_TERM_SEPARATOR)
+
+    return {
+        "paths": paths,
+        "terms": terms,
+        "sorted_terms": sorted_terms,
+        "term_offsets": term_offsets,
+        "blob": _TERM_SEPARATOR.join(sorted_terms),
+        "depths": container_depths(data),
+        "results": OrderedDict(),
+    }
+
+def _matching_terms(index, query, mode):
+    """Return the indexed terms matching query in the given mode."""
+    sorted_terms = index["sorted_terms"]
+
+    if mode == MATCH_EXACT:
+        return [query] if query in index["terms"] else []
+
+    if mode == MATCH_PREFIX:
+        start = bisect_left(sorted_terms, query)
+        end = bisect_right(sorted_terms, query + "\U0010ffff")
+        return sorted_terms[start:end]
+
+    # Substring: scan the joined terms in one pass instead of each term separately
+    blob = index["blob"]
+    term_offsets = index["term_offsets"]
+    matches = []
+    position = blob.find(query)
+    while position != -1:
+        term_number = bisect_right(term_offsets, position) - 1
+        term = sorted_terms[term_number]
+        # Skip occurrences spanning the separator between two terms
+        if position + len(query) <= term_offsets[term_number] + len(term):
+            matches.append(term)
+        if term_number + 1 >= len(term_offsets):
+            break
+        position = blob.find(query, term_offsets[term_number + 1])
+    return matches
+
+def find_paths(index, query, mode=MATCH_SUBSTRING):
+    """
+    Find the locations whose key, value or JSON path matches a query.
+
+    Args:
+        index (dict): Index returned by build_search_index
+        query (str): Search query (case-insensitive)
+        mode (str): MATCH_SUBSTRING, MATCH_PREFIX or MATCH_EXACT
+
+    Returns:
+        list: Matching location tuples, without locations inside another match
+    """
+    query = query.strip().lower()
+    if not query or _TERM_SEPARATOR in query:
+        return []
+
+    paths = index["paths"]
+    positions = set()
+    for term in _matching_terms(index, query, mode):
+        positions.update(index["terms"][term])
+
+    return _drop_nested([paths[position] for position in positions])
+
+def _drop_nested(paths):
+    """Remove paths that lie inside another path of the list."""
+    kept = set()
+    result = []
+    for path in sorted(paths, key=len):
+        if any(path[:length] in kept for length in range(1, len(path))):
+            continue
+        kept.add(path)
+        result.append(path)
+    return result
+
+def extract_paths(data, paths):
+    """
+    Build the subset of a document containing the given locations.
+
+    Each location is included with its full subtree. Ancestors keep their
+    original key order and lists keep the order of the matching items.
+
+    Args:
+        data: JSON object (dict or list)
+        paths (list): Location tuples as returned by find_paths
+
+    Returns:
+        filtered object of the same type as input
+    """
+    trie = {}
+    for path in paths:
+        node = trie
+        for key in path:
+            node = node.setdefault(key, {})
+        node[None] = True  # Marks a location included with its whole subtree
+
+    def build(value, node):
+        if None in node:
+            return value
+        if isinstance(value, dict):
+            return {key: build(child, node[key]) for key, child in value.items() if key in node}
+        if isinstance(value, list):
+            return [build(child, node[index]) for index, child in enumerate(value) if index in node]
+        return value
+
+    return build(data, trie)
+
+def search_json(index, data, query, mode=MATCH_SUBSTRING):
+    """
+    Search a JSON document through its index.
+
+    Args:
+        index (dict): Index returned by build_search_index(data)
+        data: The indexed JSON object (dict or list)
+        query (str): Search query (case-insensitive)
+        mode (str): MATCH_SUBSTRING, MATCH_PREFIX or MATCH_EXACT
+
+    Returns:
+        filtered object of the same type as input containing the matching subtrees;
+        the same object is returned while the query and mode are unchanged
+    """
+    if not query:
+        return data
+    results = index["results"]
+    key = (query.strip().lower(), mode)
+    result = results.get(key)
+    if result is None:
+        result = extract_paths(data, find_paths(index, query, mode))
+        results[key] = result
+        if len(results) > SEARCH_RESULT_CACHE_SIZE:
+            results.popitem(last=False)
+    else:
+        results.move_to_end(key)
+    return result
+
+def search_result_depths(index, result):
+    """
+    Get the container depths of a search result from the depths of the indexed document.
+
+    Matching subtrees are the document's own containers, so only the
+    containers built to hold them are walked.
+
+    Args:
+        index (dict): Index returned by build_search_index(data)
+        result: Result of search_json(index, data, ...)
+
+    Returns:
+        Mapping: id() of each non-empty container of result to its depth,
+                 like json_tree.container_depths(result)
+    """
+    depths = index["depths"]
+    result_depths = {}
+
+    def walk(node):
+        # The document is alive, so the ids of its containers can't be reused
+        known = depths.get(id(node))
+        if known is not None:
+            return known
+        deepest = 0
+        for child in node.values() if isinstance(node, dict) else node:
+            if isinstance(child, (dict, list)) and child:
+                deepest = max(deepest, walk(child))
+        result_depths[id(node)] = deepest + 1
+        return deepest + 1
+
+    if isinstance(result, (dict, list)) and result:
+        walk(result)
+    return ChainMap(result_depths, depths)
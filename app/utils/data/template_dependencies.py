@@ -0,0 +1,659 @@
+# app/utils/data/template_dependencies.py
+"""
+Dependency analysis of Jinja2 templates.
+
+Walks the parsed template AST and collects every context path the template
+can read, e.g. ("interface", "*", "ipv4_address") for
+
+    {% for name, data in interface.items() %}{{ data.ipv4_address }}{% endfor %}
+
+Paths are tuples of keys (strings), list indexes (integers), WILDCARD for
+"every child" and, as the last element only, KEYS when the template needs
+the keys of a collection but none of its values (e.g. to count loop
+iterations). A path covers the whole subtree below it.
+
+The analysis is conservative: whenever it cannot tell which part of a value
+is used (unknown filters, macro arguments, string operations, ...) it
+records the whole value, so the result is always a superset of what the
+template reads. Templates it cannot follow at all (includes, extends)
+depend on the empty path, which covers the whole context.
+"""
+import re
+
+from jinja2 import nodes
+
+# Path element matching every key or index of a collection
+WILDCARD = "*"
+
+class _Keys:
+    """Marker for a path whose collection keys, but not values, are read."""
+
+    def __repr__(self):
+        return "KEYS"
+
+# Last path element when only the keys of a collection are read
+KEYS = _Keys()
+
+# Path covering the whole context, for templates the analysis cannot follow
+WHOLE_CONTEXT = ()
+
+# Kinds of symbolic values
+_VALUE = "value"        # the value at the path
+_ITEMS = "items"        # (key, value) pairs of the collection at the path
+_ELEMENTS = "elements"  # a collection whose elements are each the value at the path
+
+# Filters that return the elements of their input collection (or a subset) in some order
+_COLLECTION_FILTERS = {
+    "list", "sort", "reverse", "unique", "select", "reject", "selectattr", "rejectattr"
+}
+
+# Filters returning one element of their input collection
+_ELEMENT_FILTERS = {"first", "last", "random", "min", "max"}
+
+# Filters comparing or testing whole elements unless given an attribute
+_COMPARING_FILTERS = {"sort", "unique", "min", "max", "select", "reject", "selectattr", "rejectattr"}
+
+# Attributes of the loop variable holding a neighbouring element of the iterable
+_LOOP_ITEMS = {"previtem", "nextitem"}
+
+# Filters returning their input unchanged when it is defined
+_DEFAULT_FILTERS = {"default", "d"}
+
+_IDENTIFIER = re.compile(r"[A-Za-z_][A-Za-z0-9_]*\Z")
+
+class _Analyzer:
+    """Symbolic walk over a template AST recording the context paths it reads."""
+
+    def __init__(self, global_names):
+        self.global_names = set(global_names)
+        self.reads = set()
+        # Each scope maps a local name to [symbolic value, used flag]
+        self.scopes = [{}]
+        # Symbolic element of each enclosing for loop, innermost last
+        self.loop_elements = []
+
+    # Scopes
+
+    def push_scope(self, names=()):
+        self.scopes.append({name: [set(), False] for name in names})
+
+    def pop_scope(self):
+        self._flush_unused(self.scopes.pop())
+
+    def _flush_unused(self, scope):
+        # A value bound but never used was still evaluated, so it must exist
+        for value, used in scope.values():
+            if not used:
+                self.consume(value)
+
+    def bind(self, target, value, evaluated=True):
+        """
+        Bind an assignment or loop target to a symbolic value.
+
+        evaluated is False for loop targets: iterating only needs the keys of
+        the collection, so an unused loop variable reads nothing.
+        """
+        if isinstance(target, nodes.Name):
+            scope = self.scopes[-1]
+            if target.name in scope and not scope[target.name][1]:
+                self.consume(scope[target.name][0])
+            scope[target.name] = [set(value), not evaluated]
+        elif isinstance(target, nodes.Tuple):
+            element = self.element(value)
+            for item in target.items:
+                self.bind(item, element, evaluated)
+        else:
+            # Namespace attributes ({% set ns.attr = ... %}) are not tracked
+            self.consume(value)
+
+    def lookup(self, name):
+        for scope in reversed(self.scopes):
+            if name in scope:
+                scope[name][1] = True
+                # The loop variable (None) holds no context data
+                return set(scope[name][0] or ())
+        if name in self.global_names:
+            return set()
+        return {((name,), _VALUE)}
+
+    # Symbolic values
+
+    def consume(self, value):
+        """Record that the whole of a value is read."""
+        for path, kind in value:
+            self.reads.add(path)
+
+    @staticmethod
+    def element(value):
+        """Return the symbolic value of the elements of a collection."""
+        result = set()
+        for path, kind in value:
+            if kind == _ELEMENTS:
+                result.add((path, _VALUE))
+            elif kind == _ITEMS:
+                # A (key, value) pair: only the value comes from the context
+                result.add((path + (WILDCARD,), _ELEMENTS))
+            else:
+                result.add((path + (WILDCARD,), _VALUE))
+        return result
+
+    @staticmethod
+    def collection(value):
+        """Return the symbolic value of a new sequence of the elements of a collection."""
+        result = set()
+        for path, kind in value:
+            if kind == _VALUE:
+                result.add((path + (WILDCARD,), _ELEMENTS))
+            else:
+                # Already a sequence of elements or of (key, value) pairs
+                result.add((path, kind))
+        return result
+
+    @staticmethod
+    def child(value, key):
+        """Return the symbolic value of value[key] / value.key."""
+        result = set()
+        for path, kind in value:
+            if kind == _VALUE:
+                result.add((path + (key,), _VALUE))
+            elif kind == _ELEMENTS:
+                result.add((path, _VALUE))
+            else:
+                # A (key, value) pair: only the value comes from the context
+                result.add((path + (WILDCARD,), _ELEMENTS))
+        return result
+
+    @staticmethod
+    def truth(value):
+        """Return the paths deciding the truth value of a value."""
+        # Projections keep every key of a collection whose keys are read
+        return {path + (KEYS,) for path, kind in value if kind == _VALUE}
+
+    # Expressions
+
+    def eval(self, node):
+        """Return the symbolic value of an expression, recording what it reads."""
+        method = getattr(self, f"eval_{type(node).__name__}", None)
+        if method is not None:
+            return method(node)
+        # Any other expression uses its operands as a whole
+        for child in node.iter_child_nodes():
+            self.consume(self.eval(child))
+        return set()
+
+    def eval_Name(self, node):
+        return self.lookup(node.name)
+
+    def eval_Const(self, node):
+        return set()
+
+    def eval_Getattr(self, node):
+        if isinstance(node.node, nodes.Name) and node.node.name == "loop" \
+                and node.attr in _LOOP_ITEMS and self.loop_elements and self.is_loop_variable():
+            return set(self.loop_elements[-1])
+        return self.child(self.eval(node.node), node.attr)
+
+    def is_loop_variable(self):
+        """Check whether the name loop refers to the variable of the innermost for loop."""
+        for scope in reversed(self.scopes):
+            if "loop" in scope:
+                scope["loop"][1] = True
+                return scope["loop"][0] is None
+        return False
+
+    def eval_Getitem(self, node):
+        base = self.eval(node.node)
+        if isinstance(node.arg, nodes.Slice):
+            # A slice renumbers the elements it keeps
+            self.consume(self.eval(node.arg))
+            return self.collection(base)
+        if isinstance(node.arg, nodes.Const) and isinstance(node.arg.value, (str, int)):
+            return self.child(base, node.arg.value)
+        self.consume(self.eval(node.arg))
+        return self.child(base, WILDCARD)
+
+    def eval_CondExpr(self, node):
+        self.consume(self.eval(node.test))
+        value = self.eval(node.expr1)
+        if node.expr2 is not None:
+            value |= self.eval(node.expr2)
+        return value
+
+    def eval_And(self, node):
+        left = self.eval(node.left)
+        self.reads.update(self.truth(left))
+        return left | self.eval(node.right)
+
+    eval_Or = eval_And
+
+    def eval_List(self, node):
+        result = set()
+        for item in node.items:
+            for path, kind in self.eval(item):
+                if kind == _VALUE:
+                    result.add((path, _ELEMENTS))
+                else:
+                    self.reads.add(path)
+        return result
+
+    eval_Tuple = eval_List
+
+    def consume_arguments(self, node):
+        """Record the arguments of a call, filter or test as read."""
+        for arg in node.args:
+            self.consume(self.eval(arg))
+        for keyword in node.kwargs:
+            self.consume(self.eval(keyword.value))
+        for dynamic in (node.dyn_args, node.dyn_kwargs):
+            if dynamic is not None:
+                self.consume(self.eval(dynamic))
+
+    def eval_Call(self, node):
+        if isinstance(node.node, nodes.Getattr):
+            method = node.node.attr
+            base = self.eval(node.node.node)
+            values = {(path, kind) for path, kind in base if kind == _VALUE}
+            self.consume(base - values)
+
+            if method == "items" and not node.args:
+                return {(path, _ITEMS) for path, _ in values}
+            if method == "cycle" and isinstance(node.node.node, nodes.Name) \
+                    and node.node.node.name == "loop" and self.is_loop_variable():
+                # loop.cycle() returns one of its arguments
+                result = set()
+                for arg in node.args:
+                    result |= self.eval(arg)
+                if node.kwargs or node.dyn_args or node.dyn_kwargs:
+                    self.consume(result)
+                    self.consume_arguments(node)
+                    return set()
+                return result
+            if method in ("values", "keys") and not node.args:
+                return values
+            if method == "get" and node.args:
+                key = node.args[0]
+                if isinstance(key, nodes.Const) and isinstance(key.value, (str, int)):
+                    result = self.child(values, key.value)
+                else:
+                    self.consume(self.eval(key))
+                    result = self.child(values, WILDCARD)
+                for default in node.args[1:]:
+                    result |= self.eval(default)
+                return result
+
+            # Any other method (split, startswith, ...) uses the whole value
+            self.consume(values)
+            self.consume_arguments(node)
+            return set()
+
+        self.consume(self.eval(node.node))
+        self.consume_arguments(node)
+        return set()
+
+    def attribute(self, value, attribute):
+        """Return the symbolic value of a dotted attribute (e.g. "vlan.id") of the elements of a collection."""
+        result = self.element(value)
+        for part in attribute.split("."):
+            result = self.child(result, int(part) if part.isdigit() else part)
+        return result
+
+    def eval_Filter(self, node):
+        if node.node is None:
+            self.consume_arguments(node)
+            return set()
+        base = self.eval(node.node)
+        name = node.name
+
+        # Attribute arguments: sort(attribute="x"), map(attribute="x"), selectattr("x")
+        attribute = None
+        for keyword in node.kwargs:
+            if keyword.key == "attribute" and isinstance(keyword.value, nodes.Const):
+                attribute = keyword.value.value
+        if name in ("selectattr", "rejectattr", "groupby") and node.args \
+                and isinstance(node.args[0], nodes.Const):
+            attribute = node.args[0].value
+
+        if name in _DEFAULT_FILTERS:
+            # default(value, true) replaces false values, not only undefined ones
+            self.reads.update(self.truth(base))
+            result = base
+            if node.args:
+                result = result | self.eval(node.args[0])
+                for arg in node.args[1:]:
+                    self.consume(self.eval(arg))
+            return result
+
+        # dictsort sorted by key and the items filter only read the keys up front
+        if name in ("dictsort", "items") and not node.kwargs \
+                and all(isinstance(arg, nodes.Const) and arg.value != "value" for arg in node.args):
+            for arg in node.args:
+                self.consume(self.eval(arg))
+            self.consume({(path, kind) for path, kind in base if kind != _VALUE})
+            return {(path, _ITEMS) for path, kind in base if kind == _VALUE}
+
+        if name == "attr" and node.args and isinstance(node.args[0], nodes.Const):
+            return self.child(base, node.args[0].value)
+
+        if name == "map" and isinstance(attribute, str) and not node.args:
+            for keyword in node.kwargs:
+                if keyword.key != "attribute":
+                    self.consume(self.eval(keyword.value))
+            mapped = self.attribute(base, attribute)
+            self.consume({(path, kind) for path, kind in mapped if kind != _VALUE})
+            return {(path, _ELEMENTS) for path, kind in mapped if kind == _VALUE}
+
+        if name in _COLLECTION_FILTERS or name in _ELEMENT_FILTERS:
+            if isinstance(attribute, str):
+                self.consume(self.attribute(base, attribute))
+                args = node.args[1:] if name in ("selectattr", "rejectattr") else node.args
+            else:
+                args = node.args
+            for arg in args:
+                if not isinstance(arg, nodes.Const):
+                    self.consume(self.eval(arg))
+            for keyword in node.kwargs:
+                if keyword.key != "attribute":
+                    self.consume(self.eval(keyword.value))
+            if not isinstance(attribute, str) and name in _COMPARING_FILTERS:
+                # Without a literal attribute name whole elements are compared or tested
+                self.consume(self.element(base))
+            return self.element(base) if name in _ELEMENT_FILTERS else self.collection(base)
+
+        # Any other filter (upper, tojson, length, join, ...) uses the whole value
+        self.consume(base)
+        self.consume_arguments(node)
+        return set()
+
+    def eval_Test(self, node):
+        self.consume(self.eval(node.node))
+        self.consume_arguments(node)
+        return set()
+
+    # Statements
+
+    def visit(self, node):
+        method = getattr(self, f"visit_{type(node).__name__}", None)
+        if method is not None:
+            method(node)
+            return
+        for child in node.iter_child_nodes():
+            if isinstance(child, nodes.Expr):
+                self.consume(self.eval(child))
+            else:
+                self.visit(child)
+
+    def visit_body(self, body):
+        for child in body:
+            self.visit(child)
+
+    def visit_Output(self, node):
+        for child in node.nodes:
+            if not isinstance(child, nodes.TemplateData):
+                self.consume(self.eval(child))
+
+    def visit_For(self, node):
+        iterable = self.eval(node.iter)
+        # The loop runs once per key even if the loop variables are unused
+        for path, kind in iterable:
+            if kind == _ELEMENTS and path and path[-1] == WILDCARD:
+                # A sequence of the elements of a collection is as long as the collection
+                path = path[:-1]
+            self.reads.add(path + (KEYS,))
+
+        # The loop variable is a local, but its previtem and nextitem are elements
+        self.push_scope()
+        self.scopes[-1]["loop"] = [None, True]
+        self.loop_elements.append(self.element(iterable))
+        if isinstance(node.target, nodes.Tuple) and any(kind == _ITEMS for _, kind in iterable):
+            # for key, value in mapping.items()
+            values = {(path + (WILDCARD,), _VALUE) for path, kind in iterable if kind == _ITEMS}
+            others = self.element(self.element({item for item in iterable if item[1] != _ITEMS}))
+            for position, item in enumerate(node.target.items):
+                self.bind(item, (values if position == 1 else set()) | others, evaluated=False)
+        else:
+            self.bind(node.target, self.element(iterable), evaluated=False)
+        if node.test is not None:
+            self.consume(self.eval(node.test))
+        self.visit_body(node.body)
+        self.loop_elements.pop()
+        self.pop_scope()
+        self.visit_body(node.else_)
+
+    def visit_If(self, node):
+        self.consume(self.eval(node.test))
+        self.visit_body(node.body)
+        for elif_node in node.elif_:
+            self.visit(elif_node)
+        self.visit_body(node.else_)
+
+    def visit_Assign(self, node):
+        self.bind(node.target, self.eval(node.node))
+
+    def visit_AssignBlock(self, node):
+        self.visit_body(node.body)
+        if node.filter is not None:
+            self.consume_arguments(node.filter)
+        self.bind(node.target, set())
+
+    def visit_With(self, node):
+        values = [self.eval(value) for value in node.values]
+        self.push_scope()
+        for target, value in zip(node.targets, values):
+            self.bind(target, value)
+        self.visit_body(node.body)
+        self.pop_scope()
+
+    def _visit_callable(self, node, extra_names):
+        for default in node.defaults:
+            self.consume(self.eval(default))
+        self.push_scope([arg.name for arg in node.args] + extra_names)
+        # Parameters are bound by the caller, whose arguments are recorded as read
+        for name in list(self.scopes[-1]):
+            self.scopes[-1][name][1] = True
+        self.visit_body(node.body)
+        self.pop_scope()
+
+    def visit_Macro(self, node):
+        self._visit_callable(node, ["varargs", "kwargs", "caller"])
+        self.scopes[-1][node.name] = [set(), True]
+
+    def visit_CallBlock(self, node):
+        self.consume(self.eval(node.call))
+        self._visit_callable(node, ["varargs", "kwargs"])
+
+    def visit_FilterBlock(self, node):
+        self.consume_arguments(node.filter)
+        self.visit_body(node.body)
+
+    def visit_Block(self, node):
+        self.push_scope()
+        self.visit_body(node.body)
+        self.pop_scope()
+
+    def visit_Include(self, node):
+        # An included or parent template reads names this analysis can't see
+        self.reads.add(WHOLE_CONTEXT)
+
+    visit_Extends = visit_Include
+
+    def visit_Import(self, node):
+        self.consume(self.eval(node.template))
+        if node.with_context:
+            self.reads.add(WHOLE_CONTEXT)
+        self.scopes[-1][node.target] = [set(), True]
+
+    def visit_FromImport(self, node):
+        self.consume(self.eval(node.template))
+        if node.with_context:
+            self.reads.add(WHOLE_CONTEXT)
+        for name in node.names:
+            alias = name[1] if isinstance(name, tuple) else name
+            self.scopes[-1][alias] = [set(), True]
+
+    def analyze(self, template_node):
+        self.visit(template_node)
+        self._flush_unused(self.scopes[0])
+        return reduce_paths(self.reads)
+
+def _matches(pattern, path):
+    """Check whether every element of pattern matches path at the same position."""
+    return all(a == b or a == WILDCARD for a, b in zip(pattern, path))
+
+def _covers(path, other):
+    """Check whether reading path includes everything reading other needs."""
+    if path and path[-1] is KEYS:
+        return path == other
+    if other and other[-1] is KEYS:
+        keys_of = other[:-1]
+        if len(path) <= len(keys_of):
+            return _matches(path, keys_of)
+        # Reading every child below the collection also reads its keys
+        return _matches(path, keys_of) and path[len(keys_of)] == WILDCARD
+    return len(path) <= len(other) and _matches(path, other)
+
+def reduce_paths(paths):
+    """
+    Remove paths covered by another path of the set.
+
+    Args:
+        paths (iterable): Path tuples
+
+    Returns:
+        frozenset: The paths not covered by any other path
+    """
+    paths = sorted(set(paths), key=len)
+    kept = []
+    for path in paths:
+        if not any(_covers(other, path) for other in kept):
+            kept = [other for other in kept if not _covers(path, other)]
+            kept.append(path)
+    return frozenset(kept)
+
+def analyze_template_ast(template_node, global_names=()):
+    """
+    Collect the context paths a parsed template reads.
+
+    Args:
+        template_node (jinja2.nodes.Template): Parsed template
+        global_names (iterable): Names provided by the environment (range, dict, ...)
+
+    Returns:
+        frozenset: Path tuples read by the template
+    """
+    try:
+        return _Analyzer(global_names).analyze(template_node)
+    except Exception:
+        # A template the analysis can't follow (e.g. too deeply nested) may read anything
+        return frozenset([WHOLE_CONTEXT])
+
+def format_dependency(path):
+    """
+    Format a dependency path for display, e.g. interface.*.ipv4_address.
+
+    Args:
+        path (tuple): Path tuple
+
+    Returns:
+        str: The path in Jinja2 attribute/subscript notation
+    """
+    if path == WHOLE_CONTEXT:
+        return "(entire context)"
+    text = ""
+    for key in path:
+        if key is KEYS:
+            text += ".keys()"
+        elif key == WILDCARD:
+            text += ".*"
+        elif isinstance(key, int):
+            text += f"[{key}]"
+        elif _IDENTIFIER.match(key):
+            text += f".{key}" if text else key
+        else:
+            text += f"[{key!r}]"
+    return text
+
+def format_dependencies(paths):
+    """
+    Format dependency paths for display.
+
+    Args:
+        paths (iterable): Path tuples
+
+    Returns:
+        list: Sorted path strings
+    """
+    return sorted(format_dependency(path) for path in paths)
+
+# Trie marker for a path read in full
+_FULL = object()
+
+def _build_trie(paths):
+    """Build a nested dict of path elements; _FULL and KEYS mark path ends."""
+    trie = {}
+    for path in paths:
+        node = trie
+        for key in path:
+            if key is KEYS:
+                node[KEYS] = True
+                break
+            node = node.setdefault(key, {})
+        else:
+            node[_FULL] = True
+    return trie
+
+def _project(value, tries):
+    """Project value onto the union of several trie nodes."""
+    if any(_FULL in trie for trie in tries):
+        return value
+
+    if isinstance(value, dict):
+        items = value.items()
+    elif isinstance(value, list):
+        items = enumerate(value)
+    else:
+        # Paths below a scalar (e.g. string methods) need the whole scalar
+        return value
+
+    keys_only = any(KEYS in trie for trie in tries)
+    wildcards = [trie[WILDCARD] for trie in tries if WILDCARD in trie]
+    length = len(value)
+    children = {}
+    for key, child in items:
+        child_tries = list(wildcards)
+        for trie in tries:
+            if key in trie:
+                child_tries.append(trie[key])
+            elif isinstance(key, int) and key - length in trie:
+                # Negative list index
+                child_tries.append(trie[key - length])
+        if child_tries:
+            children[key] = _project(child, child_tries)
+        elif keys_only:
+            # Only the key is read; the value is never evaluated
+            children[key] = None
+
+    if isinstance(value, list):
+        # Keep list positions stable for the indexes the template reads
+        return [children.get(index) for index in range(length)]
+    return children
+
+def project_context(data, paths):
+    """
+    Build the smallest copy of a context containing the given paths.
+
+    Subtrees that are read in full are shared with data, not copied.
+    Dictionaries keep only the keys on some path; lists keep their length,
+    with None at positions no path reads. Rendering a template against the
+    projection of its dependencies gives the same output as rendering it
+    against data.
+
+    Args:
+        data (dict): Device context or property set
+        paths (iterable): Path tuples, e.g. from analyze_template_ast
+
+    Returns:
+        dict: The projected context
+    """
+    if data is None:
+        return None
+    return _project(data, [_build_trie(paths)])
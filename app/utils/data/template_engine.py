@@ -2,48 +2,540 @@
 """
 Template rendering functionality using Jinja2.
 """
+import hashlib
+import itertools
+import os
+import re
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Mapping
+
 import jinja2
-from .data_helpers import deep_merge
+from jinja2 import nodes
+from jinja2.sandbox import SandboxedEnvironment
+from .data_helpers import deep_merge, LayeredContext
+from .bytecode_cache import ConfigletBytecodeCache, DEFAULT_MAX_BYTES
+from .template_dependencies import analyze_template_ast, project_context
+from ..diagnostics.spans import timed
+
+# Maximum number of compiled templates kept in memory
+TEMPLATE_CACHE_SIZE = 128
+
+# Render against only the context paths a template reads (see slice_render_context)
+DEFAULT_SLICE_CONTEXT = os.environ.get("CONFIGLET_SLICE_CONTEXT", "").lower() in ("1", "true", "yes")
+
+# Wall-clock budget of one render in seconds (0 disables the limit)
+DEFAULT_RENDER_TIMEOUT = float(os.environ.get("CONFIGLET_RENDER_TIMEOUT", "10"))
+
+# Maximum size of the rendered output in characters (0 disables the limit)
+DEFAULT_MAX_OUTPUT = int(os.environ.get("CONFIGLET_RENDER_MAX_OUTPUT", str(16 * 1024 * 1024)))
+
+# Largest integer power a template may compute, in bits
+MAX_POWER_BITS = 1024 * 1024
+
+# Width or precision of a printf-style conversion, e.g. "%-10.3s" or "%*d"
+_FORMAT_SPEC = re.compile(r"%(\([^)]*\))?[#0 +-]*(\*|\d+)?(?:\.(\*|\d+))?[hlL]?([a-zA-Z%])")
+
+# Attribute and item lookups, or output chunks, between two deadline checks (a power of two)
+DEADLINE_CHECK_INTERVAL = 256
+
+# Filter wrapped around the iterable of every for loop to check the deadline between iterations
+LOOP_BUDGET_FILTER = "_budgeted_loop"
+
+class RenderBudgetExceeded(Exception):
+    """Raised inside a render that ran out of time or output size."""
+
+# Budget of the render running in the current thread. Sessions render in
+# their own threads, so one runaway template never stops another render.
+_render_budget = threading.local()
+
+# Counts lookups so the clock is read only every DEADLINE_CHECK_INTERVAL of them
+_lookup_ticks = itertools.count()
+
+def _check_deadline():
+    """Stop the render of the current thread once its deadline has passed."""
+    deadline = getattr(_render_budget, "deadline", None)
+    if deadline is not None and time.monotonic() > deadline:
+        raise RenderBudgetExceeded(
+            f"rendering took longer than {_render_budget.timeout:g} seconds and was stopped"
+        )
+
+def _budgeted_loop(iterable):
+    """Yield the items of a for loop, checking the deadline every DEADLINE_CHECK_INTERVAL of them."""
+    for item in iterable:
+        if not next(_lookup_ticks) & (DEADLINE_CHECK_INTERVAL - 1):
+            _check_deadline()
+        yield item
+
+def _format_size(format_string, values):
+    """Estimate the size of format_string % values from its widths and precisions."""
+    args = values if isinstance(values, tuple) else (values,)
+    position = 0
+    size = len(format_string)
+    for mapping_key, width, precision, conversion in _FORMAT_SPEC.findall(format_string):
+        for number in (width, precision):
+            if number == "*":
+                value = args[position] if position < len(args) else 0
+                position += 1
+                size += abs(value) if isinstance(value, int) else 0
+            elif number:
+                size += int(number)
+        if conversion != "%" and not mapping_key:
+            position += 1
+    return size
+
+def _check_output_size(size):
+    """Stop the render of the current thread once its output grows too large."""
+    max_output = getattr(_render_budget, "max_output", None)
+    if max_output and size > max_output:
+        raise RenderBudgetExceeded(
+            f"rendered output exceeded {max_output} characters and was stopped"
+        )
+
+class ConfigletEnvironment(SandboxedEnvironment):
+    """
+    Sandboxed environment enforcing the render budget of the current thread.
+
+    Templates can't reach unsafe attributes (anything starting with an
+    underscore, function internals) and range() is limited to 100000 items.
+    Attribute and item lookups, calls and the *, **, + and % operators of
+    sandboxed templates go through the environment, and the iterables of for
+    loops are wrapped in a filter when the template is compiled, so the
+    deadline is also checked in loops and recursive macros that produce no
+    output, and
+    repeating, joining or formatting a string too large for the output, or
+    raising to a huge power, is refused before it allocates.
+    """
+
+    intercepted_binops = frozenset(["*", "**", "+", "%"])
+
+    # Part of the bytecode cache key: loops compile differently with the check
+    budgeted_loops = True
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.filters[LOOP_BUDGET_FILTER] = _budgeted_loop
+
+    def _generate(self, source, name, filename, defer_init=False):
+        if isinstance(source, nodes.Template):
+            for node in source.find_all(nodes.For):
+                if not (isinstance(node.iter, nodes.Filter) and node.iter.name == LOOP_BUDGET_FILTER):
+                    node.iter = nodes.Filter(
+                        node.iter, LOOP_BUDGET_FILTER, [], [], None, None, lineno=node.lineno
+                    )
+        return super()._generate(source, name, filename, defer_init)
+
+    def getattr(self, obj, attribute):
+        if not next(_lookup_ticks) & (DEADLINE_CHECK_INTERVAL - 1):
+            _check_deadline()
+        return super().getattr(obj, attribute)
+
+    def getitem(self, obj, argument):
+        if not next(_lookup_ticks) & (DEADLINE_CHECK_INTERVAL - 1):
+            _check_deadline()
+        return super().getitem(obj, argument)
+
+    def call(__self, __context, __obj, *args, **kwargs):
+        _check_deadline()
+        return super().call(__context, __obj, *args, **kwargs)
+
+    def call_binop(self, context, operator, left, right):
+        _check_deadline()
+        if operator == "*":
+            # Repeating a sequence: check the size of the result before building it
+            for sequence, count in ((left, right), (right, left)):
+                if isinstance(sequence, (str, list, tuple)) and isinstance(count, int):
+                    _check_output_size(len(sequence) * count)
+        elif operator == "+":
+            if isinstance(left, (str, list, tuple)) and isinstance(right, (str, list, tuple)):
+                _check_output_size(len(left) + len(right))
+        elif operator == "%":
+            # printf-style formatting: a width like %0999999999d pads the result
+            if isinstance(left, str):
+                _check_output_size(_format_size(left, right))
+        elif isinstance(left, int) and isinstance(right, int) and right > 0:
+            if left.bit_length() * right > MAX_POWER_BITS:
+                raise jinja2.exceptions.SecurityError("the result of ** is too large to compute")
+        return super().call_binop(context, operator, left, right)
+
+# One Environment is shared by every render in the process. Creating it is
+# cheap, but a Template is bound to the Environment that compiled it, so a
+# shared Environment is what makes the compiled-template cache possible.
+_environment = ConfigletEnvironment(
+    loader=jinja2.BaseLoader(),
+    undefined=jinja2.StrictUndefined  # Raise error for undefined variables
+)
+
+def _json_default(value):
+    """Serialize merged context views with the tojson filter."""
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+_environment.policies["json.dumps_kwargs"] = {"sort_keys": True, "default": _json_default}
+
+# LRU cache of compiled templates keyed by a hash of the template source.
+# Streamlit serves each session from its own thread, so access is locked.
+_template_cache = OrderedDict()
+_template_cache_lock = threading.Lock()
+_template_cache_stats = {"hits": 0, "misses": 0}
+
+# Context paths read by each template, keyed like _template_cache. Filled from
+# the AST parsed for compilation, so the source is parsed only once.
+_dependency_cache = OrderedDict()
+
+# Optional on-disk bytecode cache that survives process restarts. Enabled by
+# setting CONFIGLET_BYTECODE_CACHE_DIR or by calling configure_bytecode_cache().
+_bytecode_cache = None
+
+def get_environment():
+    """
+    Get the process-wide Jinja2 environment used for rendering.
+
+    Returns:
+        jinja2.Environment: The shared environment with strict undefined handling
+    """
+    return _environment
+
+def configure_bytecode_cache(directory, max_bytes=DEFAULT_MAX_BYTES):
+    """
+    Enable or disable the persistent on-disk bytecode cache.
+
+    Args:
+        directory (str): Cache directory, or None to disable the cache
+        max_bytes (int): Maximum total size of the cache directory in bytes
+
+    Returns:
+        ConfigletBytecodeCache: The active cache, or None if disabled
+    """
+    global _bytecode_cache
+    _bytecode_cache = ConfigletBytecodeCache(directory, max_bytes) if directory else None
+    return _bytecode_cache
+
+def get_bytecode_cache_stats():
+    """
+    Get statistics for the on-disk bytecode cache.
+
+    Returns:
+        dict: Cache statistics, or {"enabled": False} if the cache is disabled
+    """
+    if _bytecode_cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **_bytecode_cache.stats()}
+
+def template_source_hash(template_string):
+    """
+    Compute the cache key for a template source.
+
+    Args:
+        template_string (str): Jinja2 template
+
+    Returns:
+        str: Hex digest of the template source
+    """
+    return hashlib.sha256(template_string.encode("utf-8")).hexdigest()
+
+def get_compiled_template(template_string):
+    """
+    Get a compiled template for the given source, compiling it only on a cache miss.
+
+    Args:
+        template_string (str): Jinja2 template
+
+    Returns:
+        jinja2.Template: The compiled template
+
+    Raises:
+        jinja2.exceptions.TemplateSyntaxError: If the template cannot be parsed
+    """
+    key = template_source_hash(template_string)
+
+    with _template_cache_lock:
+        template = _template_cache.get(key)
+        if template is not None:
+            _template_cache.move_to_end(key)
+            _template_cache_stats["hits"] += 1
+            return template
+        _template_cache_stats["misses"] += 1
+
+    # Compile outside the lock so a large template doesn't block other sessions
+    template = _compile_template(template_string, key)
 
-def render_template(template_string, device_context, property_set=None):
+    with _template_cache_lock:
+        _template_cache[key] = template
+        _template_cache.move_to_end(key)
+        while len(_template_cache) > TEMPLATE_CACHE_SIZE:
+            _template_cache.popitem(last=False)
+
+    return template
+
+@timed("template.compile")
+def _compile_template(template_string, key):
+    """
+    Compile a template, loading its bytecode from disk when available.
+
+    Args:
+        template_string (str): Jinja2 template
+        key (str): Hash of the template source
+
+    Returns:
+        jinja2.Template: The compiled template
+    """
+    bytecode_cache = _bytecode_cache
+    bucket = None
+    code = None
+    if bytecode_cache is not None:
+        bucket = bytecode_cache.get_bucket(_environment, key, None, template_string)
+        code = bucket.code
+
+    if code is None:
+        # Parse once for both the dependency analysis and the code generator
+        template_ast = _environment.parse(template_string)
+        try:
+            _store_dependencies(key, template_ast)
+        except Exception:
+            # Rendering must never fail because of the analysis; it is retried on demand
+            pass
+        code = _environment.compile(template_ast)
+
+    if bucket is not None and bucket.code is None:
+        bucket.code = code
+        try:
+            bytecode_cache.set_bucket(bucket)
+        except OSError:
+            # A read-only or full disk must never break rendering
+            pass
+
+    return _environment.template_class.from_code(
+        _environment, code, _environment.make_globals(None), None
+    )
+
+def _store_dependencies(key, template_ast):
+    """Analyze a parsed template and cache its dependencies under key."""
+    dependencies = analyze_template_ast(template_ast, _environment.globals)
+    with _template_cache_lock:
+        _dependency_cache[key] = dependencies
+        _dependency_cache.move_to_end(key)
+        while len(_dependency_cache) > TEMPLATE_CACHE_SIZE:
+            _dependency_cache.popitem(last=False)
+    return dependencies
+
+def get_template_dependencies(template_string):
+    """
+    Get the context paths a template reads.
+
+    See template_dependencies for the path format. The result is cached per
+    template hash and computed from the same parse as the compiled template.
+
+    Args:
+        template_string (str): Jinja2 template
+
+    Returns:
+        frozenset: Path tuples such as ("interface", "*", "ipv4_address")
+
+    Raises:
+        jinja2.exceptions.TemplateSyntaxError: If the template cannot be parsed
+    """
+    key = template_source_hash(template_string)
+    with _template_cache_lock:
+        dependencies = _dependency_cache.get(key)
+        if dependencies is not None:
+            _dependency_cache.move_to_end(key)
+            return dependencies
+
+    # Compiling records the dependencies unless the bytecode came from disk
+    get_compiled_template(template_string)
+    with _template_cache_lock:
+        dependencies = _dependency_cache.get(key)
+    if dependencies is None:
+        dependencies = _store_dependencies(key, _environment.parse(template_string))
+    return dependencies
+
+def get_template_cache_stats():
+    """
+    Get statistics for the compiled-template cache.
+
+    Returns:
+        dict: Cache size, maximum size, hit and miss counters
+    """
+    with _template_cache_lock:
+        return {
+            "size": len(_template_cache),
+            "max_size": TEMPLATE_CACHE_SIZE,
+            "hits": _template_cache_stats["hits"],
+            "misses": _template_cache_stats["misses"],
+        }
+
+def clear_template_cache():
+    """
+    Remove all compiled templates from the cache and reset its counters.
+
+    Returns:
+        None
+    """
+    with _template_cache_lock:
+        _template_cache.clear()
+        _dependency_cache.clear()
+        _template_cache_stats["hits"] = 0
+        _template_cache_stats["misses"] = 0
+
+def slice_render_context(template_string, device_context, property_set=None):
+    """
+    Project the device context and property set onto the paths a template reads.
+
+    Args:
+        template_string (str): Jinja2 template
+        device_context (dict): Base template rendering context (device context)
+        property_set (dict, optional): Additional properties layered over the context
+
+    Returns:
+        tuple: (device_context, property_set) containing only the template's dependencies
+
+    Raises:
+        jinja2.exceptions.TemplateSyntaxError: If the template cannot be parsed
+    """
+    dependencies = get_template_dependencies(template_string)
+    return project_context(device_context, dependencies), project_context(property_set, dependencies)
+
+def new_render_context(template, device_context, property_set=None):
+    """
+    Create the Jinja2 render context for a template.
+
+    The template reads from a LayeredContext over the property set, the device
+    context and the template globals instead of a merged copy. This matches
+    deep_merge(device_context, property_set) but nested dictionaries are only
+    merged when the template reads them.
+
+    Args:
+        template (jinja2.Template): Compiled template
+        device_context (dict): Base template rendering context (device context)
+        property_set (dict, optional): Additional properties layered over the context
+
+    Returns:
+        jinja2.runtime.Context: Context for template.root_render_func
+    """
+    layers = [device_context, template.globals]
+    if property_set is not None:
+        layers.insert(0, property_set)
+    return template.new_context(LayeredContext(*layers), shared=True)
+
+def render_with_budget(template, context, timeout=None, max_output=None, on_chunk=None):
+    """
+    Render a compiled template, stopping it once it exceeds its budget.
+
+    The output is collected in batches of chunks so its size can be checked
+    while rendering, and the deadline is checked between batches and by the
+    sandboxed environment during the render. Each batch is also passed to
+    on_chunk as soon as it is rendered, so callers can show the beginning of
+    a large output before the render has finished.
+
+    Args:
+        template (jinja2.Template): Template compiled by the shared environment
+        context (jinja2.runtime.Context): Render context from new_render_context
+        timeout (float, optional): Wall-clock budget in seconds (defaults to DEFAULT_RENDER_TIMEOUT, 0 disables it)
+        max_output (int, optional): Maximum output size in characters (defaults to DEFAULT_MAX_OUTPUT, 0 disables it)
+        on_chunk (callable, optional): Called with each batch (a list of strings) as it is rendered
+
+    Returns:
+        str: The rendered output
+
+    Raises:
+        RenderBudgetExceeded: If the render ran out of time or output size
+    """
+    timeout = DEFAULT_RENDER_TIMEOUT if timeout is None else timeout
+    max_output = DEFAULT_MAX_OUTPUT if max_output is None else max_output
+    _render_budget.timeout = timeout
+    _render_budget.deadline = time.monotonic() + timeout if timeout else None
+    _render_budget.max_output = max_output
+
+    chunks = []
+    size = 0
+    stream = template.root_render_func(context)
+    try:
+        # Check the budget every DEADLINE_CHECK_INTERVAL chunks
+        while True:
+            batch = list(itertools.islice(stream, DEADLINE_CHECK_INTERVAL))
+            if not batch:
+                break
+            chunks.extend(batch)
+            if on_chunk is not None:
+                on_chunk(batch)
+            size += sum(map(len, batch))
+            _check_output_size(size)
+            _check_deadline()
+        return _environment.concat(chunks)
+    except Exception:
+        _environment.handle_exception()
+    finally:
+        # Close the generator so a stopped render releases its frames right away
+        stream.close()
+        _render_budget.deadline = None
+        _render_budget.max_output = None
+
+@timed("template.render")
+def render_template(template_string, device_context, property_set=None, slice_context=None,
+                    timeout=None, max_output=None, profiler=None, on_chunk=None):
     """
     Render a Jinja2 template with the given context and optional property set.
-    
+
     Args:
         template_string (str): Jinja2 template
         context (dict): Base template rendering context (device context)
         property_set (dict, optional): Additional properties to merge into context
-        
+        slice_context (bool, optional): Render against only the paths the template reads
+            (defaults to DEFAULT_SLICE_CONTEXT)
+        timeout (float, optional): Wall-clock budget in seconds (defaults to DEFAULT_RENDER_TIMEOUT)
+        max_output (int, optional): Maximum output size in characters (defaults to DEFAULT_MAX_OUTPUT)
+        profiler (TemplateProfiler, optional): Profile the render; an instrumented copy
+            of the template is compiled and traced, see template_profiler
+        on_chunk (callable, optional): Called with each batch of output chunks while
+            rendering, see render_with_budget
+
     Returns:
         tuple: (rendered_output, error) where rendered_output is the rendered template
                or None if error occurred, and error is an error message or None if successful
     """
     try:
-        # Create a merged context if property_set is provided
-        final_context = device_context
-        if property_set is not None:
-            try:
-                final_context = deep_merge(device_context.copy(), property_set)
-            except Exception as e:
-                return None, f"Error merging property set: {e}"
-        
-        # Create Jinja2 environment with strict undefined handling
-        env = jinja2.Environment(
-            loader=jinja2.BaseLoader(),
-            undefined=jinja2.StrictUndefined  # Raise error for undefined variables
-        )
-        
-        # Create template from string
-        template = env.from_string(template_string)
-        
+        # Layer the property set over the device context without copying either
+        if property_set is not None and not isinstance(property_set, Mapping):
+            return None, f"Error merging property set: expected a dictionary, got {type(property_set).__name__}"
+
+        # Get the compiled template from the cache (compiles on first use)
+        if profiler is None:
+            template = get_compiled_template(template_string)
+        else:
+            template = profiler.compile(_environment)
+
+        if slice_context is None:
+            slice_context = DEFAULT_SLICE_CONTEXT
+        if slice_context:
+            device_context, property_set = slice_render_context(template_string, device_context, property_set)
+
         # Render template with context
-        rendered_output = template.render(**final_context)
-        
+        context = new_render_context(template, device_context, property_set)
+        if profiler is None:
+            rendered_output = render_with_budget(template, context, timeout, max_output, on_chunk)
+        else:
+            with profiler:
+                rendered_output = render_with_budget(template, context, timeout, max_output, on_chunk)
+
         return rendered_output, None
-        
+
     except jinja2.exceptions.TemplateSyntaxError as e:
         return None, f"Template Syntax Error: {e.message} (Line: {e.lineno})"
+    except RenderBudgetExceeded as e:
+        return None, f"Render Budget Exceeded: {e}"
+    except jinja2.exceptions.SecurityError as e:
+        return None, f"Template Security Error: {e}"
     except jinja2.exceptions.UndefinedError as e:
         return None, f"Template Rendering Error: Undefined variable - {e.message} - Check this variable exists in the devcie context or property set"
     except Exception as e:
-        return None, f"An unexpected error occurred during rendering: {e}"
\ No newline at end of file
+        return None, f"An unexpected error occurred during rendering: {e}"
+
+# Enable the bytecode cache from the environment when configured
+if os.environ.get("CONFIGLET_BYTECODE_CACHE_DIR"):
+    configure_bytecode_cache(
+        os.environ["CONFIGLET_BYTECODE_CACHE_DIR"],
+        int(os.environ.get("CONFIGLET_BYTECODE_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES))
+    )
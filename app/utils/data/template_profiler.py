@@ -0,0 +1,273 @@
+# app/utils/data/template_profiler.py
+"""
+Per-line profiling of template renders.
+
+A TemplateProfiler compiles its own instrumented copy of a template, in
+which every for loop counts its iterations, and traces the frames of the
+compiled template while it renders. Time is mapped from the generated
+Python code back to the template source lines, and summed per loop, macro
+and other block. Profiling is opt-in: renders without a profiler use the
+regular compiled template and are never traced.
+"""
+import bisect
+import sys
+import threading
+import time
+
+from jinja2 import nodes
+
+# Name of the filter wrapped around the iterable of every profiled for loop.
+# It is not a valid identifier, so templates can't call it themselves.
+PROFILE_LOOP_FILTER = "profile loop"
+
+# Filename Jinja2 gives the code of templates compiled from a string
+_TEMPLATE_FILENAME = "<template>"
+
+# Statements reported as blocks, with the label used for them
+_BLOCK_NODES = {
+    nodes.For: "for",
+    nodes.If: "if",
+    nodes.Macro: "macro",
+    nodes.CallBlock: "call",
+    nodes.FilterBlock: "filter",
+    nodes.Block: "block",
+    nodes.With: "with",
+}
+
+# Iteration counters of the profiled render running in the current thread
+_active = threading.local()
+
+class _CountedIterable:
+    """Wraps a loop iterable and counts the items taken from it."""
+
+    def __init__(self, iterable, counts, loop_id):
+        self._iterable = iterable
+        self._counts = counts
+        self._loop_id = loop_id
+
+    def __len__(self):
+        return len(self._iterable)
+
+    def __iter__(self):
+        counts = self._counts
+        loop_id = self._loop_id
+        for item in self._iterable:
+            counts[loop_id] += 1
+            yield item
+
+def count_loop_iterations(iterable, loop_id):
+    """
+    Filter wrapped around the iterable of every for loop of a profiled template.
+
+    Args:
+        iterable: The loop iterable
+        loop_id (int): Index of the loop in the template
+
+    Returns:
+        The iterable, counting its items when a profiled render is running
+    """
+    counts = getattr(_active, "loop_counts", None)
+    if counts is None:
+        return iterable
+    return _CountedIterable(iterable, counts, loop_id)
+
+def _end_lineno(node):
+    """Return the last source line of a node and its children."""
+    return max((child.lineno for child in node.find_all(nodes.Node) if child.lineno), default=node.lineno)
+
+class TemplateProfiler:
+    """
+    Collects the time spent on each template line and the iterations of each loop.
+
+    Usage:
+        profiler = TemplateProfiler(template_string)
+        template = profiler.compile(environment)
+        with profiler:
+            ... render template ...
+        report = profiler.report()
+    """
+
+    def __init__(self, template_string):
+        """
+        Args:
+            template_string (str): Jinja2 template to profile
+        """
+        self.template_string = template_string
+        self.line_times = {}
+        self.total_time = 0.0
+        self._loops = []
+        self._blocks = []
+        self._loop_counts = []
+        self._code_lines = []
+        self._template_lines = []
+
+    def compile(self, environment):
+        """
+        Compile an instrumented copy of the template.
+
+        The copy is not cached, so the regular compiled template stays free
+        of instrumentation.
+
+        Args:
+            environment (jinja2.Environment): Environment to compile with; the
+                loop counting filter is registered on it if missing
+
+        Returns:
+            jinja2.Template: The instrumented template
+
+        Raises:
+            jinja2.exceptions.TemplateSyntaxError: If the template cannot be parsed
+        """
+        environment.filters.setdefault(PROFILE_LOOP_FILTER, count_loop_iterations)
+        template_ast = environment.parse(self.template_string)
+
+        for node in template_ast.find_all(tuple(_BLOCK_NODES)):
+            label = _BLOCK_NODES[type(node)]
+            if isinstance(node, (nodes.Macro, nodes.Block)):
+                label = f"{label} {node.name}"
+            self._blocks.append((label, node.lineno, _end_lineno(node)))
+
+        for loop_id, node in enumerate(template_ast.find_all(nodes.For)):
+            self._loops.append(node.lineno)
+            node.iter = nodes.Filter(
+                node.iter, PROFILE_LOOP_FILTER, [nodes.Const(loop_id)], [], None, None, lineno=node.lineno
+            )
+        self._loop_counts = [0] * len(self._loops)
+
+        code = environment.compile(template_ast)
+        template = environment.template_class.from_code(environment, code, environment.make_globals(None), None)
+
+        # Generated code line -> template line, as in Template.get_corresponding_lineno
+        for template_line, code_line in template.debug_info:
+            self._code_lines.append(code_line)
+            self._template_lines.append(template_line)
+        return template
+
+    def _template_line(self, code_line):
+        """Map a line of the generated code to its template line."""
+        index = bisect.bisect_right(self._code_lines, code_line) - 1
+        return self._template_lines[index] if index >= 0 else 1
+
+    def __enter__(self):
+        self._previous_trace = sys.gettrace()
+        self._stack = []
+        self._line = None
+        self._last = time.perf_counter()
+        self._start = self._last
+        _active.loop_counts = self._loop_counts
+        sys.settrace(self._trace_call)
+        return self
+
+    def __exit__(self, *exc_info):
+        sys.settrace(self._previous_trace)
+        _active.loop_counts = None
+        self.total_time += time.perf_counter() - self._start
+        return False
+
+    def _advance(self, line):
+        """Charge the time since the last event to the current line and move to line."""
+        now = time.perf_counter()
+        if self._line is not None:
+            self.line_times[self._line] = self.line_times.get(self._line, 0.0) + now - self._last
+        self._last = now
+        self._line = line
+
+    def _trace_call(self, frame, event, arg):
+        """Global trace function: traces only the frames of the template code."""
+        if frame.f_code.co_filename != _TEMPLATE_FILENAME:
+            # Time spent in filters and runtime helpers is charged to the calling line
+            return None
+        # A template function is called or a template generator is resumed
+        self._stack.append(self._line)
+        self._advance(self._template_line(frame.f_lineno))
+        return self._trace_line
+
+    def _trace_line(self, frame, event, arg):
+        """Local trace function of template frames."""
+        if event == "line":
+            self._advance(self._template_line(frame.f_lineno))
+        elif event == "return":
+            # Returning or yielding: time continues on the caller's line, if any
+            self._advance(self._stack.pop() if self._stack else None)
+        return self._trace_line
+
+    def report(self):
+        """
+        Build the profiling report.
+
+        Returns:
+            dict: JSON-serializable report with keys:
+                - total_time: wall time of the profiled render in seconds
+                - lines: per template line {"line", "source", "time"}, in line order
+                - blocks: per loop, macro, if and other block {"kind", "line", "end_line",
+                  "source", "time", "iterations"} sorted by time; time is the sum of the
+                  lines in the block and iterations is None for blocks other than loops
+        """
+        source_lines = self.template_string.splitlines()
+
+        def source(line):
+            return source_lines[line - 1].strip() if 0 < line <= len(source_lines) else ""
+
+        lines = [
+            {
+                "line": line,
+                "source": source(line),
+                "time": self.line_times[line],
+            }
+            for line in sorted(self.line_times)
+        ]
+
+        iterations = {}
+        for loop_id, line in enumerate(self._loops):
+            iterations[line] = iterations.get(line, 0) + self._loop_counts[loop_id]
+
+        blocks = []
+        for kind, start, end in self._blocks:
+            blocks.append({
+                "kind": kind,
+                "line": start,
+                "end_line": end,
+                "source": source(start),
+                "time": sum(time for line, time in self.line_times.items() if start <= line <= end),
+                "iterations": iterations.get(start) if kind == "for" else None,
+            })
+        blocks.sort(key=lambda block: -block["time"])
+
+        return {"total_time": self.total_time, "lines": lines, "blocks": blocks}
+
+def merge_profile_reports(reports):
+    """
+    Combine the reports of many renders of the same template.
+
+    Args:
+        reports (iterable): Reports returned by TemplateProfiler.report(); None entries are skipped
+
+    Returns:
+        dict: Report in the same format with times and iterations summed,
+              plus "renders", the number of reports merged
+    """
+    total_time = 0.0
+    lines = {}
+    blocks = {}
+    renders = 0
+    for report in reports:
+        if not report:
+            continue
+        renders += 1
+        total_time += report["total_time"]
+        for entry in report["lines"]:
+            merged = lines.setdefault(entry["line"], dict(entry, time=0.0))
+            merged["time"] += entry["time"]
+        for entry in report["blocks"]:
+            key = (entry["kind"], entry["line"])
+            merged = blocks.setdefault(key, dict(entry, time=0.0, iterations=None))
+            merged["time"] += entry["time"]
+            if entry["iterations"] is not None:
+                merged["iterations"] = (merged["iterations"] or 0) + entry["iterations"]
+
+    return {
+        "renders": renders,
+        "total_time": total_time,
+        "lines": [lines[line] for line in sorted(lines)],
+        "blocks": sorted(blocks.values(), key=lambda block: -block["time"]),
+    }
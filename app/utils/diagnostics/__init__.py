@@ -0,0 +1,41 @@
+# app/utils/diagnostics/__init__.py
+"""
+Diagnostics utilities package for Apstra Configlet Builder.
+"""
+from .spans import (
+    span,
+    timed,
+    start_collecting,
+    stop_collecting,
+    configure_span_log,
+    add_span_listener,
+    remove_span_listener,
+    summarize_spans,
+    spans_to_jsonl
+)
+from .metrics import (
+    enable_metrics,
+    disable_metrics,
+    export_metrics,
+    write_metrics_file,
+    start_metrics_server,
+    start_metrics_exporters
+)
+
+__all__ = [
+    'span',
+    'timed',
+    'start_collecting',
+    'stop_collecting',
+    'configure_span_log',
+    'add_span_listener',
+    'remove_span_listener',
+    'summarize_spans',
+    'spans_to_jsonl',
+    'enable_metrics',
+    'disable_metrics',
+    'export_metrics',
+    'write_metrics_file',
+    'start_metrics_server',
+    'start_metrics_exporters'
+]
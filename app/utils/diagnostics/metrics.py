@@ -0,0 +1,457 @@
+# app/utils/diagnostics/metrics.py
+"""
+Prometheus metrics for a shared deployment.
+
+Latency histograms are fed from the diagnostics spans: template renders
+and compiles, and Apstra requests by endpoint. Script runs are timed per
+scope, sessions report their activity and a snapshot of their session
+state at the end of every run, and cache counters are read from the
+caches' own statistics when the metrics are exported.
+
+Metrics are exposed in the Prometheus text format on a side HTTP endpoint
+(CONFIGLET_METRICS_PORT) and/or written to a file every few seconds
+(CONFIGLET_METRICS_FILE), for example for node_exporter's textfile
+collector. Nothing is recorded until an exporter is started.
+"""
+import collections
+import os
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from .spans import add_span_listener, remove_span_listener
+
+# Serve the metrics on this port at /metrics (unset or 0: no endpoint)
+DEFAULT_METRICS_PORT = int(os.environ.get("CONFIGLET_METRICS_PORT") or 0)
+# Listen on the loopback interface only, unless the operator opens it to the network
+DEFAULT_METRICS_HOST = os.environ.get("CONFIGLET_METRICS_HOST", "127.0.0.1")
+
+# Write the metrics to this file every DEFAULT_METRICS_INTERVAL seconds
+DEFAULT_METRICS_FILE = os.environ.get("CONFIGLET_METRICS_FILE") or None
+DEFAULT_METRICS_INTERVAL = float(os.environ.get("CONFIGLET_METRICS_INTERVAL", 15))
+
+# Sessions with a run within this many seconds count as active
+SESSION_TTL = float(os.environ.get("CONFIGLET_METRICS_SESSION_TTL", 300))
+
+# Latency buckets in seconds, the Prometheus client defaults
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Session state values that keep their identity are measured again after this many seconds
+SIZE_REFRESH_SECONDS = 300
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+class Counter:
+    """Monotonic counter with optional labels."""
+
+    def __init__(self, name, documentation, labelnames=()):
+        """
+        Args:
+            name (str): Metric name, ending in _total
+            documentation (str): HELP text
+            labelnames (tuple): Names of the labels
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        """Add amount to the counter of the given label values."""
+        key = tuple(str(labels.get(label, "")) for label in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def expose(self):
+        """Return the metric in the text exposition format."""
+        with self._lock:
+            values = sorted(self._values.items())
+        samples = [("", dict(zip(self.labelnames, key)), value) for key, value in values]
+        return _format_family(self.name, "counter", self.documentation, samples)
+
+class Histogram:
+    """Histogram of observed values with optional labels."""
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        """
+        Args:
+            name (str): Metric name
+            documentation (str): HELP text
+            labelnames (tuple): Names of the labels
+            buckets (tuple): Upper bounds of the buckets, ascending
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = labelnames
+        self.buckets = tuple(buckets)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        """Record one observation for the given label values."""
+        key = tuple(str(labels.get(label, "")) for label in self.labelnames)
+        with self._lock:
+            counts = self._values.get(key)
+            if counts is None:
+                # One count per bucket plus +Inf, then the sum
+                counts = self._values[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+                    break
+            else:
+                counts[len(self.buckets)] += 1
+            counts[-1] += value
+
+    def expose(self):
+        """Return the metric in the text exposition format, with cumulative buckets."""
+        with self._lock:
+            values = sorted((key, list(counts)) for key, counts in self._values.items())
+        samples = []
+        for key, counts in values:
+            labels = dict(zip(self.labelnames, key))
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                samples.append(("_bucket", {**labels, "le": _format_value(bound)}, cumulative))
+            samples.append(("_sum", labels, counts[-1]))
+            samples.append(("_count", labels, cumulative))
+        return _format_family(self.name, "histogram", self.documentation, samples)
+
+RENDER_SECONDS = Histogram("configlet_render_duration_seconds", "Time spent rendering a template.")
+RENDER_ERRORS = Counter("configlet_render_errors_total", "Template renders that returned an error.")
+COMPILE_SECONDS = Histogram("configlet_template_compile_duration_seconds",
+                            "Time spent compiling a template on a template cache miss.")
+API_SECONDS = Histogram("configlet_apstra_request_duration_seconds",
+                        "Time spent on Apstra API calls, by client function.", ("endpoint",))
+API_ERRORS = Counter("configlet_apstra_request_errors_total",
+                     "Apstra API calls that returned an error, by client function.", ("endpoint",))
+RUN_SECONDS = Histogram("configlet_script_run_duration_seconds",
+                        "Time spent on Streamlit script runs, by scope (app or the rerun section).", ("scope",))
+
+_metrics = [RENDER_SECONDS, RENDER_ERRORS, COMPILE_SECONDS, API_SECONDS, API_ERRORS, RUN_SECONDS]
+
+_enabled = False
+_exporters_started = False
+_state_lock = threading.Lock()
+
+# Session ID to {"seen": last run time, "values": state snapshot, "sizes": key -> (value, bytes, measured at)}
+_sessions = {}
+_sessions_lock = threading.Lock()
+# Exports measure session sizes one at a time
+_export_lock = threading.Lock()
+
+def enable_metrics():
+    """
+    Start recording metrics in this process.
+
+    Returns:
+        None
+    """
+    global _enabled
+    with _state_lock:
+        if not _enabled:
+            add_span_listener(_observe_span)
+            _enabled = True
+
+def disable_metrics():
+    """
+    Stop recording metrics; values recorded so far are kept.
+
+    Returns:
+        None
+    """
+    global _enabled
+    with _state_lock:
+        if _enabled:
+            remove_span_listener(_observe_span)
+            _enabled = False
+
+def metrics_enabled():
+    """Check whether metrics are recorded in this process."""
+    return _enabled
+
+def observe_run(scope, seconds):
+    """
+    Record the duration of a script run.
+
+    Args:
+        scope (str): "app" for full runs, or the name of the rerun section
+        seconds (float): Execution time of the run
+
+    Returns:
+        None
+    """
+    RUN_SECONDS.observe(seconds, scope=scope)
+
+def record_session(session_id, values):
+    """
+    Record that a session ran, with a snapshot of its session state.
+
+    Only references are kept; the values are measured when metrics are exported.
+
+    Args:
+        session_id (str): ID of the Streamlit session
+        values (dict): Session state keys to values
+
+    Returns:
+        None
+    """
+    with _sessions_lock:
+        entry = _sessions.setdefault(session_id, {"sizes": {}})
+        entry["seen"] = time.time()
+        entry["values"] = values
+
+def estimate_size(value, skip=frozenset()):
+    """
+    Estimate the memory held by a value and everything it references.
+
+    Containers and the attributes of the app's own objects are followed;
+    other objects count with their shallow size.
+
+    Args:
+        value: Object to measure
+        skip (set): IDs of objects not followed (counted elsewhere)
+
+    Returns:
+        int: Estimated size in bytes
+    """
+    seen = set()
+    stack = [value]
+    total = 0
+    while stack:
+        obj = stack.pop()
+        if id(obj) in seen:
+            continue
+        seen.add(id(obj))
+        total += sys.getsizeof(obj)
+        if isinstance(obj, dict):
+            children = [*obj.keys(), *obj.values()]
+        elif isinstance(obj, (list, tuple, set, frozenset, collections.deque)):
+            children = list(obj)
+        elif type(obj).__module__.startswith("app.") and hasattr(obj, "__dict__"):
+            children = list(vars(obj).values())
+        else:
+            continue
+        stack.extend(child for child in children if id(child) not in skip)
+    return total
+
+def export_metrics():
+    """
+    Render all metrics in the Prometheus text exposition format.
+
+    Returns:
+        str: The exposition
+    """
+    families = [metric.expose() for metric in _metrics]
+    families.extend(_cache_families())
+    families.extend(_session_families())
+    return "".join(families)
+
+def write_metrics_file(path):
+    """
+    Write the metrics to a file, replacing it atomically.
+
+    Args:
+        path (str): File to write
+
+    Returns:
+        str: Error message, or None if successful
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    try:
+        with tempfile.NamedTemporaryFile("w", encoding="utf-8", dir=directory, suffix=".tmp", delete=False) as file:
+            file.write(export_metrics())
+        os.replace(file.name, path)
+        return None
+    except OSError as e:
+        return f"Error writing metrics file: {e}"
+
+def start_metrics_server(port, host=DEFAULT_METRICS_HOST):
+    """
+    Serve the metrics at /metrics from a background thread.
+
+    Args:
+        port (int): Port to listen on; 0 picks a free one
+        host (str): Address to listen on
+
+    Returns:
+        tuple: (server, error) where server is the running HTTP server or None if error occurred,
+               and error is an error message or None if successful
+    """
+    enable_metrics()
+    try:
+        server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    except OSError as e:
+        return None, f"Error starting metrics endpoint on {host}:{port}: {e}"
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="configlet-metrics", daemon=True).start()
+    return server, None
+
+def start_metrics_file(path, interval=DEFAULT_METRICS_INTERVAL):
+    """
+    Write the metrics to a file every interval seconds from a background thread.
+
+    Args:
+        path (str): File to write
+        interval (float): Seconds between writes
+
+    Returns:
+        threading.Thread: The writer thread
+    """
+    enable_metrics()
+
+    def write_periodically():
+        while True:
+            write_metrics_file(path)
+            time.sleep(interval)
+
+    thread = threading.Thread(target=write_periodically, name="configlet-metrics-file", daemon=True)
+    thread.start()
+    return thread
+
+def start_metrics_exporters():
+    """
+    Start the exporters configured by environment variables, once per process.
+
+    Safe to call on every script run. Exporters that fail to start are
+    reported on stderr; the app keeps running without them.
+
+    Returns:
+        list: Error messages of exporters that failed to start
+    """
+    global _exporters_started
+    with _state_lock:
+        if _exporters_started:
+            return []
+        _exporters_started = True
+
+    errors = []
+    if DEFAULT_METRICS_PORT:
+        _, error = start_metrics_server(DEFAULT_METRICS_PORT)
+        if error:
+            errors.append(error)
+    if DEFAULT_METRICS_FILE:
+        start_metrics_file(DEFAULT_METRICS_FILE)
+    for error in errors:
+        print(error, file=sys.stderr)
+    return errors
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Answers GET /metrics with the exposition."""
+
+    def do_GET(self):
+        if self.path.split("?", 1)[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+        body = export_metrics().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Keep scrapes out of the Streamlit server log."""
+
+def _observe_span(record):
+    """Feed the latency metrics from a finished span."""
+    name = record["name"]
+    if name == "template.render":
+        RENDER_SECONDS.observe(record["seconds"])
+        if record["error"]:
+            RENDER_ERRORS.inc()
+    elif name == "template.compile":
+        COMPILE_SECONDS.observe(record["seconds"])
+    elif name.startswith("apstra."):
+        endpoint = name[len("apstra."):]
+        API_SECONDS.observe(record["seconds"], endpoint=endpoint)
+        if record["error"]:
+            API_ERRORS.inc(endpoint=endpoint)
+
+def _cache_families():
+    """Read the hit, miss and entry counts of the app's caches."""
+    # Imported here so the diagnostics package can be imported by the modules it measures
+    from ..api.listing_cache import get_listing_cache_stats
+    from ..data.render_memo import get_render_memo_stats
+    from ..data.template_engine import get_bytecode_cache_stats, get_template_cache_stats
+
+    caches = {
+        "template": get_template_cache_stats(),
+        "render_memo": get_render_memo_stats(),
+        "listing": get_listing_cache_stats(),
+    }
+    bytecode = get_bytecode_cache_stats()
+    if bytecode["enabled"]:
+        caches["bytecode"] = bytecode
+
+    return [
+        _format_family("configlet_cache_hits_total", "counter", "Cache lookups answered from the cache.",
+                       [("", {"cache": name}, stats["hits"]) for name, stats in caches.items()]),
+        _format_family("configlet_cache_misses_total", "counter", "Cache lookups that had to compute the value.",
+                       [("", {"cache": name}, stats["misses"]) for name, stats in caches.items()]),
+        _format_family("configlet_cache_entries", "gauge", "Entries held in the process-wide caches.",
+                       [("", {"cache": name}, stats["size"]) for name, stats in caches.items() if "size" in stats]),
+    ]
+
+def _session_families():
+    """Count the active sessions and estimate the memory held in their session state."""
+    now = time.time()
+    with _sessions_lock:
+        for session_id in [key for key, entry in _sessions.items() if now - entry["seen"] > SESSION_TTL]:
+            del _sessions[session_id]
+        entries = list(_sessions.values())
+
+    with _export_lock:
+        sizes = [_session_size(entry, now) for entry in entries]
+
+    return [
+        _format_family("configlet_active_sessions", "gauge",
+                       f"Sessions with a script run in the last {SESSION_TTL:g} seconds.", [("", {}, len(entries))]),
+        _format_family("configlet_session_state_bytes", "gauge",
+                       "Estimated memory held in the session state of the active sessions.", [("", {}, sum(sizes))]),
+        _format_family("configlet_session_state_max_bytes", "gauge",
+                       "Estimated memory held in the largest session state.", [("", {}, max(sizes, default=0))]),
+    ]
+
+def _session_size(entry, now):
+    """Estimate the size of a session's state, measuring only values that changed."""
+    values = entry["values"]
+    cached = entry["sizes"]
+    # Values referenced from other keys (such as derived caches) are counted under their own key
+    top_level = {id(value) for value in values.values()}
+    sizes = {}
+    for key, value in values.items():
+        previous = cached.get(key)
+        if previous and previous[0] is value and now - previous[2] < SIZE_REFRESH_SECONDS:
+            sizes[key] = previous
+            continue
+        try:
+            sizes[key] = (value, estimate_size(value, top_level), now)
+        except RuntimeError:
+            # The session changed the value while it was measured; keep the last estimate
+            sizes[key] = previous or (value, 0, now)
+    entry["sizes"] = sizes
+    return sum(size for _, size, _ in sizes.values())
+
+def _format_family(name, kind, documentation, samples):
+    """Format one metric family: HELP and TYPE lines followed by (suffix, labels, value) samples."""
+    lines = [f"# HELP {name} {documentation}", f"# TYPE {name} {kind}"]
+    for suffix, labels, value in samples:
+        label_text = ",".join(f'{label}="{_escape(label_value)}"' for label, label_value in labels.items())
+        lines.append(f"{name}{suffix}{{{label_text}}} {_format_value(value)}" if label_text
+                     else f"{name}{suffix} {_format_value(value)}")
+    return "\n".join(lines) + "\n"
+
+def _escape(value):
+    """Escape a label value."""
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value):
+    """Format a sample value the way Prometheus parses it."""
+    if value == float("inf"):
+        return "+Inf"
+    return repr(value) if isinstance(value, float) else str(value)
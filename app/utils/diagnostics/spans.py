@@ -0,0 +1,258 @@
+# app/utils/diagnostics/spans.py
+"""
+Lightweight spans timing the hot paths of the app.
+
+A span records the wall-clock time of one call (an Apstra request, a file
+parse, a template compile or render) into the collector of the running
+script run. Streamlit runs every session in its own thread and
+asyncio.to_thread copies the caller's context, so the collector is kept in
+a context variable and spans of different sessions never mix.
+
+Spans can also be appended to a JSON lines file (CONFIGLET_DIAGNOSTICS_LOG)
+to find hotspots in production, and are passed to listeners such as the
+metrics module. Without a collector, a log file or a listener, a timed
+call costs one context variable lookup.
+"""
+import contextlib
+import contextvars
+import functools
+import os
+import threading
+import time
+
+from ..data import json_backend
+
+# Append every span as a JSON line to this file
+DEFAULT_SPAN_LOG = os.environ.get("CONFIGLET_DIAGNOSTICS_LOG") or None
+
+# Maximum number of spans kept per script run; fan-out operations can make thousands
+MAX_SPANS_PER_RUN = 1000
+
+_collector = contextvars.ContextVar("diagnostics_collector", default=None)
+_current_span = contextvars.ContextVar("diagnostics_current_span", default=None)
+_span_log = DEFAULT_SPAN_LOG
+_span_log_lock = threading.Lock()
+_span_listeners = []
+# Whether spans are recorded outside collectors, to the log or listeners
+_recording = _span_log is not None
+
+class SpanCollector:
+    """Spans recorded during one script run."""
+
+    def __init__(self, max_spans=MAX_SPANS_PER_RUN):
+        """
+        Args:
+            max_spans (int): Maximum number of spans kept; later spans are only counted
+        """
+        self.max_spans = max_spans
+        self.spans = []
+        self.dropped = 0
+
+    def add(self, record):
+        """Keep a span record, or count it as dropped once the collector is full."""
+        if len(self.spans) < self.max_spans:
+            self.spans.append(record)
+        else:
+            self.dropped += 1
+
+def start_collecting(max_spans=MAX_SPANS_PER_RUN):
+    """
+    Collect the spans of the current context (script run) from now on.
+
+    Args:
+        max_spans (int): Maximum number of spans kept
+
+    Returns:
+        SpanCollector: The collector receiving the spans
+    """
+    collector = SpanCollector(max_spans)
+    _collector.set(collector)
+    return collector
+
+def stop_collecting():
+    """
+    Stop collecting spans in the current context.
+
+    Returns:
+        SpanCollector: The collector that was active, or None
+    """
+    collector = _collector.get()
+    _collector.set(None)
+    return collector
+
+def configure_span_log(path):
+    """
+    Append every span to a JSON lines file, or stop doing so.
+
+    Args:
+        path (str): File the spans are appended to, or None to disable the log
+
+    Returns:
+        None
+    """
+    global _span_log, _recording
+    _span_log = path
+    _recording = _span_log is not None or bool(_span_listeners)
+
+def add_span_listener(listener):
+    """
+    Call a function with every finished span, whether or not a run collects it.
+
+    Args:
+        listener (callable): Called with each span record; must be fast and thread-safe
+
+    Returns:
+        None
+    """
+    global _recording
+    if listener not in _span_listeners:
+        _span_listeners.append(listener)
+    _recording = True
+
+def remove_span_listener(listener):
+    """
+    Stop calling a function added with add_span_listener().
+
+    Args:
+        listener (callable): The listener
+
+    Returns:
+        None
+    """
+    global _recording
+    if listener in _span_listeners:
+        _span_listeners.remove(listener)
+    _recording = _span_log is not None or bool(_span_listeners)
+
+@contextlib.contextmanager
+def span(name, **attributes):
+    """
+    Time a block of code as a span.
+
+    Args:
+        name (str): Span name, such as "ui.json_viewer"
+        **attributes: JSON-serializable values recorded with the span
+
+    Yields:
+        None
+    """
+    collector = _collector.get()
+    if collector is None and not _recording:
+        yield
+        return
+
+    token = _current_span.set(name)
+    started = time.time()
+    start = time.perf_counter()
+    failed = True
+    try:
+        yield
+        failed = False
+    finally:
+        _current_span.reset(token)
+        _finish(collector, name, started, time.perf_counter() - start, failed, attributes)
+
+def timed(name):
+    """
+    Decorator timing every call of a function as a span.
+
+    Calls returning an {"error": ...} dict or a (result, error) tuple with an
+    error, or raising, are recorded as failed. Recursive calls are timed once,
+    by the outermost span.
+
+    Args:
+        name (str): Span name, such as "apstra.get_device_context"
+
+    Returns:
+        callable: The decorator
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            collector = _collector.get()
+            if (collector is None and not _recording) or _current_span.get() == name:
+                return func(*args, **kwargs)
+
+            token = _current_span.set(name)
+            started = time.time()
+            start = time.perf_counter()
+            failed = True
+            try:
+                result = func(*args, **kwargs)
+                failed = _is_error(result)
+                return result
+            finally:
+                _current_span.reset(token)
+                _finish(collector, name, started, time.perf_counter() - start, failed)
+        return wrapper
+    return decorator
+
+def summarize_spans(spans):
+    """
+    Aggregate spans by name.
+
+    Args:
+        spans (iterable): Span records
+
+    Returns:
+        list: Slowest total first, dicts with name, count, errors, total, mean and max (seconds)
+    """
+    summary = {}
+    for record in spans:
+        entry = summary.setdefault(record["name"], {
+            "name": record["name"], "count": 0, "errors": 0, "total": 0.0, "max": 0.0
+        })
+        entry["count"] += 1
+        entry["errors"] += record["error"]
+        entry["total"] += record["seconds"]
+        entry["max"] = max(entry["max"], record["seconds"])
+    for entry in summary.values():
+        entry["mean"] = entry["total"] / entry["count"]
+    return sorted(summary.values(), key=lambda entry: -entry["total"])
+
+def spans_to_jsonl(spans, **fields):
+    """
+    Serialize spans as JSON lines.
+
+    Args:
+        spans (iterable): Span records
+        **fields: Values added to every line, such as the run they belong to
+
+    Returns:
+        str: One JSON object per line
+    """
+    return "".join(json_backend.dumps({**fields, **record}) + "\n" for record in spans)
+
+def _is_error(result):
+    """Recognize the app's error conventions: {"error": ...} responses and (result, error) tuples."""
+    if isinstance(result, dict):
+        return "error" in result
+    if isinstance(result, tuple) and len(result) == 2:
+        return result[1] is not None
+    return False
+
+def _finish(collector, name, started, seconds, failed, attributes=None):
+    """Record a finished span in the collector, the listeners and the span log."""
+    record = {
+        "name": name,
+        "parent": _current_span.get(),
+        "start": started,
+        "seconds": seconds,
+        "error": failed,
+    }
+    if attributes:
+        record.update(attributes)
+    if collector is not None:
+        collector.add(record)
+    for listener in _span_listeners:
+        listener(record)
+
+    path = _span_log
+    if path is not None:
+        line = json_backend.dumps(record) + "\n"
+        try:
+            with _span_log_lock, open(path, "a", encoding="utf-8") as log:
+                log.write(line)
+        except OSError:
+            # A full or read-only disk must never break the app
+            pass
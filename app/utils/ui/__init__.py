@@ -19,6 +19,18 @@ from .configlet_builder import (
     render_configlet_editor,
     render_apstra_configlet_loader,
 )
+from .fleet_render_panel import (
+    render_fleet_render_panel,
+)
+from .profile_report_panel import (
+    render_profile_report,
+)
+from .output_page_panel import (
+    render_output_page,
+)
+from .diagnostics_panel import (
+    render_diagnostics_panel,
+)
 __all__ = [
     "render_json_controls",
     "render_blueprint_dropdown",
@@ -26,5 +38,9 @@ __all__ = [
     "render_apstra_property_loader",
     "render_configlet_builder",
     "render_configlet_editor",
-    "render_apstra_configlet_loader"
+    "render_apstra_configlet_loader",
+    "render_fleet_render_panel",
+    "render_profile_report",
+    "render_output_page",
+    "render_diagnostics_panel"
 ]
\ No newline at end of file
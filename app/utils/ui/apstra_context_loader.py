@@ -1,5 +1,6 @@
 import streamlit as st
 from app.utils.api.apstra_client import get_all_blueprints, get_blueprint_nodes, get_device_context
+from app.utils.api.listing_cache import cached_listing
 
 def render_apstra_context_loader(state):
     """
@@ -22,7 +23,7 @@ def render_apstra_context_loader(state):
         st.warning("Please connect to Apstra API first")
         return
     if state.selected_blueprint_id:
-        nodes_response = get_blueprint_nodes(state.api_ip_url, state.api_token, state.selected_blueprint_id)
+        nodes_response = cached_listing(get_blueprint_nodes, state.api_ip_url, state.api_token, state.selected_blueprint_id)
     
         if not nodes_response or "items" not in nodes_response or not nodes_response["items"]:
             st.warning("No devices found in the selected blueprint.")
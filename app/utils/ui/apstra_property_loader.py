@@ -1,5 +1,6 @@
 import streamlit as st
 from app.utils.api.apstra_client import get_property_sets
+from app.utils.api.listing_cache import cached_listing
 from app.utils.ui.json_display_controls import render_json_controls
 
 def render_apstra_property_loader(state):
@@ -25,7 +26,7 @@ def render_apstra_property_loader(state):
     try:
         # Fetch property sets from Apstra
         with st.spinner("Fetching property sets from Apstra..."):
-            property_sets_response = get_property_sets(state.api_ip_url, state.api_token)
+            property_sets_response = cached_listing(get_property_sets, state.api_ip_url, state.api_token)
         
         if not property_sets_response or "items" not in property_sets_response or not property_sets_response["items"]:
             st.warning("No property sets found in Apstra.")
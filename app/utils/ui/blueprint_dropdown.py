@@ -1,4 +1,5 @@
 from ..api.apstra_client import get_all_blueprints
+from ..api.listing_cache import cached_listing
 import streamlit as st
 import json
 
@@ -20,7 +21,7 @@ def render_blueprint_dropdown(state):
     if state.api_ip_url and state.api_token:
         try:
             # Get all blueprints from the API
-            blueprints_response = get_all_blueprints(state.api_ip_url, state.api_token)
+            blueprints_response = cached_listing(get_all_blueprints, state.api_ip_url, state.api_token)
             
             if blueprints_response and "items" in blueprints_response:
                 # Store blueprint data (both label and id)
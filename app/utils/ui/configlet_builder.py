@@ -1,5 +1,6 @@
 import streamlit as st
 from app.utils.api.apstra_client import get_configlets
+from app.utils.api.listing_cache import cached_listing
 
 def render_configlet_builder(state):
     """
@@ -157,7 +158,7 @@ def render_apstra_configlet_loader(state):
     try:
         # Fetch configlets from Apstra
         with st.spinner("Fetching configlets from Apstra..."):
-            configlets_response = get_configlets(state.api_ip_url, state.api_token)
+            configlets_response = cached_listing(get_configlets, state.api_ip_url, state.api_token)
         
         if not configlets_response or "items" not in configlets_response or not configlets_response["items"]:
             st.warning("No configlets found in Apstra.")
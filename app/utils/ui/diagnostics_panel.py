@@ -0,0 +1,96 @@
+import streamlit as st
+
+from app.utils.data import json_backend
+from app.utils.diagnostics.spans import spans_to_jsonl, summarize_spans
+from app.utils.ui.sections import diagnostics_enabled, get_run_timings
+
+def render_diagnostics_panel():
+    """
+    Render the diagnostics panel in the sidebar.
+
+    Collecting timings is switched on per session. The panel then lists the
+    recent script runs with the time of every section and the Apstra calls,
+    parsing, template compiles and renders they made, aggregated per span.
+    The sidebar is drawn early in a run, so the run in progress is listed
+    once it has finished.
+
+    Returns:
+        None
+    """
+    with st.sidebar.expander("Diagnostics"):
+        st.toggle(
+            "Collect timings",
+            value=diagnostics_enabled(),
+            key="diagnostics_enabled",
+            help="Time Apstra calls, parsing, template compiles and renders of every run"
+        )
+
+        runs = [run for run in get_run_timings() if "spans" in run]
+        if not runs:
+            st.caption("No timed runs yet.")
+            return
+
+        # Most recent run first
+        runs.reverse()
+        index = st.selectbox(
+            "Run",
+            range(len(runs)),
+            format_func=lambda i: f"{runs[i]['scope']} ({runs[i]['seconds'] * 1000:.0f} ms)",
+            key="diagnostics_run"
+        )
+        run = runs[index]
+        st.metric("Run Time", f"{run['seconds'] * 1000:.1f} ms")
+
+        st.caption("Sections")
+        st.dataframe([
+            {"Section": name, "Time (ms)": round(seconds * 1000, 2)}
+            for name, seconds in run["sections"].items()
+        ], hide_index=True)
+
+        st.caption("Spans")
+        if run["spans"]:
+            st.dataframe([
+                {
+                    "Span": entry["name"],
+                    "Calls": entry["count"],
+                    "Errors": entry["errors"],
+                    "Total (ms)": round(entry["total"] * 1000, 2),
+                    "Max (ms)": round(entry["max"] * 1000, 2)
+                }
+                for entry in summarize_spans(run["spans"])
+            ], hide_index=True)
+        else:
+            st.write("No instrumented calls in this run.")
+        if run.get("dropped_spans"):
+            st.caption(f"{run['dropped_spans']} more spans were not kept.")
+
+        st.download_button(
+            label="Download Timings (JSON lines)",
+            data=lambda: export_run_timings(runs),
+            file_name="diagnostics.jsonl",
+            mime="application/x-ndjson",
+            key="diagnostics_download"
+        )
+
+def export_run_timings(runs):
+    """
+    Serialize run timings as JSON lines.
+
+    Args:
+        runs (list): Runs from get_run_timings()
+
+    Returns:
+        str: For every run, a line with type "run" followed by a line per span with type "span"
+    """
+    lines = []
+    for index, run in enumerate(runs):
+        lines.append(json_backend.dumps({
+            "type": "run",
+            "run": index,
+            "scope": run["scope"],
+            "seconds": run["seconds"],
+            "sections": run["sections"],
+            "dropped_spans": run.get("dropped_spans", 0),
+        }) + "\n")
+        lines.append(spans_to_jsonl(run.get("spans", []), type="span", run=index))
+    return "".join(lines)
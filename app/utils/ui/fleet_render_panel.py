@@ -0,0 +1,106 @@
+import streamlit as st
+from app.utils.data.fleet_render import run_fleet_render
+from app.utils.ui.output_page_panel import render_output_page
+from app.utils.ui.profile_report_panel import render_profile_report
+
+def render_fleet_render_panel(state, template_string, property_set=None):
+    """
+    Render the fleet render UI component.
+
+    This function handles:
+    - Rendering the current template against every switch in the selected blueprint
+    - Displaying wall time and per-device render times
+    - Displaying failures grouped by error message
+    - Viewing the rendered output of a single device, one page at a time
+    - Optionally profiling the renders, merged over all devices
+
+    Args:
+        state: Application state object
+        template_string: The current Jinja2 template
+        property_set: Optional property set merged into every device context
+
+    Returns:
+        None
+    """
+    with st.expander("Fleet Render", expanded=False):
+        # Check prerequisites
+        if not state.api_ip_url or not state.api_token:
+            st.warning("Please connect to Apstra API first")
+            return
+        if not state.selected_blueprint_id:
+            st.warning("Select a blueprint in the sidebar to render against all of its switches")
+            return
+        if not template_string:
+            st.info("Provide a Jinja2 template to render against the fleet.")
+            return
+
+        st.caption(f"Render the current template against every switch in blueprint '{state.selected_blueprint}'.")
+
+        profile = st.checkbox(
+            "Profile renders", key="fleet_render_profile",
+            help="Time every template line, block and loop across all devices (renders run slower)"
+        )
+
+        if st.button("Render All Switches", key="fleet_render_run"):
+            with st.spinner("Fetching device contexts and rendering..."):
+                report, error = run_fleet_render(
+                    state.api_ip_url,
+                    state.api_token,
+                    state.selected_blueprint_id,
+                    template_string,
+                    property_set,
+                    profile=profile
+                )
+            if error:
+                st.error(error)
+                return
+            state.fleet_render_report = report
+
+        report = getattr(state, "fleet_render_report", None)
+        if not report:
+            return
+
+        results = report["results"]
+        failed = sum(len(node_ids) for node_ids in report["failures"].values())
+
+        # Summary metrics
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("Devices", len(results))
+        col2.metric("Failed", failed)
+        col3.metric("Wall Time", f"{report['wall_time']:.2f} s")
+        col4.metric("Context Fetch", f"{report['fetch_time']:.2f} s")
+
+        # Failures grouped by error message
+        for error, node_ids in report["failures"].items():
+            st.error(f"{len(node_ids)} device(s): {error}")
+
+        # Per-device results
+        labels = {switch["id"]: switch["label"] for switch in report["switches"]}
+        st.dataframe([
+            {
+                "Device": labels.get(node_id, node_id),
+                "Status": "Failed" if result["error"] else "OK",
+                "Render Time (ms)": round(result["render_time"] * 1000, 2)
+            }
+            for node_id, result in sorted(results.items(), key=lambda item: -item[1]["render_time"])
+        ])
+
+        # Template profile merged over all devices
+        if report.get("profile"):
+            st.markdown("**Render Profile**")
+            render_profile_report(report["profile"], key="fleet_render")
+
+        # Output of a single device
+        node_ids = sorted(results, key=lambda node_id: labels.get(node_id, node_id))
+        selected_node = st.selectbox(
+            "View Device Output",
+            options=node_ids,
+            format_func=lambda node_id: labels.get(node_id, node_id),
+            key="fleet_render_device"
+        )
+        if selected_node:
+            result = results[selected_node]
+            if result["error"]:
+                st.error(result["error"])
+            else:
+                render_output_page(state, result["output"], key="fleet_render_output")
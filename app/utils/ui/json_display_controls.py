@@ -3,19 +3,24 @@
 import streamlit as st
 import json
 
-def render_json_controls(data, prefix=""):
+from app.utils.ui.sections import rerun_section
+
+def render_json_controls(data, prefix="", max_depth=None):
     """
     Render controls for JSON display with expand/collapse options.
     
     Args:
         data: The JSON data to be controlled
         prefix: A prefix for the key to avoid conflicts between multiple JSON viewers
+        max_depth: Precomputed calculate_max_depth(data); pass it to avoid walking
+            the data on every rerun
         
     Returns:
         int: The expansion depth selected by the user
     """
     # Calculate max reasonable depth based on data structure
-    max_depth = calculate_max_depth(data)
+    if max_depth is None:
+        max_depth = calculate_max_depth(data)
     
     # Use a container for the controls to keep them together
     with st.container():
@@ -33,13 +38,13 @@ def render_json_controls(data, prefix=""):
         with cols[0]:
             if st.button("Collapse", key=f"{prefix}_collapse", use_container_width=True):
                 st.session_state[f"{prefix}_expansion_depth"] = 0
-                st.rerun()  # Ensure state change is immediately reflected
+                rerun_section()  # Ensure state change is immediately reflected
         
         # Expand button
         with cols[1]:
             if st.button("Expand", key=f"{prefix}_expand", use_container_width=True):
                 st.session_state[f"{prefix}_expansion_depth"] = max_depth
-                st.rerun()  # Ensure state change is immediately reflected
+                rerun_section()  # Ensure state change is immediately reflected
                 
         # Depth selector
         with cols[2]:
@@ -0,0 +1,113 @@
+import itertools
+import math
+
+import streamlit as st
+
+from app.utils.config.session_state import get_derived_value
+from app.utils.data import json_backend
+from app.utils.data.json_tree import (
+    DEFAULT_PAGE_SIZE,
+    container_depths,
+    display_depth,
+    resolve_path,
+    visible_tree,
+)
+from app.utils.diagnostics.spans import span
+from app.utils.ui.json_display_controls import render_json_controls
+
+def render_json_viewer(state, data, prefix, depths_key=None, compute_depths=container_depths):
+    """
+    Render a JSON document, sending only its visible part to the browser.
+
+    This function handles:
+    - Expand/collapse and depth controls, with depths computed once per document
+    - Showing the levels down to the selected depth, one page of children per container
+    - Paging through the children of the container being viewed
+    - Opening a nested container, which loads its children only then
+
+    Args:
+        state: Application state object
+        data: The JSON document
+        prefix: A prefix for the widget keys of this viewer
+        depths_key: Name under which the container depths of data are kept
+            (defaults to "<prefix>_json_depths"); use a separate name for
+            search results so the depths of the full document are kept
+        compute_depths: Function computing the container depths of data,
+            e.g. from a search index (defaults to container_depths)
+
+    Returns:
+        None
+    """
+    depths = get_derived_value(state, depths_key or f"{prefix}_json_depths", data, compute_depths)
+
+    # Fall back to the nearest existing container when the document changed
+    path_key = f"{prefix}_viewer_path"
+    page_key = f"{prefix}_viewer_page"
+    node, path = resolve_path(data, st.session_state.get(path_key) or [])
+    st.session_state[path_key] = path
+
+    # Where in the document the viewer is
+    if path:
+        nav_cols = st.columns([1, 5])
+        with nav_cols[0]:
+            st.button("Up", key=f"{prefix}_viewer_up", on_click=_open_path, args=(prefix, path[:-1]),
+                      use_container_width=True)
+        with nav_cols[1]:
+            st.caption("Viewing: " + " › ".join(f"[{key}]" if isinstance(key, int) else str(key) for key in path))
+
+    # Page through the children of large containers
+    offset = 0
+    children = len(node) if isinstance(node, (dict, list)) else 0
+    pages = math.ceil(children / DEFAULT_PAGE_SIZE)
+    if pages > 1:
+        if (st.session_state.get(page_key) or 1) > pages:
+            st.session_state[page_key] = pages
+        page = st.number_input(
+            f"Page (of {pages}, {DEFAULT_PAGE_SIZE} entries each)",
+            min_value=1, max_value=pages, value=1, step=1, key=page_key
+        )
+        offset = (page - 1) * DEFAULT_PAGE_SIZE
+
+    # Open a nested container of the current page
+    nested = _nested_containers(node, offset)
+    if nested:
+        st.selectbox(
+            "Open",
+            [None] + nested,
+            format_func=lambda key: "Select a nested object or list..." if key is None else str(key),
+            key=f"{prefix}_viewer_open",
+            on_change=_open_selected,
+            args=(prefix, path)
+        )
+
+    # Depth controls for the node being viewed, from the precomputed depths
+    expansion_depth = render_json_controls(node, prefix=prefix, max_depth=display_depth(depths, node))
+
+    # Add some space between controls and JSON
+    st.markdown("<div style='margin-top: 1em;'></div>", unsafe_allow_html=True)
+
+    # Only the visible part is serialized and sent
+    with span("ui.json_viewer", viewer=prefix):
+        st.json(json_backend.dumps(visible_tree(node, expansion_depth, offset)), expanded=expansion_depth)
+
+def _nested_containers(node, offset):
+    """Return the keys of the non-empty containers among one page of a node's children."""
+    if isinstance(node, dict):
+        items = itertools.islice(node.items(), offset, offset + DEFAULT_PAGE_SIZE)
+    elif isinstance(node, list):
+        items = list(enumerate(node[offset:offset + DEFAULT_PAGE_SIZE], offset))
+    else:
+        return []
+    return [key for key, value in items if isinstance(value, (dict, list)) and value]
+
+def _open_path(prefix, path):
+    """Show the container at path, starting from its first page."""
+    st.session_state[f"{prefix}_viewer_path"] = list(path)
+    st.session_state[f"{prefix}_viewer_page"] = 1
+
+def _open_selected(prefix, path):
+    """Open the child selected in the viewer's "Open" box."""
+    key = st.session_state.get(f"{prefix}_viewer_open")
+    st.session_state[f"{prefix}_viewer_open"] = None
+    if key is not None:
+        _open_path(prefix, path + [key])
@@ -0,0 +1,34 @@
+import streamlit as st
+
+from app.utils.config.session_state import get_derived_value
+from app.utils.data.output_pages import DEFAULT_PAGE_LINES, page_offsets, get_page, count_lines
+
+def render_output_page(state, output, key="rendered_output"):
+    """
+    Display one page of a rendered output, with a page selector for long outputs.
+
+    Args:
+        state: Application state object
+        output (str): The rendered output
+        key (str): Prefix for the widget key and the derived page boundaries
+
+    Returns:
+        None
+    """
+    # Page boundaries are found once per output, not on every rerun
+    offsets = get_derived_value(state, f"{key}_pages", output, page_offsets)
+    pages = len(offsets) - 1
+    page = 0
+    if pages > 1:
+        page_key = f"{key}_page"
+        # Keep the selected page within range when a shorter output replaces a longer one
+        selected = state[page_key] if page_key in state else None
+        if (selected or 1) > pages:
+            state[page_key] = pages
+        page = st.number_input(
+            f"Page (of {pages})", min_value=1, max_value=pages, value=1, step=1, key=page_key
+        ) - 1
+        first_line = page * DEFAULT_PAGE_LINES + 1
+        total_lines = get_derived_value(state, f"{key}_lines", output, count_lines)
+        st.caption(f"Showing page {page + 1} of {pages} from line {first_line:,} of {total_lines:,}.")
+    st.code(get_page(output, offsets, page), language="text", line_numbers=True)
@@ -0,0 +1,56 @@
+import streamlit as st
+
+from app.utils.data import json_backend
+
+# Number of template lines listed, slowest first
+PROFILE_TOP_LINES = 20
+
+def render_profile_report(report, key):
+    """
+    Render a template profiling report.
+
+    Args:
+        report (dict): Report from TemplateProfiler.report() or merge_profile_reports()
+        key (str): Prefix for the widget keys
+
+    Returns:
+        None
+    """
+    renders = report.get("renders", 1)
+    col1, col2 = st.columns(2)
+    col1.metric("Profiled Time", f"{report['total_time'] * 1000:.1f} ms")
+    col2.metric("Renders", renders)
+
+    # Loops, macros and other blocks, slowest first
+    if report["blocks"]:
+        st.caption("Blocks")
+        st.dataframe([
+            {
+                "Block": block["kind"],
+                "Lines": f"{block['line']}-{block['end_line']}",
+                "Source": block["source"],
+                "Time (ms)": round(block["time"] * 1000, 3),
+                "Iterations": block["iterations"]
+            }
+            for block in report["blocks"]
+        ], hide_index=True)
+
+    # Slowest template lines
+    st.caption("Slowest Lines")
+    lines = sorted(report["lines"], key=lambda line: -line["time"])[:PROFILE_TOP_LINES]
+    st.dataframe([
+        {
+            "Line": line["line"],
+            "Source": line["source"],
+            "Time (ms)": round(line["time"] * 1000, 3)
+        }
+        for line in lines
+    ], hide_index=True)
+
+    st.download_button(
+        label="Download Profile (JSON)",
+        data=json_backend.dumps(report, indent=True),
+        file_name="render_profile.json",
+        mime="application/json",
+        key=f"{key}_profile_download"
+    )
@@ -0,0 +1,210 @@
+import os
+import time
+
+import streamlit as st
+
+from app.utils.config.session_state import get_state
+from app.utils.diagnostics.metrics import metrics_enabled, observe_run, record_session
+from app.utils.diagnostics.spans import start_collecting, stop_collecting
+
+# Run page sections as fragments; set CONFIGLET_FRAGMENTS=0 to rerun the whole app on every interaction
+FRAGMENTS_ENABLED = os.environ.get("CONFIGLET_FRAGMENTS", "1").lower() not in ("0", "false", "no")
+
+# Number of script runs whose timings are kept in session state
+RUN_TIMING_HISTORY = 50
+
+# Collect the spans of every run by default; the diagnostics panel switches this per session
+DIAGNOSTICS_ENABLED = os.environ.get("CONFIGLET_DIAGNOSTICS", "0").lower() in ("1", "true", "yes")
+
+def render_section(name, render, fragment=True, run_every=None):
+    """
+    Render one section of the page, rerunning on its own where possible.
+
+    Sections run as Streamlit fragments: interacting with a widget inside a
+    section reruns only that section. Changes other sections depend on
+    (loading a context, logging in) still call st.rerun(), which reruns the
+    whole app. The execution time of every section is recorded with the run,
+    and so are the spans of a section rerun when diagnostics are enabled.
+    A section drawn inside another one is timed as part of it.
+
+    Args:
+        name (str): Section name used in the run timings
+        render (callable): Function drawing the section
+        fragment (bool): Run the section as a fragment (sections using
+            st.sidebar must not, as fragments can't write to the sidebar)
+        run_every (float): Also rerun the section every this many seconds.
+            Streamlit keeps the timer until the enclosing section or the
+            whole app reruns; ignored when fragments are disabled
+
+    Returns:
+        None
+    """
+    def run_section():
+        state = get_state()
+        if "_running_section" in state and state["_running_section"]:
+            # Nested in a section being run, which times and collects it
+            render()
+            return
+        start = time.perf_counter()
+        # A section rerun on its own is a script run; collect its spans separately
+        collector = None if _active_run(state) else _start_diagnostics()
+        state["_running_section"] = name
+        try:
+            render()
+        finally:
+            state["_running_section"] = None
+            _record_section(name, time.perf_counter() - start, collector)
+
+    # The fragment ID is derived from the qualified name and position of the function
+    run_section.__qualname__ = f"render_section.{name}"
+    if fragment and FRAGMENTS_ENABLED:
+        st.fragment(run_section, run_every=run_every)()
+    else:
+        run_section()
+
+def rerun_section():
+    """
+    Rerun the section being run, or the whole app during a full run.
+
+    Returns:
+        None
+    """
+    try:
+        st.rerun(scope="fragment")
+    except st.errors.StreamlitAPIException:
+        # Fragment-scoped reruns are only allowed during fragment reruns
+        st.rerun()
+
+def section_rerunning(name):
+    """
+    Check whether a section is being rerun on its own, not as part of the app
+    or of an enclosing section.
+
+    Args:
+        name (str): Section name passed to render_section()
+
+    Returns:
+        bool: True during a rerun of just that section
+    """
+    state = get_state()
+    return "_running_section" in state and state["_running_section"] == name
+
+def update_render_inputs(state, **values):
+    """
+    Set session state values other sections render from, rerunning the whole
+    app if any of them changed.
+
+    A section run as a fragment only reruns itself, so the rendered output
+    would keep showing a render of the previous inputs until the next full run.
+
+    Args:
+        state: Application state object
+        **values: State keys and their new values
+
+    Returns:
+        None
+    """
+    changed = False
+    for key, value in values.items():
+        current = state[key] if key in state else None
+        if current is not value and current != value:
+            changed = True
+        state[key] = value
+    if changed:
+        st.rerun()
+
+def start_app_run():
+    """
+    Start timing a full run of the app.
+
+    Returns:
+        None
+    """
+    state = get_state()
+    state["_active_run"] = {
+        "scope": "app",
+        "sections": {},
+        "start": time.perf_counter(),
+        "collector": _start_diagnostics(),
+    }
+
+def finish_app_run():
+    """
+    Record the execution time of the full app run started by start_app_run().
+
+    Returns:
+        None
+    """
+    state = get_state()
+    run = _active_run(state)
+    state["_active_run"] = None
+    if run:
+        _store_run(state, run)
+
+def get_run_timings():
+    """
+    Get the execution times of the recent script runs of this session.
+
+    Returns:
+        list: Oldest first, dicts with keys:
+            - scope: "app" for full runs, or the name of the rerun section
+            - seconds: execution time of the run
+            - sections: section name to execution time in seconds
+            - spans: span records of the run (see diagnostics.spans), only
+              when diagnostics were enabled
+            - dropped_spans: spans not kept because the run had too many
+    """
+    state = get_state()
+    return list(state["run_timings"]) if "run_timings" in state and state["run_timings"] else []
+
+def diagnostics_enabled():
+    """
+    Check whether the spans of this session's runs are collected.
+
+    Returns:
+        bool: The session's diagnostics setting, or DIAGNOSTICS_ENABLED if not set
+    """
+    state = get_state()
+    return bool(state["diagnostics_enabled"]) if "diagnostics_enabled" in state else DIAGNOSTICS_ENABLED
+
+def _active_run(state):
+    """Return the app run in progress, or None."""
+    return state["_active_run"] if "_active_run" in state else None
+
+def _start_diagnostics():
+    """Start collecting the spans of a script run if diagnostics are enabled."""
+    if diagnostics_enabled():
+        return start_collecting()
+    # Don't keep collecting into a collector left by an interrupted run
+    stop_collecting()
+    return None
+
+def _record_section(name, seconds, collector=None):
+    """Add a section time to the active app run, or record a section rerun."""
+    state = get_state()
+    run = _active_run(state)
+    if run:
+        run["sections"][name] = seconds
+    else:
+        _store_run(state, {"scope": name, "sections": {name: seconds}, "seconds": seconds, "collector": collector})
+
+def _store_run(state, run):
+    """Append a run to the bounded timing history."""
+    if "start" in run:
+        run["seconds"] = time.perf_counter() - run.pop("start")
+    collector = run.pop("collector", None)
+    if collector is not None:
+        stop_collecting()
+        run["spans"] = collector.spans
+        run["dropped_spans"] = collector.dropped
+    if metrics_enabled():
+        observe_run(run["scope"], run["seconds"])
+        # Only references are taken; the exporter measures them off the script thread
+        record_session(_session_id(), state.to_dict() if hasattr(state, "to_dict") else dict(state))
+    timings = state["run_timings"] if "run_timings" in state and state["run_timings"] else []
+    state["run_timings"] = (timings + [run])[-RUN_TIMING_HISTORY:]
+
+def _session_id():
+    """Return the ID of the session running the script."""
+    ctx = st.runtime.scriptrunner.get_script_run_ctx(suppress_warning=True)
+    return ctx.session_id if ctx else "local"
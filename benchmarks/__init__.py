@@ -0,0 +1,6 @@
+"""
+Benchmarks for the Apstra Configlet Builder.
+
+Run individual benchmarks from the root of the project, for example:
+    python -m benchmarks.bench_layered_context
+"""
@@ -0,0 +1,407 @@
+#!/usr/bin/env python3
+"""
+Local stand-in for the Apstra API, for offline load tests and benchmarks.
+
+Serves the endpoints apstra_client calls over HTTPS, with HTTP/1.1
+keep-alive, from a synthetic fabric of configurable size:
+
+    POST /api/aaa/login                                   JWT for any credentials
+    GET  /api/blueprints                                  blueprints of the fabric
+    POST /api/blueprints/<id>/qe                          switch nodes of a blueprint
+    GET  /api/blueprints/<id>/nodes/<id>/config-context   example context scaled per node
+    GET  /api/property-sets                               property sets
+    GET  /api/design/configlets                           configlets
+    GET  /api/docs                                        connection test
+
+Every request can be delayed by a fixed latency plus random jitter, and
+fail with an injected HTTP error at a given rate. Randomness is seeded so
+runs are reproducible. The TLS certificate is self-signed and generated
+with openssl on start; the client does not verify certificates.
+
+Usage:
+    python -m benchmarks.apstra_standin [--port 8443] [--blueprints 2] [--switches 64]
+                                        [--context-scale 10] [--latency 0.02] [--jitter 0.01]
+                                        [--error-rate 0.0] [--error-status 503] [--seed 0]
+
+    Then log in to 127.0.0.1:<port> with any username and password.
+"""
+
+import argparse
+import base64
+import datetime
+import hashlib
+import hmac
+import json
+import random
+import re
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from benchmarks.synthetic import load_example_context, load_example_property_set, scale_context
+
+# Secret the stand-in signs its tokens with; clients don't verify the signature
+TOKEN_SECRET = "apstra-standin-token-signing-secret"
+
+_NODE_CONTEXT = re.compile(r"^/api/blueprints/([^/]+)/nodes/([^/]+)/config-context$")
+_QUERY_ENGINE = re.compile(r"^/api/blueprints/([^/]+)/qe$")
+
+def encode_token(claims):
+    """
+    Sign claims as an HS256 JWT, the way Apstra issues session tokens.
+
+    Args:
+        claims (dict): Token payload
+
+    Returns:
+        str: The encoded token
+    """
+    def segment(data):
+        return base64.urlsafe_b64encode(data).rstrip(b"=")
+
+    header = segment(json.dumps({"alg": "HS256", "typ": "JWT"}).encode("utf-8"))
+    payload = segment(json.dumps(claims).encode("utf-8"))
+    signature = hmac.new(TOKEN_SECRET.encode("utf-8"), header + b"." + payload, hashlib.sha256).digest()
+    return b".".join((header, payload, segment(signature))).decode("ascii")
+
+def generate_certificate(directory):
+    """
+    Generate a self-signed certificate for 127.0.0.1 and localhost with openssl.
+
+    Args:
+        directory (str or Path): Directory the key and certificate are written to
+
+    Returns:
+        tuple: (certificate path, key path)
+
+    Raises:
+        RuntimeError: If openssl is missing or fails
+    """
+    certificate = Path(directory) / "standin-cert.pem"
+    key = Path(directory) / "standin-key.pem"
+    command = [
+        "openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+        "-keyout", str(key), "-out", str(certificate), "-subj", "/CN=localhost",
+        "-addext", "subjectAltName=IP:127.0.0.1,DNS:localhost",
+    ]
+    try:
+        subprocess.run(command, check=True, capture_output=True)
+    except FileNotFoundError:
+        raise RuntimeError("openssl is required to generate the stand-in's certificate")
+    except subprocess.CalledProcessError as e:
+        raise RuntimeError(f"openssl failed: {e.stderr.decode(errors='replace')}")
+    return certificate, key
+
+class SyntheticFabric:
+    """Blueprints, switches, contexts, property sets and configlets served by the stand-in."""
+
+    def __init__(self, blueprints=2, switches=64, context_scale=1, property_sets=10, configlets=20):
+        """
+        Args:
+            blueprints (int): Number of blueprints
+            switches (int): Switches per blueprint
+            context_scale (int): Scale factor of every node's config-context (see benchmarks.synthetic)
+            property_sets (int): Number of property sets
+            configlets (int): Number of configlets
+        """
+        self.blueprints = [
+            {"id": f"bp-{index}", "label": f"dc{index}", "design": "two_stage_l3clos", "status": "created"}
+            for index in range(blueprints)
+        ]
+        self.switches = {
+            blueprint["id"]: [
+                {
+                    "id": f"{blueprint['id']}-sw-{index}",
+                    "label": f"{'spine' if index < 2 else 'leaf'}{index}",
+                    "hostname": f"{blueprint['label']}-{'spine' if index < 2 else 'leaf'}{index}",
+                    "role": "spine" if index < 2 else "leaf",
+                    "system_type": "switch",
+                }
+                for index in range(switches)
+            ]
+            for blueprint in self.blueprints
+        }
+        self.base_context = scale_context(load_example_context(), context_scale)
+        property_values = load_example_property_set()
+        self.property_sets = [
+            {
+                "id": f"ps-{index}",
+                "label": f"property-set-{index}",
+                "values": property_values,
+                "created_at": "2024-01-01T00:00:00.000000Z",
+                "updated_at": "2024-01-01T00:00:00.000000Z",
+            }
+            for index in range(property_sets)
+        ]
+        self.configlets = [
+            {
+                "id": f"cfg-{index}",
+                "display_name": f"configlet-{index}",
+                "ref_archs": ["two_stage_l3clos"],
+                "created_at": "2024-01-01T00:00:00.000000Z",
+                "last_modified_at": "2024-01-01T00:00:00.000000Z",
+                "generators": [{
+                    "config_style": "junos",
+                    "section": "system",
+                    "template_text": "system {\n    host-name {{ hostname }};\n}",
+                    "negation_template_text": "",
+                    "filename": "",
+                }],
+            }
+            for index in range(configlets)
+        ]
+        self._contexts = {}
+        self._contexts_lock = threading.Lock()
+
+    def node(self, blueprint_id, node_id):
+        """Return a switch of a blueprint, or None."""
+        for switch in self.switches.get(blueprint_id, []):
+            if switch["id"] == node_id:
+                return switch
+        return None
+
+    def context_body(self, blueprint_id, node_id):
+        """
+        Get the serialized config-context response of a switch, built once per switch.
+
+        Returns:
+            bytes: Response body, or None if the node doesn't exist
+        """
+        with self._contexts_lock:
+            body = self._contexts.get((blueprint_id, node_id))
+        if body is not None:
+            return body
+        switch = self.node(blueprint_id, node_id)
+        if switch is None:
+            return None
+
+        # Share the scaled context; only the identity of the node differs
+        context = dict(self.base_context, hostname=switch["hostname"], role=switch["role"], id=switch["id"])
+        body = json.dumps({"context": json.dumps(context)}).encode("utf-8")
+        with self._contexts_lock:
+            self._contexts[(blueprint_id, node_id)] = body
+        return body
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Request handler of the stand-in; the server holds the fabric and settings."""
+
+    protocol_version = "HTTP/1.1"
+    # Headers and body are written separately; don't let Nagle hold back the body
+    disable_nagle_algorithm = True
+
+    def log_message(self, format, *args):
+        """Keep benchmark output clean."""
+
+    def do_GET(self):
+        self._handle("GET")
+
+    def do_POST(self):
+        self._handle("POST")
+
+    def _handle(self, method):
+        server = self.server
+        path = self.path.split("?", 1)[0]
+        endpoint = _endpoint_name(path)
+        server.record(endpoint)
+
+        # Read the request body so the connection can be reused
+        length = int(self.headers.get("Content-Length") or 0)
+        body = self.rfile.read(length) if length else b""
+
+        delay = server.delay()
+        if delay:
+            time.sleep(delay)
+        if server.inject_error():
+            return self._send(server.error_status, {"errors": f"Injected error on {endpoint}"})
+
+        if method == "POST" and path == "/api/aaa/login":
+            return self._login(body)
+        if self.headers.get("AuthToken") not in server.tokens:
+            return self._send(401, {"errors": "Authentication required"})
+
+        fabric = server.fabric
+        if method == "GET" and path == "/api/blueprints":
+            return self._send(200, {"items": fabric.blueprints})
+        if method == "GET" and path == "/api/property-sets":
+            return self._send(200, {"items": fabric.property_sets})
+        if method == "GET" and path == "/api/design/configlets":
+            return self._send(200, {"items": fabric.configlets})
+        if method == "GET" and path == "/api/docs":
+            return self._send(200, {"openapi": "3.0.0", "info": {"title": "Apstra stand-in"}})
+
+        match = _QUERY_ENGINE.match(path)
+        if method == "POST" and match:
+            if match.group(1) not in fabric.switches:
+                return self._send(404, {"errors": f"Blueprint {match.group(1)} not found"})
+            items = [{"switch_nodes": switch} for switch in fabric.switches[match.group(1)]]
+            return self._send(200, {"items": items, "count": len(items)})
+
+        match = _NODE_CONTEXT.match(path)
+        if method == "GET" and match:
+            context = fabric.context_body(match.group(1), match.group(2))
+            if context is None:
+                return self._send(404, {"errors": f"Node {match.group(2)} not found"})
+            return self._send_bytes(200, context)
+
+        return self._send(404, {"errors": f"No stand-in for {method} {path}"})
+
+    def _login(self, body):
+        try:
+            credentials = json.loads(body or b"{}")
+        except ValueError:
+            return self._send(400, {"errors": "Invalid JSON body"})
+        now = datetime.datetime.now(datetime.timezone.utc)
+        token = encode_token({
+            "username": credentials.get("username", "admin"),
+            "created_at": now.isoformat(),
+            "exp": int((now + datetime.timedelta(hours=24)).timestamp()),
+        })
+        self.server.tokens.add(token)
+        return self._send(201, {"token": token, "id": credentials.get("username", "admin")})
+
+    def _send(self, status, payload):
+        self._send_bytes(status, json.dumps(payload).encode("utf-8"))
+
+    def _send_bytes(self, status, body):
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class ApstraStandIn(ThreadingHTTPServer):
+    """
+    HTTPS server answering the Apstra endpoints apstra_client uses.
+
+    Usage:
+        with ApstraStandIn(SyntheticFabric(switches=128), latency=0.02) as server:
+            token = apstra_client.get_login(server.base_url, "admin", "admin")["token"]
+            ...
+    """
+
+    daemon_threads = True
+
+    def __init__(self, fabric=None, port=0, latency=0.0, jitter=0.0, error_rate=0.0, error_status=503, seed=0,
+                 certificate_dir=None):
+        """
+        Args:
+            fabric (SyntheticFabric, optional): Data to serve (defaults to SyntheticFabric())
+            port (int): Port on 127.0.0.1; 0 picks a free one
+            latency (float): Seconds every request is delayed
+            jitter (float): Maximum random seconds added to the latency
+            error_rate (float): Fraction of requests answered with error_status
+            error_status (int): HTTP status of injected errors
+            seed (int): Seed of the latency and error randomness
+            certificate_dir (str, optional): Where the certificate is generated (defaults to a temporary directory)
+        """
+        super().__init__(("127.0.0.1", port), StandInHandler)
+        self.fabric = fabric or SyntheticFabric()
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.tokens = set()
+        self.requests = Counter()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._thread = None
+
+        self._certificate_dir = None
+        if certificate_dir is None:
+            self._certificate_dir = tempfile.TemporaryDirectory()
+            certificate_dir = self._certificate_dir.name
+        certificate, key = generate_certificate(certificate_dir)
+        tls = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        tls.load_cert_chain(certificate, key)
+        self.socket = tls.wrap_socket(self.socket, server_side=True)
+
+    @property
+    def base_url(self):
+        """Host and port to pass to apstra_client as base_url."""
+        return f"127.0.0.1:{self.server_address[1]}"
+
+    def record(self, endpoint):
+        """Count a request to an endpoint."""
+        with self._lock:
+            self.requests[endpoint] += 1
+
+    def delay(self):
+        """Return the delay of the next request."""
+        if not self.jitter:
+            return self.latency
+        with self._lock:
+            return self.latency + self._random.uniform(0, self.jitter)
+
+    def inject_error(self):
+        """Decide whether the next request fails."""
+        if not self.error_rate:
+            return False
+        with self._lock:
+            return self._random.random() < self.error_rate
+
+    def start(self):
+        """Serve requests in a background thread."""
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        """Stop serving and remove the generated certificate."""
+        self.shutdown()
+        self.server_close()
+        if self._thread:
+            self._thread.join()
+        if self._certificate_dir:
+            self._certificate_dir.cleanup()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+        return False
+
+def _endpoint_name(path):
+    """Group request paths by endpoint for the request counts."""
+    if _NODE_CONTEXT.match(path):
+        return "config-context"
+    if _QUERY_ENGINE.match(path):
+        return "qe"
+    return path
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--port", type=int, default=8443, help="Port to listen on (127.0.0.1)")
+    parser.add_argument("--blueprints", type=int, default=2, help="Number of blueprints")
+    parser.add_argument("--switches", type=int, default=64, help="Switches per blueprint")
+    parser.add_argument("--context-scale", type=int, default=1, help="Scale factor of every config-context")
+    parser.add_argument("--property-sets", type=int, default=10, help="Number of property sets")
+    parser.add_argument("--configlets", type=int, default=20, help="Number of configlets")
+    parser.add_argument("--latency", type=float, default=0.0, help="Seconds every request is delayed")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Maximum random seconds added to the latency")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of requests that fail")
+    parser.add_argument("--error-status", type=int, default=503, help="HTTP status of injected errors")
+    parser.add_argument("--seed", type=int, default=0, help="Seed of the latency and error randomness")
+    args = parser.parse_args()
+
+    fabric = SyntheticFabric(args.blueprints, args.switches, args.context_scale, args.property_sets, args.configlets)
+    server = ApstraStandIn(fabric, args.port, args.latency, args.jitter, args.error_rate, args.error_status, args.seed)
+    print(f"Apstra stand-in serving {args.blueprints} blueprints x {args.switches} switches "
+          f"on https://{server.base_url} (any username and password)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        print("\nRequests served:")
+        for endpoint, count in sorted(server.requests.items()):
+            print(f"  {endpoint:<40}{count:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Benchmark the Apstra client layer against the local stand-in server.
+
+Starts benchmarks.apstra_standin on a free port and reports, at the given
+per-request latency:
+- a listing call over the pooled keep-alive session vs a new connection
+  (and TLS handshake) per request
+- fetching the config-context of every switch of a blueprint one after the
+  other vs concurrently with async_apstra_client
+- the same concurrent fetch with injected errors, to check failures stay
+  per node
+
+Usage:
+    python -m benchmarks.bench_apstra_client [--switches 64] [--context-scale 10]
+                                             [--latency 0.02] [--error-rate 0.1] [--repeat 20]
+"""
+
+import argparse
+import time
+import warnings
+
+from app.utils.api import apstra_client, async_apstra_client
+from app.utils.api.http_client import close_sessions
+from benchmarks.apstra_standin import ApstraStandIn, SyntheticFabric
+from benchmarks.bench_layered_context import print_header
+
+def timed(func, repeat=1):
+    """Return (mean seconds, last result) for func()."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = func()
+    return (time.perf_counter() - start) / repeat, result
+
+def fetch_sequentially(base_url, token, blueprint_id, node_ids):
+    """Fetch contexts one node at a time, the way the UI did before the async client."""
+    return {node_id: apstra_client.get_device_context(base_url, token, blueprint_id, node_id) for node_id in node_ids}
+
+def fetch_concurrently(base_url, token, blueprint_id, node_ids):
+    """Fetch contexts with async_apstra_client."""
+    return async_apstra_client.run(async_apstra_client.get_device_contexts(base_url, token, blueprint_id, node_ids))
+
+def fresh_connection(func):
+    """Drop the pooled sessions before calling func, forcing a new connection."""
+    close_sessions()
+    return func()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--switches", type=int, default=64, help="Switches in the blueprint")
+    parser.add_argument("--context-scale", type=int, default=10, help="Scale factor of every config-context")
+    parser.add_argument("--latency", type=float, default=0.02, help="Seconds every request is delayed")
+    parser.add_argument("--error-rate", type=float, default=0.1, help="Fraction of failed requests in the last run")
+    parser.add_argument("--repeat", type=int, default=20, help="Iterations of the listing calls")
+    args = parser.parse_args()
+
+    # The stand-in's certificate is self-signed and the client doesn't verify it
+    warnings.filterwarnings("ignore", message="Unverified HTTPS request")
+
+    fabric = SyntheticFabric(blueprints=1, switches=args.switches, context_scale=args.context_scale)
+    with ApstraStandIn(fabric, latency=args.latency) as server:
+        base_url = server.base_url
+        token = apstra_client.get_login(base_url, "admin", "admin")["token"]
+        node_ids = [item["switch_nodes"]["id"] for item in apstra_client.get_blueprint_nodes(base_url, token, "bp-0")["items"]]
+
+        print_header("APSTRA CLIENT")
+        print(f"Stand-in: https://{base_url}, {args.latency * 1000:.0f} ms latency per request")
+        print(f"Blueprint: {len(node_ids)} switches, contexts {len(fabric.context_body('bp-0', node_ids[0])) / 1024:.1f} KiB each\n")
+
+        listing = lambda: apstra_client.get_property_sets(base_url, token)
+        pooled_time, _ = timed(listing, args.repeat)
+        fresh_time, _ = timed(lambda: fresh_connection(listing), args.repeat)
+        print(f"{'Listing call':<40}{'Mean (ms)':>14}{'Overhead (ms)':>16}")
+        print("-" * 70)
+        print(f"{'new connection per request':<40}{fresh_time * 1000:>14.2f}{(fresh_time - args.latency) * 1000:>16.2f}")
+        print(f"{'pooled keep-alive session':<40}{pooled_time * 1000:>14.2f}{(pooled_time - args.latency) * 1000:>16.2f}")
+
+        sequential_time, _ = timed(lambda: fetch_sequentially(base_url, token, "bp-0", node_ids))
+        concurrent_time, _ = timed(lambda: fetch_concurrently(base_url, token, "bp-0", node_ids))
+        print(f"\n{f'Fetch {len(node_ids)} contexts':<40}{'Total (s)':>14}{'Speedup':>16}")
+        print("-" * 70)
+        print(f"{'sequential':<40}{sequential_time:>14.3f}{1.0:>15.1f}x")
+        print(f"{'async_apstra_client':<40}{concurrent_time:>14.3f}{sequential_time / concurrent_time:>15.1f}x")
+
+        server.error_rate = args.error_rate
+        faulty_time, contexts = timed(lambda: fetch_concurrently(base_url, token, "bp-0", node_ids))
+        failed = sum(1 for context in contexts.values() if "error" in context)
+        print(f"{f'async, {args.error_rate:.0%} injected errors':<40}{faulty_time:>14.3f}"
+              f"{sequential_time / faulty_time:>15.1f}x   ({failed} failed)")
+
+        print(f"\nRequests served: {sum(server.requests.values())}")
+    close_sessions()
+
+if __name__ == "__main__":
+    main()
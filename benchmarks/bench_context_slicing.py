@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Benchmark rendering against a slice of the context holding only the paths
+the template reads.
+
+For a sparse and an iterating template over the example device context
+scaled up, reports the bytes moved to a render (the pickled job a fleet
+worker receives and the compact JSON that gets fingerprinted), and the
+render latency with slicing on and off, including the slicing itself.
+
+Usage:
+    python -m benchmarks.bench_context_slicing [--scale 100] [--repeat 20]
+"""
+
+import argparse
+import pickle
+
+from app.utils.data.data_helpers import fingerprint_data
+from app.utils.data.template_engine import render_template, slice_render_context, get_template_dependencies
+from app.utils.data.template_dependencies import format_dependencies
+from benchmarks.bench_layered_context import print_header, measure, SPARSE_TEMPLATE, ITERATING_TEMPLATE
+from benchmarks.synthetic import scaled_example_context, load_example_property_set, serialized_size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=100, help="Scale factor for the example context")
+    parser.add_argument("--repeat", type=int, default=20, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    device_context = scaled_example_context(args.scale)
+    property_set = load_example_property_set()
+
+    print_header("CONTEXT SLICING")
+    print(f"Device context: {serialized_size(device_context) / 1024:.1f} KiB ({args.scale}x example context)")
+    print(f"Iterations: {args.repeat}")
+
+    for name, template in (("sparse", SPARSE_TEMPLATE), ("iterating", ITERATING_TEMPLATE)):
+        sliced_context, sliced_properties = slice_render_context(template, device_context, property_set)
+        print(f"\nTemplate: {name}")
+        print(f"Dependencies: {', '.join(format_dependencies(get_template_dependencies(template)))}\n")
+
+        full_job = pickle.dumps((template, device_context, property_set), pickle.HIGHEST_PROTOCOL)
+        sliced_job = pickle.dumps((template, sliced_context, sliced_properties), pickle.HIGHEST_PROTOCOL)
+        full_json = serialized_size(device_context) + serialized_size(property_set)
+        sliced_json = serialized_size(sliced_context) + serialized_size(sliced_properties)
+
+        print(f"{'Bytes moved':<36}{'Off (KiB)':>14}{'On (KiB)':>14}{'Ratio':>10}")
+        print("-" * 74)
+        print(f"{'pickled worker job':<36}{len(full_job) / 1024:>14.1f}{len(sliced_job) / 1024:>14.1f}"
+              f"{len(full_job) / len(sliced_job):>9.1f}x")
+        print(f"{'fingerprinted JSON':<36}{full_json / 1024:>14.1f}{sliced_json / 1024:>14.1f}"
+              f"{full_json / sliced_json:>9.1f}x")
+
+        cases = [
+            ("render: slicing off", lambda: render_template(template, device_context, property_set, slice_context=False)),
+            ("render: slicing on", lambda: render_template(template, device_context, property_set, slice_context=True)),
+            ("slice only", lambda: slice_render_context(template, device_context, property_set)),
+            ("fingerprint: full context", lambda: fingerprint_data(device_context)),
+            ("fingerprint: sliced context", lambda: fingerprint_data(sliced_context)),
+            ("worker job: unpickle full", lambda: pickle.loads(full_job)),
+            ("worker job: unpickle sliced", lambda: pickle.loads(sliced_job)),
+        ]
+
+        print(f"\n{'Case':<36}{'Mean (ms)':>14}{'Peak alloc (KiB)':>20}")
+        print("-" * 70)
+        for case, func in cases:
+            elapsed, peak = measure(func, args.repeat)
+            print(f"{case:<36}{elapsed * 1000:>14.3f}{peak / 1024:>20.1f}")
+
+        # Slicing must not change the output
+        assert render_template(template, device_context, property_set, slice_context=True) == \
+            render_template(template, device_context, property_set, slice_context=False), \
+            f"Sliced render of the {name} template differs"
+
+if __name__ == "__main__":
+    main()
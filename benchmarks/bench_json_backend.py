@@ -0,0 +1,55 @@
+#!/usr/bin/env python3
+"""
+Benchmark the JSON backend against the standard library json module.
+
+Parses and serializes the example device context scaled up to a multi-MB
+config-context, the way context loading, Apstra responses and the JSON
+viewer use it.
+
+Usage:
+    python -m benchmarks.bench_json_backend [--scale 1000] [--repeat 10]
+"""
+
+import argparse
+import json
+
+from app.utils.data import json_backend
+from benchmarks.bench_layered_context import print_header, measure
+from benchmarks.synthetic import scaled_example_context
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1000, help="Scale factor for the example context")
+    parser.add_argument("--repeat", type=int, default=10, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    device_context = scaled_example_context(args.scale)
+    document = json.dumps(device_context)
+    raw = document.encode("utf-8")
+
+    print_header("JSON BACKEND VS STANDARD LIBRARY")
+    print(f"Backend: {json_backend.JSON_BACKEND}")
+    print(f"Document: {len(raw) / (1024 * 1024):.1f} MiB ({args.scale}x example context)")
+    print(f"Iterations: {args.repeat}\n")
+
+    cases = [
+        ("loads str: json", lambda: json.loads(document)),
+        ("loads str: json_backend", lambda: json_backend.loads(document)),
+        ("loads bytes: json", lambda: json.loads(raw)),
+        ("loads bytes: json_backend", lambda: json_backend.loads(raw)),
+        ("dumps: json", lambda: json.dumps(device_context)),
+        ("dumps: json_backend", lambda: json_backend.dumps(device_context)),
+    ]
+
+    print(f"{'Case':<36}{'Mean (ms)':>14}{'Peak alloc (KiB)':>20}")
+    print("-" * 70)
+    for name, func in cases:
+        elapsed, peak = measure(func, args.repeat)
+        print(f"{name:<36}{elapsed * 1000:>14.3f}{peak / 1024:>20.1f}")
+
+    # Both backends must agree
+    assert json_backend.loads(raw) == json.loads(document), "JSON backend parse differs from json"
+    assert json.loads(json_backend.dumps(device_context)) == device_context, "JSON backend output differs"
+
+if __name__ == "__main__":
+    main()
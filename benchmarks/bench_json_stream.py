@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Benchmark streaming JSON ingestion of large config-context uploads.
+
+Writes the example device context scaled to tens of MB to a temporary file
+and loads it the way uploads used to be read (whole file, decoded string,
+json.loads) and with the streaming parser, reporting parse progress, time
+and peak memory allocated while loading.
+
+Usage:
+    python -m benchmarks.bench_json_stream [--scale 3000] [--chunk-size 1048576]
+"""
+
+import argparse
+import json
+import os
+import tempfile
+import time
+import tracemalloc
+
+from app.utils.data.data_helpers import load_json_file
+from app.utils.data.json_stream import load_json_stream, DEFAULT_CHUNK_SIZE
+from benchmarks.bench_layered_context import print_header
+from benchmarks.synthetic import scaled_example_context
+
+def load_whole_file(path):
+    """Load the file the way uploads were read before streaming."""
+    with open(path, "rb") as file:
+        return load_json_file(file.read().decode("utf-8"))
+
+def load_streaming(path, chunk_size, progress=None):
+    """Load the file with the streaming parser."""
+    with open(path, "rb") as file:
+        return load_json_stream(file, progress=progress, total_bytes=os.path.getsize(path), chunk_size=chunk_size)
+
+def measure_peak(func):
+    """Return (result, seconds, peak bytes allocated) for func()."""
+    # Time without tracemalloc, which slows down allocation-heavy code unevenly
+    start = time.perf_counter()
+    result = func()
+    elapsed = time.perf_counter() - start
+    del result
+
+    tracemalloc.start()
+    result = func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=3000, help="Scale factor for the example context")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE, help="Bytes read per chunk")
+    args = parser.parse_args()
+
+    device_context = scaled_example_context(args.scale)
+    with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False, encoding="utf-8") as file:
+        json.dump(device_context, file, indent=2)
+        path = file.name
+
+    try:
+        size = os.path.getsize(path)
+        print_header("STREAMING JSON INGESTION")
+        print(f"Document: {size / (1024 * 1024):.1f} MiB ({args.scale}x example context)")
+        print(f"Chunk size: {args.chunk_size / 1024:.0f} KiB\n")
+
+        # Progress as reported to the upload progress bar
+        reported = []
+        def progress(bytes_read, total_bytes):
+            percent = int(bytes_read * 100 / total_bytes)
+            if not reported or percent >= reported[-1] + 25 or bytes_read == total_bytes:
+                reported.append(percent)
+                print(f"  progress: {percent:3d}% ({bytes_read / (1024 * 1024):.1f} MiB)")
+        load_streaming(path, args.chunk_size, progress)
+        print()
+
+        cases = [
+            ("read + decode + json.loads", lambda: load_whole_file(path)),
+            ("streaming parser", lambda: load_streaming(path, args.chunk_size)),
+        ]
+
+        print(f"{'Case':<36}{'Time (ms)':>14}{'Peak alloc (MiB)':>20}")
+        print("-" * 70)
+        results = []
+        for name, func in cases:
+            (data, error), elapsed, peak = measure_peak(func)
+            assert error is None, error
+            results.append(data)
+            print(f"{name:<36}{elapsed * 1000:>14.1f}{peak / (1024 * 1024):>20.1f}")
+
+        assert results[0] == results[1] == device_context, "Streaming parse differs from json.loads"
+    finally:
+        os.remove(path)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Benchmark the JSON viewer against passing the whole document to st.json.
+
+For the example device context scaled up, reports per rerun the bytes
+handed to st.json and the time spent on the depth controls and on
+serialization, with the whole document and with the visible part only, at
+several expansion depths. The container depths the viewer uses are
+computed once per loaded document; that one-off cost is reported as well.
+
+Usage:
+    python -m benchmarks.bench_json_viewer [--scale 1000] [--repeat 5]
+"""
+
+import argparse
+
+from app.utils.data import json_backend
+from app.utils.data.json_tree import container_depths, display_depth, visible_tree
+from app.utils.ui.json_display_controls import calculate_max_depth
+from benchmarks.bench_layered_context import print_header, measure
+from benchmarks.synthetic import scaled_example_context, serialized_size
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=1000, help="Scale factor for the example context")
+    parser.add_argument("--repeat", type=int, default=5, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    device_context = scaled_example_context(args.scale)
+    depths = container_depths(device_context)
+
+    print_header("JSON VIEWER")
+    print(f"Device context: {serialized_size(device_context) / 1024:.1f} KiB ({args.scale}x example context)")
+    print(f"Iterations: {args.repeat}\n")
+
+    print(f"{'Once per loaded document':<40}{'Mean (ms)':>14}")
+    print("-" * 54)
+    print(f"{'container depths':<40}{measure(lambda: container_depths(device_context), args.repeat)[0] * 1000:>14.2f}")
+
+    print(f"\n{'Depth controls per rerun':<40}{'Mean (ms)':>14}")
+    print("-" * 54)
+    print(f"{'calculate_max_depth (before)':<40}"
+          f"{measure(lambda: calculate_max_depth(device_context), args.repeat)[0] * 1000:>14.2f}")
+    print(f"{'precomputed depths (after)':<40}"
+          f"{measure(lambda: display_depth(depths, device_context), args.repeat)[0] * 1000:>14.4f}")
+
+    whole = json_backend.dumps(device_context)
+    whole_time, _ = measure(lambda: json_backend.dumps(device_context), args.repeat)
+    print(f"\n{'Sent to st.json per rerun':<24}{'Whole (KiB)':>14}{'Visible (KiB)':>16}"
+          f"{'Whole (ms)':>12}{'Visible (ms)':>14}")
+    print("-" * 80)
+    for depth in (1, 2, 3, display_depth(depths, device_context)):
+        visible = json_backend.dumps(visible_tree(device_context, depth))
+        visible_time, _ = measure(lambda: json_backend.dumps(visible_tree(device_context, depth)), args.repeat)
+        print(f"{f'depth {depth}':<24}{len(whole) / 1024:>14.1f}{len(visible) / 1024:>16.1f}"
+              f"{whole_time * 1000:>12.2f}{visible_time * 1000:>14.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Benchmark LayeredContext against deep_merge for building the render context.
+
+Compares the time and memory needed to merge a property set into the example
+device context scaled up 100x, and the end-to-end render of a template that
+reads only a handful of keys.
+
+Usage:
+    python -m benchmarks.bench_layered_context [--scale 100] [--repeat 20]
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from app.utils.data.data_helpers import deep_merge, LayeredContext
+from app.utils.data.template_engine import get_compiled_template, new_render_context
+from benchmarks.synthetic import scaled_example_context, load_example_property_set, serialized_size
+
+# Typical configlet: reads a handful of keys from a large context
+SPARSE_TEMPLATE = """hostname {{ hostname }}
+interface et-0/0/1 mtu {{ interface['IF-et-0/0/1'].mtu }}
+"""
+
+# Worst case for the layered view: iterates a collection merged from both layers
+ITERATING_TEMPLATE = """{% for name, data in interface.items() %}
+interface {{ name }} mtu {{ data.mtu | default(1500) }}
+{% endfor %}
+"""
+
+def print_header(text):
+    """Print a formatted header."""
+    line = "=" * 70
+    print("\n" + line)
+    print(f"{text:^70}")
+    print(line + "\n")
+
+def measure(func, repeat):
+    """Return (mean seconds, peak bytes allocated) for func()."""
+    start = time.perf_counter()
+    for _ in range(repeat):
+        func()
+    elapsed = (time.perf_counter() - start) / repeat
+
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed, peak
+
+def render_with_deep_merge(template, device_context, property_set):
+    """Render the way render_template did before LayeredContext."""
+    return template.render(**deep_merge(device_context.copy(), property_set))
+
+def render_with_layered_context(template, device_context, property_set):
+    """Render the way render_template does now."""
+    context = new_render_context(template, device_context, property_set)
+    return template.environment.concat(template.root_render_func(context))
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=100, help="Scale factor for the example context")
+    parser.add_argument("--repeat", type=int, default=20, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    device_context = scaled_example_context(args.scale)
+    # Override one interface so the nested merge path is exercised
+    property_set = load_example_property_set()
+    property_set["interface"] = {"IF-et-0/0/1": {"mtu": 9216}}
+
+    print_header("LAYERED CONTEXT VS DEEP MERGE")
+    print(f"Context scale: {args.scale}x ({serialized_size(device_context) / 1024:.0f} KiB as JSON)")
+    print(f"Iterations: {args.repeat}\n")
+
+    sparse = get_compiled_template(SPARSE_TEMPLATE)
+    iterating = get_compiled_template(ITERATING_TEMPLATE)
+    cases = [
+        ("merge: deep_merge", lambda: deep_merge(device_context.copy(), property_set)),
+        ("merge: LayeredContext", lambda: LayeredContext(property_set, device_context)),
+        ("sparse render: deep_merge", lambda: render_with_deep_merge(sparse, device_context, property_set)),
+        ("sparse render: LayeredContext", lambda: render_with_layered_context(sparse, device_context, property_set)),
+        ("iterating render: deep_merge", lambda: render_with_deep_merge(iterating, device_context, property_set)),
+        ("iterating render: LayeredContext", lambda: render_with_layered_context(iterating, device_context, property_set)),
+    ]
+
+    print(f"{'Case':<36}{'Mean (ms)':>14}{'Peak alloc (KiB)':>20}")
+    print("-" * 70)
+    for name, func in cases:
+        elapsed, peak = measure(func, args.repeat)
+        print(f"{name:<36}{elapsed * 1000:>14.3f}{peak / 1024:>20.1f}")
+
+    # Both paths must produce the same output
+    for template in (sparse, iterating):
+        expected = render_with_deep_merge(template, device_context, property_set)
+        actual = render_with_layered_context(template, device_context, property_set)
+        assert actual == expected, "LayeredContext output differs from deep_merge"
+
+if __name__ == "__main__":
+    main()
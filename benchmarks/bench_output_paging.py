@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark streaming and paged display of a large rendered output.
+
+Renders a full-device style template over the example device context
+scaled up until the output is well over 100k lines, then reports how
+long the first page takes to appear compared to the whole render, what
+finding the page boundaries and slicing a page costs, and how many bytes
+the output panel sends to the browser per rerun with and without paging.
+
+Usage:
+    python -m benchmarks.bench_output_paging [--scale 5000] [--repeat 5]
+"""
+
+import argparse
+import time
+
+from app.utils.data.output_pages import DEFAULT_PAGE_LINES, page_offsets, get_page, count_lines, first_page
+from app.utils.data.template_engine import render_template
+from benchmarks.bench_layered_context import print_header, measure
+from benchmarks.synthetic import scaled_example_context
+
+# Renders a block of lines per interface, like a full interface config
+FULL_CONFIG_TEMPLATE = """hostname {{ hostname }}
+{% for name, data in interface.items() %}
+interfaces {
+    {{ name }} {
+        description "{{ data.description | default('unused') }}";
+        mtu {{ data.mtu | default(1500) }};
+        unit 0 {
+            family ethernet-switching;
+        }
+    }
+}
+{% endfor %}
+"""
+
+def time_to_first_page(device_context):
+    """Return the seconds until the first page of output has been rendered."""
+    start = time.perf_counter()
+    chunks = []
+    first = []
+
+    def on_chunk(batch):
+        chunks.extend(batch)
+        if not first and sum(chunk.count("\n") for chunk in chunks) >= DEFAULT_PAGE_LINES:
+            first.append(time.perf_counter() - start)
+
+    render_template(FULL_CONFIG_TEMPLATE, device_context, on_chunk=on_chunk, max_output=0)
+    return first[0] if first else time.perf_counter() - start
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=5000, help="Scale factor for the example context")
+    parser.add_argument("--repeat", type=int, default=5, help="Iterations per measurement")
+    args = parser.parse_args()
+
+    device_context = scaled_example_context(args.scale)
+    chunks = []
+    output, error = render_template(FULL_CONFIG_TEMPLATE, device_context, max_output=0, on_chunk=chunks.extend)
+    if error:
+        raise SystemExit(error)
+    offsets = page_offsets(output)
+
+    print_header("STREAMED AND PAGED OUTPUT")
+    print(f"Output: {count_lines(output):,} lines, {len(output) / 1024:.1f} KiB ({args.scale}x example context)")
+    print(f"Pages: {len(offsets) - 1} of {DEFAULT_PAGE_LINES} lines")
+    print(f"Iterations: {args.repeat}\n")
+
+    print(f"{'Operation':<40}{'Mean (ms)':>14}")
+    print("-" * 54)
+    full_render, _ = measure(lambda: render_template(FULL_CONFIG_TEMPLATE, device_context, max_output=0), args.repeat)
+    first_page_time = min(time_to_first_page(device_context) for _ in range(args.repeat))
+    cases = [
+        ("render: whole output", full_render),
+        ("render: first page streamed", first_page_time),
+        ("find page boundaries (once per output)", measure(lambda: page_offsets(output), args.repeat)[0]),
+        ("slice one page (per rerun)", measure(lambda: get_page(output, offsets, len(offsets) // 2), args.repeat)[0]),
+        ("first page of streamed chunks", measure(lambda: first_page(chunks), args.repeat)[0]),
+    ]
+    for name, seconds in cases:
+        print(f"{name:<40}{seconds * 1000:>14.2f}")
+
+    page = get_page(output, offsets, 0)
+    print(f"\n{'Bytes sent to the browser per rerun':<40}{'KiB':>14}")
+    print("-" * 54)
+    print(f"{'whole output in st.code':<40}{len(output.encode()) / 1024:>14.1f}")
+    print(f"{'one page in st.code':<40}{len(page.encode()) / 1024:>14.1f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Measure script execution time per interaction with and without fragments.
+
+Drives the app headlessly with Streamlit's AppTest, loads the example device
+context scaled up, and performs typical interactions: typing a context
+search, expanding the context viewer and editing the template. The app
+records the execution time of every page section with each run.
+
+Without fragments an interaction reruns the whole script, so its cost is
+the full run. With fragments only the section holding the widget reruns,
+so its cost is that section's time within the same run. AppTest always
+performs full runs, which is why both numbers are taken from one run.
+
+Usage:
+    python -m benchmarks.bench_section_reruns [--scale 100] [--repeat 5]
+"""
+
+import argparse
+import os
+import statistics
+
+from streamlit.testing.v1 import AppTest
+
+from benchmarks.bench_layered_context import print_header, ITERATING_TEMPLATE
+from benchmarks.synthetic import scaled_example_context, serialized_size
+
+# The app script, resolved from the repository root
+APP_SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "app", "main.py")
+
+def start_app(device_context):
+    """Run the app once with a device context loaded."""
+    app = AppTest.from_file(APP_SCRIPT, default_timeout=120)
+    app.session_state["device_context_data"] = device_context
+    app.session_state["context_loaded"] = True
+    app.session_state["template_input"] = ITERATING_TEMPLATE
+    app.run()
+    return app
+
+def last_run(app):
+    """Return the timings of the last run recorded by the app."""
+    return app.session_state["run_timings"][-1]
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scale", type=int, default=100, help="Scale factor for the example context")
+    parser.add_argument("--repeat", type=int, default=5, help="Iterations per interaction")
+    args = parser.parse_args()
+
+    device_context = scaled_example_context(args.scale)
+    app = start_app(device_context)
+    if app.exception:
+        raise SystemExit(f"App raised: {app.exception[0].message}")
+
+    # Each interaction and the section it reruns with fragments
+    interactions = [
+        ("search device context", "context",
+         lambda i: app.text_input(key="context_search").input(f"mtu{i % 2 or ''}").run()),
+        ("expand/collapse context viewer", "context",
+         lambda i: app.button(key="context_expand" if i % 2 else "context_collapse").click().run()),
+        ("edit template", "template",
+         lambda i: app.session_state.__setitem__("template_input", ITERATING_TEMPLATE + "#" * (i + 1)) or app.run()),
+    ]
+
+    print_header("SCRIPT EXECUTION TIME PER INTERACTION")
+    print(f"Device context: {serialized_size(device_context) / 1024:.1f} KiB ({args.scale}x example context)")
+    print(f"Iterations: {args.repeat}\n")
+
+    print(f"{'Interaction':<34}{'Whole app (ms)':>16}{'Fragment (ms)':>16}{'Saved':>8}")
+    print("-" * 74)
+    for name, section, interact in interactions:
+        whole, fragment = [], []
+        for i in range(args.repeat):
+            interact(i)
+            run = last_run(app)
+            whole.append(run["seconds"])
+            fragment.append(run["sections"][section])
+        whole_ms = statistics.median(whole) * 1000
+        fragment_ms = statistics.median(fragment) * 1000
+        print(f"{name:<34}{whole_ms:>16.2f}{fragment_ms:>16.2f}{1 - fragment_ms / whole_ms:>8.0%}")
+
+    print("\nSection times of the last run (ms):")
+    for section, seconds in last_run(app)["sections"].items():
+        print(f"  {section:<20}{seconds * 1000:>10.2f}")
+
+if __name__ == "__main__":
+    main()
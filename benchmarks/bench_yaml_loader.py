@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Benchmark the libyaml-backed YAML loader on a large property set.
+
+Generates a property set with the given number of VLAN and VRF entries and
+compares parse throughput of the pure-Python SafeLoader with the CSafeLoader
+that data_helpers uses when available. Emit throughput of SafeDumper and
+CSafeDumper is measured alongside for reference.
+
+Usage:
+    python -m benchmarks.bench_yaml_loader [--keys 10000] [--repeat 3]
+"""
+
+import argparse
+import time
+
+import yaml
+
+from app.utils.data.data_helpers import YAML_BACKEND
+from benchmarks.bench_layered_context import print_header
+
+def generate_property_set(keys):
+    """
+    Generate a property set with roughly the given number of keys.
+
+    Args:
+        keys (int): Number of VLAN and VRF entries
+
+    Returns:
+        dict: Property set with "vlans" and "vrfs" sections
+    """
+    vlans = {
+        f"vlan_{i}": {"id": 100 + i, "name": f"tenant-{i}", "vni": 10000 + i, "mtu": 9216, "enabled": i % 2 == 0}
+        for i in range(keys // 2)
+    }
+    vrfs = {
+        f"vrf_{i}": {"rd": f"65000:{i}", "route_targets": [f"65000:{i}", f"65001:{i}"], "l3vni": 50000 + i}
+        for i in range(keys - keys // 2)
+    }
+    return {"vlans": vlans, "vrfs": vrfs}
+
+def measure(func, repeat):
+    """Return the best time in seconds of func() over repeat runs."""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--keys", type=int, default=10000, help="Number of VLAN/VRF entries")
+    parser.add_argument("--repeat", type=int, default=3, help="Iterations per measurement (best is reported)")
+    args = parser.parse_args()
+
+    property_set = generate_property_set(args.keys)
+    content = yaml.dump(property_set, Dumper=yaml.SafeDumper, sort_keys=False, default_flow_style=False)
+    size_mib = len(content.encode("utf-8")) / (1024 * 1024)
+
+    print_header("YAML LOADER: LIBYAML VS PURE PYTHON")
+    print(f"data_helpers backend: {YAML_BACKEND}")
+    print(f"Property set: {args.keys} entries, {size_mib:.2f} MiB of YAML\n")
+
+    cases = [("load: SafeLoader", lambda: yaml.load(content, Loader=yaml.SafeLoader)),
+             ("dump: SafeDumper", lambda: yaml.dump(property_set, Dumper=yaml.SafeDumper, sort_keys=False))]
+    if yaml.__with_libyaml__:
+        cases.insert(1, ("load: CSafeLoader", lambda: yaml.load(content, Loader=yaml.CSafeLoader)))
+        cases.append(("dump: CSafeDumper", lambda: yaml.dump(property_set, Dumper=yaml.CSafeDumper, sort_keys=False)))
+    else:
+        print("PyYAML was built without libyaml; only the pure-Python path is measured.\n")
+
+    print(f"{'Case':<36}{'Time (ms)':>14}{'Throughput (MiB/s)':>20}")
+    print("-" * 70)
+    for name, func in cases:
+        elapsed = measure(func, args.repeat)
+        print(f"{name:<36}{elapsed * 1000:>14.1f}{size_mib / elapsed:>20.2f}")
+
+    if yaml.__with_libyaml__:
+        assert yaml.load(content, Loader=yaml.CSafeLoader) == property_set, "CSafeLoader output differs"
+
+if __name__ == "__main__":
+    main()
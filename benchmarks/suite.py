@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite for the render pipeline, with baselines and regression checks.
+
+Times render_template (cold and warm), deep_merge, filter_json,
+calculate_max_depth, load_json_file and load_yaml_content on the example
+device context scaled 1x, 10x, 100x and 1000x. Every case runs until it
+has at least --min-time seconds of samples (and at most --repeat runs), and
+its fastest run is compared with the baseline's, as the estimate least
+affected by other load on the machine: a case slower than the baseline by
+more than --threshold fails the run with exit status 1.
+
+Results are written as JSON so they can be saved as the next baseline,
+kept as CI artifacts or compared across machines. Baselines are machine
+specific; record one on the machine that runs the comparison.
+
+Usage:
+    python -m benchmarks.suite --save                     # record benchmarks/baseline.json
+    python -m benchmarks.suite [--threshold 0.25]         # compare against it
+    python -m benchmarks.suite --scales 1 10 --cases render_template_warm deep_merge
+                               [--baseline path.json] [--output results.json]
+"""
+
+import argparse
+import datetime
+import gc
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from pathlib import Path
+
+import yaml
+
+from app.utils.data import json_backend
+from app.utils.data.data_helpers import (
+    YAML_BACKEND,
+    deep_merge,
+    filter_json,
+    load_json_file,
+    load_yaml_content,
+)
+from app.utils.data.template_engine import clear_template_cache, render_template
+from app.utils.ui.json_display_controls import calculate_max_depth
+from benchmarks.bench_layered_context import print_header
+from benchmarks.synthetic import load_example_property_set, scaled_example_context, serialized_size
+
+# Baseline compared against when --baseline isn't given
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+# Allowed slowdown over the baseline before a case fails (0.25 = 25%)
+DEFAULT_THRESHOLD = float(os.environ.get("CONFIGLET_BENCH_THRESHOLD", 0.25))
+
+# Slowdowns smaller than this many seconds are timer noise, whatever the ratio
+ABSOLUTE_TOLERANCE = 0.0002
+
+DEFAULT_SCALES = (1, 10, 100, 1000)
+
+# Version of the results format, bumped when cases change incompatibly
+RESULTS_VERSION = 1
+
+# Configlet that iterates the largest collection, so render time follows the scale
+TEMPLATE = """hostname {{ hostname }}
+{% for name, data in interface.items() %}
+interface {{ data.intfName }}
+    description "{{ data.description }}"
+    mtu {{ data.mtu | default(1500) }}
+{% endfor %}
+{% for name, session in bgp_sessions.items() %}
+bgp neighbor {{ name }}
+{% endfor %}
+"""
+
+FILTER_QUERY = "et-0/0/1"
+
+def build_cases(scale):
+    """
+    Build the benchmark cases for one scale of the example device context.
+
+    Args:
+        scale (int): Scale factor of the example device context
+
+    Returns:
+        tuple: (cases, size) where cases maps case names to zero-argument
+               callables and size is the serialized context size in bytes
+    """
+    device_context = scaled_example_context(scale)
+    # Override a value of every interface, so merging recurses into the context
+    property_set = dict(load_example_property_set(), interface={
+        name: {"mtu": 9216} for name in device_context["interface"]
+    })
+    json_content = json_backend.dumps(device_context)
+    yaml_content = yaml.dump(device_context, Dumper=yaml.SafeDumper, sort_keys=False, default_flow_style=False)
+
+    def render_cold():
+        # Drop the compiled template so compilation and analysis are timed too
+        clear_template_cache()
+        return render_template(TEMPLATE, device_context, property_set)
+
+    cases = {
+        "render_template_cold": render_cold,
+        "render_template_warm": lambda: render_template(TEMPLATE, device_context, property_set),
+        "deep_merge": lambda: deep_merge(device_context, property_set),
+        "filter_json": lambda: filter_json(device_context, FILTER_QUERY),
+        "calculate_max_depth": lambda: calculate_max_depth(device_context),
+        "load_json_file": lambda: load_json_file(json_content),
+        "load_yaml_content": lambda: load_yaml_content(yaml_content),
+    }
+    return cases, serialized_size(device_context)
+
+CASE_NAMES = tuple(build_cases(1)[0])
+
+def time_case(func, min_time, max_repeat):
+    """
+    Time a case at least once, until min_time seconds of samples or max_repeat runs are collected.
+
+    Args:
+        func (callable): The case
+        min_time (float): Minimum total seconds of samples
+        max_repeat (int): Maximum number of timed runs
+
+    Returns:
+        dict: median, min and max seconds per run, and the number of runs
+    """
+    # Warm up imports, caches and the allocator outside the samples
+    func()
+    samples = []
+    # Like timeit, keep collector pauses triggered by earlier cases out of the samples
+    gc.collect()
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        while not samples or (len(samples) < max_repeat and sum(samples) < min_time):
+            start = time.perf_counter()
+            func()
+            samples.append(time.perf_counter() - start)
+    finally:
+        if gc_enabled:
+            gc.enable()
+    return {
+        "median": statistics.median(samples),
+        "min": min(samples),
+        "max": max(samples),
+        "runs": len(samples),
+    }
+
+def run_suite(scales=DEFAULT_SCALES, cases=None, min_time=0.5, max_repeat=50, progress=None):
+    """
+    Run the benchmark cases at every scale.
+
+    Args:
+        scales (iterable): Scale factors of the example device context
+        cases (iterable, optional): Names of the cases to run (defaults to all)
+        min_time (float): Minimum seconds of samples per case
+        max_repeat (int): Maximum timed runs per case
+        progress (callable, optional): Called with each result as it is measured
+
+    Returns:
+        dict: Results document with "version", "created", "environment" and
+              "results", a list of dicts with case, scale, size and the timings
+    """
+    selected = list(cases or CASE_NAMES)
+    results = []
+    for scale in scales:
+        scale_cases, size = build_cases(scale)
+        for name in selected:
+            result = {"case": name, "scale": scale, "size": size,
+                      **time_case(scale_cases[name], min_time, max_repeat)}
+            results.append(result)
+            if progress:
+                progress(result)
+    return {
+        "version": RESULTS_VERSION,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "environment": environment(),
+        "results": results,
+    }
+
+def environment():
+    """Describe the machine and libraries the results were measured with."""
+    return {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+        "json_backend": json_backend.JSON_BACKEND,
+        "yaml_backend": YAML_BACKEND,
+    }
+
+def compare_results(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """
+    Compare results with a baseline, case by case.
+
+    A case regresses when its fastest run is more than threshold slower than
+    the baseline's and slower by more than ABSOLUTE_TOLERANCE seconds. Cases
+    missing from the baseline are reported with no baseline.
+
+    Args:
+        results (dict): Results document from run_suite()
+        baseline (dict): Results document to compare against
+        threshold (float): Allowed relative slowdown (0.25 = 25%)
+
+    Returns:
+        list: One dict per result with case, scale, min, baseline (or None),
+              ratio (or None) and regressed
+    """
+    baseline_times = {
+        (result["case"], result["scale"]): result["min"] for result in baseline.get("results", [])
+    }
+    comparisons = []
+    for result in results["results"]:
+        reference = baseline_times.get((result["case"], result["scale"]))
+        ratio = result["min"] / reference if reference else None
+        regressed = (
+            reference is not None
+            and result["min"] > reference * (1 + threshold)
+            and result["min"] - reference > ABSOLUTE_TOLERANCE
+        )
+        comparisons.append({
+            "case": result["case"],
+            "scale": result["scale"],
+            "min": result["min"],
+            "baseline": reference,
+            "ratio": ratio,
+            "regressed": regressed,
+        })
+    return comparisons
+
+def load_results(path):
+    """
+    Load a results document.
+
+    Args:
+        path (str or Path): JSON file written by this suite
+
+    Returns:
+        tuple: (results, error) where results is the document or None if error occurred,
+               and error is an error message or None if successful
+    """
+    try:
+        results = json.loads(Path(path).read_text(encoding="utf-8"))
+    except (OSError, ValueError) as e:
+        return None, f"Error loading results: {e}"
+    if results.get("version") != RESULTS_VERSION:
+        return None, f"Unsupported results version {results.get('version')} (expected {RESULTS_VERSION})"
+    return results, None
+
+def save_results(results, path):
+    """Write a results document as indented JSON."""
+    Path(path).write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+
+def format_comparison(comparison):
+    """Format one compared case as a table row."""
+    name = f"{comparison['case']} @ {comparison['scale']}x"
+    row = f"{name:<36}{comparison['min'] * 1000:>12.3f}"
+    if comparison["baseline"] is None:
+        return row + f"{'-':>12}{'-':>9}  new"
+    status = "REGRESSED" if comparison["regressed"] else "ok"
+    return row + f"{comparison['baseline'] * 1000:>12.3f}{comparison['ratio']:>8.2f}x  {status}"
+
+def parse_args(argv=None):
+    """Parse the command line arguments."""
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--scales", type=int, nargs="+", default=list(DEFAULT_SCALES),
+                        help="Scale factors of the example device context")
+    parser.add_argument("--cases", nargs="+", choices=CASE_NAMES, help="Cases to run (defaults to all)")
+    parser.add_argument("--baseline", default=str(DEFAULT_BASELINE), help="Baseline results to compare against")
+    parser.add_argument("--save", action="store_true", help="Write the results to --baseline instead of comparing")
+    parser.add_argument("--output", help="Also write the results to this JSON file")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Allowed slowdown over the baseline, as a fraction")
+    parser.add_argument("--min-time", type=float, default=0.5, help="Minimum seconds of samples per case")
+    parser.add_argument("--repeat", type=int, default=50, help="Maximum timed runs per case")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """
+    Run the suite and compare it with the baseline.
+
+    Args:
+        argv (list, optional): Command line arguments (defaults to sys.argv[1:])
+
+    Returns:
+        int: Exit status, 1 if a case regressed or the baseline can't be read, 0 otherwise
+    """
+    args = parse_args(argv)
+
+    baseline = None
+    if not args.save and os.path.exists(args.baseline):
+        baseline, error = load_results(args.baseline)
+        if error:
+            print(error, file=sys.stderr)
+            return 1
+
+    print_header("RENDER PIPELINE BENCHMARKS")
+    print(f"Baseline: {args.baseline if baseline else 'none'}, threshold {args.threshold:.0%}\n")
+    print(f"{'Case':<36}{'Min (ms)':>12}{'Base (ms)':>12}{'Ratio':>9}")
+    print("-" * 80)
+
+    def progress(result):
+        comparison = compare_results({"results": [result]}, baseline or {}, args.threshold)[0]
+        print(format_comparison(comparison), flush=True)
+
+    results = run_suite(args.scales, args.cases, args.min_time, args.repeat, progress)
+
+    if args.output:
+        save_results(results, args.output)
+    if args.save:
+        save_results(results, args.baseline)
+        print(f"\nBaseline written to {args.baseline}")
+        return 0
+    if baseline is None:
+        print(f"\nNo baseline at {args.baseline}; run with --save to record one")
+        return 0
+
+    regressions = [comparison for comparison in compare_results(results, baseline, args.threshold)
+                   if comparison["regressed"]]
+    print(f"\n{len(regressions)} of {len(results['results'])} cases regressed by more than {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,53 @@
+"""
+Synthetic data for benchmarks, scaled from the bundled example data.
+"""
+
+import json
+
+from app.utils.config.example_data import EXAMPLE_DEVICE_CONTEXT, EXAMPLE_PROPERTY_SET
+
+def load_example_context():
+    """Return a freshly parsed copy of the example device context."""
+    return json.loads(EXAMPLE_DEVICE_CONTEXT)
+
+def load_example_property_set():
+    """Return a freshly parsed copy of the example property set."""
+    return json.loads(EXAMPLE_PROPERTY_SET)
+
+def scale_context(context, factor):
+    """
+    Scale a device context by replicating the entries of its collections.
+
+    Every top-level dictionary (interfaces, IPs, BGP sessions, ...) gets
+    factor copies of each entry under suffixed keys, and every top-level list
+    is repeated factor times, so the serialized size grows roughly linearly
+    with factor while the shape stays realistic.
+
+    Args:
+        context (dict): Device context to scale
+        factor (int): Scale factor (1 returns an unchanged copy)
+
+    Returns:
+        dict: The scaled device context
+    """
+    scaled = {}
+    for key, value in context.items():
+        if isinstance(value, dict) and value:
+            scaled[key] = {
+                (entry_key if copy == 0 else f"{entry_key}_{copy}"): json.loads(json.dumps(entry_value))
+                for copy in range(factor)
+                for entry_key, entry_value in value.items()
+            }
+        elif isinstance(value, list) and value:
+            scaled[key] = json.loads(json.dumps(value * factor))
+        else:
+            scaled[key] = json.loads(json.dumps(value))
+    return scaled
+
+def scaled_example_context(factor):
+    """Return the example device context scaled by factor."""
+    return scale_context(load_example_context(), factor)
+
+def serialized_size(data):
+    """Return the size of data serialized as compact JSON, in bytes."""
+    return len(json.dumps(data, separators=(",", ":")).encode("utf-8"))
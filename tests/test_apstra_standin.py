@@ -0,0 +1,66 @@
+"""
+Unit tests for the local Apstra stand-in server.
+
+These tests run the real apstra_client against the stand-in over HTTPS.
+"""
+
+import shutil
+import unittest
+import warnings
+
+from app.utils.api import apstra_client, async_apstra_client
+from app.utils.api.http_client import close_sessions
+from benchmarks.apstra_standin import ApstraStandIn, SyntheticFabric
+
+@unittest.skipUnless(shutil.which("openssl"), "openssl is required to create the stand-in's certificate")
+class TestApstraStandIn(unittest.TestCase):
+    """Test cases for the client layer against the stand-in."""
+
+    def setUp(self):
+        warnings.filterwarnings("ignore", message="Unverified HTTPS request")
+        self.server = ApstraStandIn(SyntheticFabric(blueprints=2, switches=4, property_sets=3, configlets=5)).start()
+        self.addCleanup(close_sessions)
+        self.addCleanup(self.server.stop)
+        self.base_url = self.server.base_url
+        self.token = apstra_client.get_login(self.base_url, "admin", "admin")["token"]
+
+    def test_listings(self):
+        """Test that blueprints, nodes, property sets and configlets are served in Apstra's shape."""
+        blueprints = apstra_client.get_all_blueprints(self.base_url, self.token)["items"]
+        nodes = apstra_client.get_blueprint_nodes(self.base_url, self.token, blueprints[1]["id"])["items"]
+
+        self.assertEqual([blueprint["label"] for blueprint in blueprints], ["dc0", "dc1"])
+        self.assertEqual(len(nodes), 4)
+        self.assertEqual(nodes[0]["switch_nodes"]["role"], "spine")
+        self.assertEqual(len(apstra_client.get_property_sets(self.base_url, self.token)["items"]), 3)
+        self.assertEqual(len(apstra_client.get_configlets(self.base_url, self.token)["items"]), 5)
+
+    def test_device_contexts(self):
+        """Test that every switch gets its own context, fetched concurrently."""
+        node_ids = ["bp-0-sw-0", "bp-0-sw-3"]
+
+        contexts = async_apstra_client.run(
+            async_apstra_client.get_device_contexts(self.base_url, self.token, "bp-0", node_ids)
+        )
+
+        self.assertEqual(contexts["bp-0-sw-3"]["hostname"], "dc0-leaf3")
+        self.assertIn("interface", contexts["bp-0-sw-0"])
+        self.assertEqual(self.server.requests["config-context"], 2)
+
+    def test_authentication_is_required(self):
+        """Test that requests without a token from the login endpoint are rejected."""
+        response = apstra_client.get_all_blueprints(self.base_url, "not-a-token")
+
+        self.assertEqual(response["status_code"], 401)
+
+    def test_error_injection(self):
+        """Test that injected errors are returned with the configured status."""
+        self.server.error_rate = 1.0
+        self.server.error_status = 429
+
+        response = apstra_client.get_property_sets(self.base_url, self.token)
+
+        self.assertEqual(response["status_code"], 429)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Unit tests for the asyncio Apstra client.
+"""
+
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from app.utils.api import async_apstra_client
+from app.utils.api.async_apstra_client import run, get_device_contexts, get_all_blueprints, set_host_concurrency
+
+class TestAsyncApstraClient(unittest.TestCase):
+    """Test cases for the asyncio Apstra client."""
+
+    def tearDown(self):
+        async_apstra_client._host_concurrency.clear()
+        async_apstra_client._semaphores.clear()
+
+    @patch('app.utils.api.apstra_client.get_device_context')
+    def test_device_contexts_bounded_per_host(self, mock_context):
+        """Test that concurrent context fetches respect the per-host limit."""
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+
+        def fetch(base_url, token, blueprint_id, node_id):
+            with lock:
+                in_flight.append(node_id)
+                peak.append(len(in_flight))
+            time.sleep(0.02)
+            with lock:
+                in_flight.remove(node_id)
+            return {"node_id": node_id}
+
+        mock_context.side_effect = fetch
+        set_host_concurrency("apstra", 3)
+        node_ids = [f"n{i}" for i in range(12)]
+
+        contexts = run(get_device_contexts("apstra", "token", "bp1", node_ids))
+
+        self.assertEqual(list(contexts), node_ids)
+        self.assertEqual(contexts["n5"], {"node_id": "n5"})
+        self.assertLessEqual(max(peak), 3)
+        self.assertGreater(max(peak), 1)
+
+    @patch('app.utils.api.apstra_client.get_device_context')
+    def test_limit_is_shared_by_concurrent_runs(self, mock_context):
+        """Test that sessions running their own event loops share the per-host limit."""
+        in_flight = []
+        peak = []
+        lock = threading.Lock()
+
+        def fetch(base_url, token, blueprint_id, node_id):
+            with lock:
+                in_flight.append(node_id)
+                peak.append(len(in_flight))
+            time.sleep(0.02)
+            with lock:
+                in_flight.remove(node_id)
+            return {"node_id": node_id}
+
+        mock_context.side_effect = fetch
+        set_host_concurrency("apstra", 2)
+        sessions = [
+            threading.Thread(target=run, args=(get_device_contexts("apstra", "token", "bp1", [f"s{s}n{i}" for i in range(4)]),))
+            for s in range(3)
+        ]
+
+        for session in sessions:
+            session.start()
+        for session in sessions:
+            session.join()
+
+        self.assertEqual(len(peak), 12)
+        self.assertLessEqual(max(peak), 2)
+
+    @patch('app.utils.api.apstra_client.get_device_context')
+    def test_error_convention_is_kept(self, mock_context):
+        """Test that failed fetches keep the {"error": ...} result convention."""
+        mock_context.side_effect = lambda base_url, token, blueprint_id, node_id: (
+            {"error": "HTTP Error: 404"} if node_id == "bad" else {"hostname": node_id}
+        )
+
+        contexts = run(get_device_contexts("apstra", "token", "bp1", ["good", "bad"]))
+
+        self.assertEqual(contexts["good"], {"hostname": "good"})
+        self.assertEqual(contexts["bad"], {"error": "HTTP Error: 404"})
+
+    @patch('app.utils.api.apstra_client.get_all_blueprints')
+    def test_listing_call(self, mock_blueprints):
+        """Test that listing coroutines return the synchronous client's response."""
+        mock_blueprints.return_value = {"items": [{"id": "bp1", "label": "DC1"}]}
+
+        response = run(get_all_blueprints("apstra", "token"))
+
+        self.assertEqual(response["items"][0]["id"], "bp1")
+        mock_blueprints.assert_called_once_with("apstra", "token")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+"""
+Unit tests for batch rendering and the render command line.
+"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from app.utils.data.batch_render import find_files, run_batch, merge_batch_profiles, output_path
+from app.render_cli import main
+
+class TestBatchRender(unittest.TestCase):
+    """Test cases for rendering templates against context files."""
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.root = self.directory.name
+        self.template = self.write("templates/hostname.j2", "hostname {{ hostname }} mtu {{ mtu }}\n")
+        self.contexts = [
+            self.write("contexts/leaf1.json", json.dumps({"hostname": "leaf1", "mtu": 1500})),
+            self.write("contexts/leaf2.json", json.dumps({"hostname": "leaf2", "mtu": 1500})),
+        ]
+        self.property_set = self.write("props/jumbo.yaml", "mtu: 9216\n")
+
+    def write(self, name, content):
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(content)
+        return path
+
+    def test_find_files(self):
+        """Test that directories are expanded to the files with matching suffixes."""
+        self.write("contexts/notes.txt", "ignored")
+
+        files = find_files([os.path.join(self.root, "contexts")], (".json",))
+
+        self.assertEqual([file.name for file in files], ["leaf1.json", "leaf2.json"])
+
+    def test_outputs_are_written(self):
+        """Test that every context is rendered and its output written."""
+        output_dir = os.path.join(self.root, "out")
+
+        results = list(run_batch([self.template], self.contexts, output_dir=output_dir, max_workers=1))
+
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(result["error"] is None for result in results))
+        with open(output_path(output_dir, "leaf2.json", "hostname.j2"), encoding="utf-8") as file:
+            self.assertEqual(file.read(), "hostname leaf2 mtu 1500")
+
+    def test_outputs_mirror_input_directories(self):
+        """Test that files with the same name in different directories write different outputs."""
+        output_dir = os.path.join(self.root, "out")
+        contexts = [
+            self.write("nested/a/leaf1.json", json.dumps({"hostname": "a-leaf1", "mtu": 1500})),
+            self.write("nested/b/leaf1.json", json.dumps({"hostname": "b-leaf1", "mtu": 1500})),
+        ]
+        templates = [self.write("nested/x/base.j2", "x {{ hostname }}"), self.write("nested/y/base.j2", "y {{ hostname }}")]
+
+        results = list(run_batch(templates, contexts, output_dir=output_dir, max_workers=1))
+
+        outputs = {}
+        for result in results:
+            with open(result["output"], encoding="utf-8") as file:
+                outputs[(result["context"], result["template"])] = file.read()
+        self.assertEqual(outputs, {
+            ("a/leaf1.json", "x/base.j2"): "x a-leaf1",
+            ("a/leaf1.json", "y/base.j2"): "y a-leaf1",
+            ("b/leaf1.json", "x/base.j2"): "x b-leaf1",
+            ("b/leaf1.json", "y/base.j2"): "y b-leaf1",
+        })
+
+    def test_output_collisions_are_refused(self):
+        """Test that renders writing the same output file are refused before rendering."""
+        output_dir = os.path.join(self.root, "out")
+        other = self.write("templates/hostname.jinja", "{{ hostname }}")
+
+        with self.assertRaises(ValueError):
+            list(run_batch([self.template, other], self.contexts, output_dir=output_dir, max_workers=1))
+        with contextlib.redirect_stderr(io.StringIO()) as stderr:
+            status = main([os.path.join(self.root, "templates"), "--contexts", self.contexts[0], "--output-dir", output_dir])
+
+        self.assertEqual(status, 1)
+        self.assertIn("hostname.j2 and hostname.jinja", stderr.getvalue())
+        self.assertFalse(os.path.exists(output_dir))
+
+    def test_property_sets_override_context(self):
+        """Test that each property set is layered over every context."""
+        output_dir = os.path.join(self.root, "out")
+
+        results = list(run_batch([self.template], self.contexts[:1], [self.property_set], output_dir, max_workers=1))
+
+        self.assertEqual(results[0]["property_set"], "jumbo.yaml")
+        with open(results[0]["output"], encoding="utf-8") as file:
+            self.assertEqual(file.read(), "hostname leaf1 mtu 9216")
+
+    def test_failures_are_reported_per_file(self):
+        """Test that unreadable contexts and failing renders are reported, not raised."""
+        broken = self.write("contexts/broken.json", "{not json")
+        failing = self.write("templates/failing.j2", "{{ missing.key }}")
+
+        results = list(run_batch([self.template, failing], self.contexts[:1] + [broken], max_workers=2))
+
+        errors = {(result["context"], result["template"]): result["error"] for result in results}
+        self.assertEqual(len(errors), 4)
+        self.assertIsNone(errors[("leaf1.json", "hostname.j2")])
+        self.assertIn("Undefined variable", errors[("leaf1.json", "failing.j2")])
+        self.assertIn("Error loading device context", errors[("broken.json", "hostname.j2")])
+
+    def test_profiles_are_merged_per_template(self):
+        """Test that profile reports are merged per template."""
+        results = list(run_batch([self.template], self.contexts, max_workers=1, profile=True))
+
+        profiles = merge_batch_profiles(results)
+
+        self.assertEqual(profiles["hostname.j2"]["renders"], 2)
+
+    def test_command_line(self):
+        """Test the command line exit status, results file and profile file."""
+        results_path = os.path.join(self.root, "results.jsonl")
+        profile_path = os.path.join(self.root, "profile.json")
+        args = [self.template, "--contexts", os.path.join(self.root, "contexts"), "--property-set", self.property_set,
+                "--results", results_path, "--profile", profile_path, "--workers", "1"]
+
+        with contextlib.redirect_stdout(io.StringIO()) as stdout:
+            status = main(args)
+
+        self.assertEqual(status, 0)
+        self.assertIn("2 rendered, 0 failed", stdout.getvalue())
+        with open(results_path, encoding="utf-8") as file:
+            self.assertEqual(len(file.readlines()), 2)
+        with open(profile_path, encoding="utf-8") as file:
+            self.assertIn("hostname.j2", json.load(file))
+
+        failing = self.write("templates/failing.j2", "{% if %}")
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(main([failing, "--contexts", self.contexts[0]]), 1)
+
+if __name__ == '__main__':
+    unittest.main()
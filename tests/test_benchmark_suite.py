@@ -0,0 +1,76 @@
+"""
+Unit tests for the render pipeline benchmark suite.
+"""
+
+import contextlib
+import io
+import json
+import os
+import tempfile
+import unittest
+
+from benchmarks.suite import RESULTS_VERSION, compare_results, load_results, main, run_suite
+
+def _results(**times):
+    """Build a results document with one case per keyword, timed in seconds."""
+    return {
+        "version": RESULTS_VERSION,
+        "results": [{"case": case, "scale": 1, "min": seconds, "median": seconds} for case, seconds in times.items()],
+    }
+
+class TestBenchmarkSuite(unittest.TestCase):
+    """Test cases for running the suite and comparing it with a baseline."""
+
+    def test_run_suite(self):
+        """Test that every selected case is timed at every scale."""
+        results = run_suite(scales=[1, 2], cases=["deep_merge", "load_json_file"], min_time=0, max_repeat=1)
+
+        self.assertEqual([(result["case"], result["scale"]) for result in results["results"]],
+                         [("deep_merge", 1), ("load_json_file", 1), ("deep_merge", 2), ("load_json_file", 2)])
+        self.assertEqual(results["results"][0]["runs"], 1)
+        self.assertLess(results["results"][0]["size"], results["results"][2]["size"])
+
+    def test_regressions_beyond_threshold(self):
+        """Test that only slowdowns beyond the threshold and the noise floor regress."""
+        baseline = _results(render=0.010, merge=0.010, tiny=0.00001)
+        results = _results(render=0.014, merge=0.012, tiny=0.0001, new=0.5)
+
+        comparisons = {comparison["case"]: comparison for comparison in compare_results(results, baseline, 0.25)}
+
+        self.assertTrue(comparisons["render"]["regressed"])
+        self.assertFalse(comparisons["merge"]["regressed"])
+        self.assertFalse(comparisons["tiny"]["regressed"])
+        self.assertIsNone(comparisons["new"]["baseline"])
+        self.assertAlmostEqual(comparisons["render"]["ratio"], 1.4)
+
+    def test_load_results_checks_version(self):
+        """Test that baselines in another format are rejected."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "baseline.json")
+            with open(path, "w", encoding="utf-8") as file:
+                json.dump({"version": RESULTS_VERSION + 1, "results": []}, file)
+
+            results, error = load_results(path)
+
+        self.assertIsNone(results)
+        self.assertIn("Unsupported results version", error)
+
+    def test_command_line_fails_on_regression(self):
+        """Test that a run slower than the saved baseline exits with status 1."""
+        with tempfile.TemporaryDirectory() as directory:
+            baseline = os.path.join(directory, "baseline.json")
+            args = ["--baseline", baseline, "--scales", "1", "--cases", "load_yaml_content",
+                    "--min-time", "0", "--repeat", "1"]
+            with contextlib.redirect_stdout(io.StringIO()):
+                self.assertEqual(main(args + ["--save"]), 0)
+                self.assertEqual(main(args + ["--threshold", "1000"]), 0)
+
+                # Pretend the baseline was much faster
+                results, _ = load_results(baseline)
+                results["results"][0]["min"] = 1e-6
+                with open(baseline, "w", encoding="utf-8") as file:
+                    json.dump(results, file)
+                self.assertEqual(main(args), 1)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,96 @@
+"""
+Unit tests for the data helper functions.
+"""
+
+import unittest
+
+import yaml
+
+from app.utils.data.data_helpers import (
+    deep_merge, LayeredContext, load_yaml_content, YAML_BACKEND
+)
+
+class TestLayeredContext(unittest.TestCase):
+    """Test cases for the LayeredContext merged view."""
+
+    def setUp(self):
+        self.device_context = {
+            "hostname": "leaf1",
+            "interface": {"et-0/0/1": {"description": "spine1"}, "et-0/0/2": {"description": "spine2"}},
+            "bgp": {"asn": 64512},
+            "vlans": [10, 20]
+        }
+        self.property_set = {
+            "interface": {"et-0/0/1": {"mtu": 9216}},
+            "bgp": "disabled",
+            "custom": {"setting": "value"}
+        }
+
+    def test_matches_deep_merge(self):
+        """Test that the layered view has the same content as deep_merge."""
+        layered = LayeredContext(self.property_set, self.device_context)
+        merged = deep_merge(self.device_context, self.property_set)
+
+        self.assertEqual(layered.to_dict(), merged)
+        self.assertEqual(dict(layered.items()).keys(), merged.keys())
+        self.assertEqual(len(layered), len(merged))
+
+    def test_overlay_precedence(self):
+        """Test that the first layer wins and nested dicts are merged."""
+        layered = LayeredContext(self.property_set, self.device_context)
+
+        self.assertEqual(layered["bgp"], "disabled")
+        self.assertEqual(layered["interface"]["et-0/0/1"]["mtu"], 9216)
+        self.assertEqual(layered["interface"]["et-0/0/1"]["description"], "spine1")
+        self.assertEqual(layered["interface"]["et-0/0/2"]["description"], "spine2")
+        self.assertIn("custom", layered)
+        self.assertNotIn("missing", layered)
+        with self.assertRaises(KeyError):
+            layered["missing"]
+
+    def test_no_copies(self):
+        """Test that unmerged values are returned as-is and layers are not modified."""
+        layered = LayeredContext(self.property_set, self.device_context)
+
+        self.assertIs(layered["vlans"], self.device_context["vlans"])
+        self.assertIs(layered["interface"]["et-0/0/2"], self.device_context["interface"]["et-0/0/2"])
+        self.assertNotIn("mtu", self.device_context["interface"]["et-0/0/1"])
+
+class TestYamlContent(unittest.TestCase):
+    """Test cases for loading YAML property sets."""
+
+    PROPERTY_SET = """
+vlans:
+  - id: 10
+    name: data
+    enabled: true
+vrfs:
+  blue: {vni: 10010, rt: "65000:10010"}
+description: "Überlay"
+empty:
+"""
+
+    def test_backend(self):
+        """Test that libyaml is used when PyYAML was built with it."""
+        self.assertEqual(YAML_BACKEND, "libyaml" if yaml.__with_libyaml__ else "python")
+
+    def test_load_matches_safe_load(self):
+        """Test that the loader builds the same data as yaml.safe_load."""
+        data, error = load_yaml_content(self.PROPERTY_SET)
+        self.assertIsNone(error)
+        self.assertEqual(data, yaml.safe_load(self.PROPERTY_SET))
+
+    def test_load_rejects_python_tags(self):
+        """Test that the loader stays safe."""
+        data, error = load_yaml_content("!!python/object/apply:os.system ['echo unsafe']")
+        self.assertIsNone(data)
+        self.assertTrue(error.startswith("Error decoding YAML"))
+
+    def test_load_invalid_yaml(self):
+        """Test the error for malformed YAML."""
+        data, error = load_yaml_content("vlans: [10, 20")
+        self.assertIsNone(data)
+        self.assertTrue(error.startswith("Error decoding YAML"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,171 @@
+"""
+Unit tests for diagnostics spans and per-run timings.
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from app.utils.data.data_helpers import deep_merge, load_json_file
+from app.utils.data.template_engine import clear_template_cache, render_template
+from app.utils.diagnostics.spans import (
+    configure_span_log,
+    span,
+    spans_to_jsonl,
+    start_collecting,
+    stop_collecting,
+    summarize_spans,
+    timed,
+)
+from app.utils.ui import sections
+from app.utils.ui.diagnostics_panel import export_run_timings
+
+class TestSpans(unittest.TestCase):
+    """Test cases for timing calls as spans."""
+
+    def setUp(self):
+        self.addCleanup(stop_collecting)
+
+    def test_nothing_is_recorded_without_a_collector(self):
+        """Test that timed calls run unchanged when nothing collects them."""
+        collector = start_collecting()
+        stop_collecting()
+
+        self.assertEqual(load_json_file('{"a": 1}'), ({"a": 1}, None))
+        self.assertEqual(collector.spans, [])
+
+    def test_spans_record_nesting_and_errors(self):
+        """Test that spans know their parent and that error results are flagged."""
+        # The compile span is only recorded on a template cache miss
+        clear_template_cache()
+        collector = start_collecting()
+
+        render_template("{{ a }}", {"a": 1})
+        load_json_file("{not json")
+        with span("ui.block", viewer="context"):
+            pass
+
+        names = {record["name"]: record for record in collector.spans}
+        self.assertEqual(names["template.compile"]["parent"], "template.render")
+        self.assertIsNone(names["template.render"]["parent"])
+        self.assertFalse(names["template.render"]["error"])
+        self.assertTrue(names["data.load_json_file"]["error"])
+        self.assertEqual(names["ui.block"]["viewer"], "context")
+
+    def test_recursion_is_timed_once(self):
+        """Test that recursive calls are covered by the outermost span."""
+        collector = start_collecting()
+
+        deep_merge({"a": {"b": {"c": 1}}}, {"a": {"b": {"d": 2}}})
+
+        self.assertEqual([record["name"] for record in collector.spans], ["data.deep_merge"])
+
+    def test_exceptions_are_recorded(self):
+        """Test that a raising call is recorded as failed and the exception propagates."""
+        @timed("test.raises")
+        def raises():
+            raise ValueError("boom")
+
+        collector = start_collecting()
+        with self.assertRaises(ValueError):
+            raises()
+
+        self.assertTrue(collector.spans[0]["error"])
+
+    def test_collectors_are_per_context(self):
+        """Test that other threads don't record into this run, but to_thread calls do."""
+        collector = start_collecting()
+        thread = threading.Thread(target=load_json_file, args=("{}",))
+        thread.start()
+        thread.join()
+
+        async def parse():
+            return await asyncio.to_thread(load_json_file, "{}")
+        asyncio.run(parse())
+
+        self.assertEqual(len(collector.spans), 1)
+
+    def test_collector_is_bounded(self):
+        """Test that spans beyond the limit are counted, not kept."""
+        collector = start_collecting(max_spans=2)
+
+        for _ in range(5):
+            load_json_file("{}")
+
+        self.assertEqual(len(collector.spans), 2)
+        self.assertEqual(collector.dropped, 3)
+
+    def test_span_log(self):
+        """Test that spans are appended to the log file as JSON lines."""
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "spans.jsonl")
+            configure_span_log(path)
+            try:
+                load_json_file("{}")
+                load_json_file("[]")
+            finally:
+                configure_span_log(None)
+
+            with open(path, encoding="utf-8") as log:
+                records = [json.loads(line) for line in log]
+
+        self.assertEqual([record["name"] for record in records], ["data.load_json_file"] * 2)
+
+    def test_summary_and_export(self):
+        """Test aggregating spans by name and serializing them as JSON lines."""
+        spans = [
+            {"name": "apstra.get_device_context", "seconds": 0.2, "error": False},
+            {"name": "apstra.get_device_context", "seconds": 0.4, "error": True},
+            {"name": "template.render", "seconds": 0.1, "error": False},
+        ]
+
+        summary = summarize_spans(spans)
+        lines = spans_to_jsonl(spans, run=3).splitlines()
+
+        self.assertEqual(summary[0]["name"], "apstra.get_device_context")
+        self.assertEqual((summary[0]["count"], summary[0]["errors"]), (2, 1))
+        self.assertAlmostEqual(summary[0]["max"], 0.4)
+        self.assertEqual(json.loads(lines[2])["run"], 3)
+
+class TestRunDiagnostics(unittest.TestCase):
+    """Test cases for collecting spans per script run."""
+
+    def setUp(self):
+        self.state = {}
+        patcher = patch('app.utils.ui.sections.get_state', return_value=self.state)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(stop_collecting)
+
+    def test_spans_are_stored_with_the_run(self):
+        """Test that an app run and a section rerun each keep their own spans."""
+        self.state["diagnostics_enabled"] = True
+        sections.start_app_run()
+        sections.render_section("context", lambda: load_json_file("{}"), fragment=False)
+        sections.finish_app_run()
+        sections.render_section("template", lambda: render_template("{{ 1 }}", {}), fragment=False)
+
+        runs = sections.get_run_timings()
+        self.assertEqual([record["name"] for record in runs[0]["spans"]], ["data.load_json_file"])
+        self.assertEqual(runs[1]["scope"], "template")
+        self.assertIn("template.render", [record["name"] for record in runs[1]["spans"]])
+
+        lines = [json.loads(line) for line in export_run_timings(runs).splitlines()]
+        self.assertEqual([line["type"] for line in lines][:2], ["run", "span"])
+        self.assertEqual(lines[0]["sections"], runs[0]["sections"])
+
+    def test_spans_are_not_collected_when_disabled(self):
+        """Test that runs only record section times while diagnostics are off."""
+        with patch.object(sections, "DIAGNOSTICS_ENABLED", False):
+            sections.start_app_run()
+            sections.render_section("context", lambda: load_json_file("{}"), fragment=False)
+            sections.finish_app_run()
+
+        self.assertNotIn("spans", sections.get_run_timings()[0])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+# tests/test_fleet_render.py
+import unittest
+from unittest.mock import patch
+
+from app.utils.data.fleet_render import render_fleet, run_fleet_render, group_failures
+
+class TestFleetRender(unittest.TestCase):
+    """Test cases for fleet rendering."""
+
+    def test_render_fleet(self):
+        """Test rendering one template against several device contexts."""
+        contexts = {
+            "n1": {"hostname": "leaf1"},
+            "n2": {"hostname": "leaf2"},
+            "n3": {"role": "spine"},
+            "n4": {"error": "Connection Error"}
+        }
+
+        report = render_fleet("{{ hostname }}", contexts, max_workers=2)
+
+        results = report["results"]
+        self.assertEqual(results["n1"]["output"], "leaf1")
+        self.assertEqual(results["n2"]["output"], "leaf2")
+        self.assertIn("Undefined variable", results["n3"]["error"])
+        self.assertIn("Connection Error", results["n4"]["error"])
+        self.assertGreaterEqual(results["n1"]["render_time"], 0)
+        self.assertGreater(report["wall_time"], 0)
+        self.assertEqual(sum(len(ids) for ids in report["failures"].values()), 2)
+
+    def test_render_fleet_syntax_error(self):
+        """Test that a template that cannot be sliced reports its syntax error per device."""
+        report = render_fleet("{% if hostname %}", {"n1": {"hostname": "leaf1"}}, max_workers=1, slice_context=True)
+
+        self.assertIn("Template Syntax Error", report["results"]["n1"]["error"])
+
+    def test_group_failures(self):
+        """Test that failures are grouped by message, most common first."""
+        results = {
+            "a": {"output": None, "error": "boom", "render_time": 0},
+            "b": {"output": None, "error": "bang", "render_time": 0},
+            "c": {"output": None, "error": "bang", "render_time": 0},
+            "d": {"output": "ok", "error": None, "render_time": 0}
+        }
+
+        failures = group_failures(results)
+
+        self.assertEqual(list(failures), ["bang", "boom"])
+        self.assertEqual(failures["bang"], ["b", "c"])
+
+    @patch('app.utils.api.apstra_client.get_device_context')
+    @patch('app.utils.data.fleet_render.get_blueprint_nodes')
+    def test_run_fleet_render(self, mock_nodes, mock_context):
+        """Test that every switch in the blueprint is fetched and rendered."""
+        mock_nodes.return_value = {"items": [
+            {"switch_nodes": {"id": "n1", "label": "leaf1", "hostname": "leaf1"}},
+            {"switch_nodes": {"id": "n2", "label": "leaf2", "hostname": "leaf2"}}
+        ]}
+        mock_context.side_effect = lambda base_url, token, blueprint_id, node_id: {"name": node_id}
+
+        report, error = run_fleet_render("apstra", "token", "bp1", "{{ name }}", render_workers=1)
+
+        self.assertIsNone(error)
+        self.assertEqual(report["results"]["n1"]["output"], "n1")
+        self.assertEqual(report["results"]["n2"]["output"], "n2")
+        self.assertEqual(mock_context.call_count, 2)
+        self.assertEqual(len(report["switches"]), 2)
+
+    @patch('app.utils.data.fleet_render.get_blueprint_nodes')
+    def test_run_fleet_render_node_error(self, mock_nodes):
+        """Test that a failed node query is reported as an error."""
+        mock_nodes.return_value = {"error": "HTTP Error: 401"}
+
+        report, error = run_fleet_render("apstra", "token", "bp1", "{{ name }}")
+
+        self.assertIsNone(report)
+        self.assertIn("HTTP Error: 401", error)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,174 @@
+"""
+Unit tests for the pooled HTTP client.
+
+These tests run the client against a local TLS server and count the TLS
+handshakes it performs.
+"""
+
+import json
+import os
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+from app.utils.api import http_client
+from app.utils.api.http_client import get_request, post_request, configure_http_pool, close_sessions
+
+class _JsonHandler(BaseHTTPRequestHandler):
+    """Answers every request with a small JSON body over keep-alive HTTP/1.1."""
+
+    protocol_version = "HTTP/1.1"
+
+    def _reply(self):
+        length = int(self.headers.get("Content-Length", 0))
+        if length:
+            self.rfile.read(length)
+        self.server.enter()
+        reply = {"path": self.path}
+        if self.headers.get("Cookie"):
+            reply["cookie"] = self.headers["Cookie"]
+        body = json.dumps(reply).encode()
+        self.send_response(200)
+        if self.path == "/api/aaa/login":
+            self.send_header("Set-Cookie", "session=user-a; Path=/")
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+        self.server.leave()
+
+    do_GET = _reply
+    do_POST = _reply
+
+    def log_message(self, format, *args):
+        pass
+
+class _CountingTLSServer(ThreadingHTTPServer):
+    """HTTPS server that counts completed TLS handshakes."""
+
+    daemon_threads = True
+
+    def __init__(self, certfile, keyfile):
+        super().__init__(("127.0.0.1", 0), _JsonHandler)
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        context.load_cert_chain(certfile, keyfile)
+        self.socket = context.wrap_socket(self.socket, server_side=True)
+        self.handshakes = 0
+        self.delay = 0
+        self.active = 0
+        self.peak = 0
+        self._lock = threading.Lock()
+
+    def enter(self):
+        """Count a request being handled, waiting delay seconds before answering."""
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+
+    def leave(self):
+        """Count a request answered."""
+        with self._lock:
+            self.active -= 1
+
+    def get_request(self):
+        # The TLS handshake completes in accept() on a wrapped socket
+        request = super().get_request()
+        with self._lock:
+            self.handshakes += 1
+        return request
+
+@unittest.skipUnless(shutil.which("openssl"), "openssl is required to create a test certificate")
+class TestPooledHttpClient(unittest.TestCase):
+    """Test cases for connection reuse and isolation in the HTTP client."""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.cert_dir = tempfile.TemporaryDirectory()
+        cls.certfile = os.path.join(cls.cert_dir.name, "cert.pem")
+        cls.keyfile = os.path.join(cls.cert_dir.name, "key.pem")
+        subprocess.run(
+            ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+             "-subj", "/CN=localhost", "-keyout", cls.keyfile, "-out", cls.certfile],
+            check=True, capture_output=True
+        )
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.cert_dir.cleanup()
+
+    def setUp(self):
+        close_sessions()
+        self.server = _CountingTLSServer(self.certfile, self.keyfile)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        self.thread.start()
+        self.base_url = f"https://127.0.0.1:{self.server.server_address[1]}"
+
+    def tearDown(self):
+        close_sessions()
+        self.server.shutdown()
+        self.server.server_close()
+        configure_http_pool(pool_size=http_client.DEFAULT_POOL_SIZE, timeout=http_client.DEFAULT_TIMEOUT)
+
+    def test_requests_reuse_one_connection(self):
+        """Test that sequential requests to one host share a single TLS handshake."""
+        for path in ("/api/blueprints", "/api/property-sets", "/api/design/configlets"):
+            response = get_request(self.base_url + path)
+            self.assertEqual(response, {"path": path})
+        response = post_request(self.base_url + "/api/blueprints/bp1/qe", {"query": "node()"})
+        self.assertEqual(response, {"path": "/api/blueprints/bp1/qe"})
+
+        self.assertEqual(self.server.handshakes, 1)
+
+    def test_close_sessions_drops_connections(self):
+        """Test that closing the sessions forces a new handshake."""
+        get_request(self.base_url + "/api/blueprints")
+        close_sessions()
+        get_request(self.base_url + "/api/blueprints")
+
+        self.assertEqual(self.server.handshakes, 2)
+
+    def test_concurrent_requests_bounded_by_pool(self):
+        """Test that concurrent requests open at most pool_size connections."""
+        configure_http_pool(pool_size=4)
+        self.server.delay = 0.05
+        threads = [
+            threading.Thread(target=get_request, args=(self.base_url + f"/api/blueprints/{i}",))
+            for i in range(20)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.server.peak, 4)
+        self.assertLessEqual(self.server.handshakes, 4)
+
+        # Later requests reuse the pooled connections
+        self.server.delay = 0
+        before = self.server.handshakes
+        for i in range(4):
+            get_request(self.base_url + f"/api/blueprints/{i}")
+        self.assertEqual(self.server.handshakes, before)
+
+    def test_cookies_are_not_shared(self):
+        """Test that cookies set for one user are not sent with the next request."""
+        get_request(self.base_url + "/api/aaa/login")
+        response = get_request(self.base_url + "/api/blueprints")
+
+        self.assertEqual(response, {"path": "/api/blueprints"})
+
+    def test_timeout_is_reported(self):
+        """Test that an unreachable host returns an error instead of hanging."""
+        configure_http_pool(timeout=0.5)
+        response = get_request("https://10.255.255.1/api/blueprints")
+
+        self.assertIn("error", response)
+
+if __name__ == '__main__':
+    unittest.main()
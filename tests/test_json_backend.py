@@ -0,0 +1,62 @@
+import json
+import math
+import unittest
+from unittest.mock import patch
+
+from app.utils.data import json_backend
+from app.utils.data.data_helpers import LayeredContext, load_json_file
+
+class TestJsonBackend(unittest.TestCase):
+    """Test cases for the JSON backend."""
+
+    def test_loads_str_and_bytes(self):
+        """Test parsing strings and UTF-8 bytes."""
+        document = '{"hostname": "leaf1", "mtu": 9216, "tags": ["a", "ü"]}'
+        expected = json.loads(document)
+        self.assertEqual(json_backend.loads(document), expected)
+        self.assertEqual(json_backend.loads(document.encode("utf-8")), expected)
+
+    def test_loads_standard_library_extensions(self):
+        """Test that documents only the standard library accepts still parse."""
+        self.assertTrue(math.isnan(json_backend.loads('{"value": NaN}')["value"]))
+        self.assertEqual(json_backend.loads("[18446744073709551616]"), [2 ** 64])
+
+    def test_loads_invalid_document(self):
+        """Test that invalid documents raise JSONDecodeError with the usual message."""
+        with self.assertRaises(json_backend.JSONDecodeError) as context:
+            json_backend.loads("{hostname: 'leaf1'}")
+        self.assertIn("Expecting property name", str(context.exception))
+
+    def test_dumps_round_trip(self):
+        """Test serialization options and round trips."""
+        data = {"b": 1, "a": {"c": [1, 2, None]}}
+        serialized = json_backend.dumps(data, sort_keys=True)
+        self.assertEqual(json.loads(serialized), data)
+        self.assertLess(serialized.index('"a"'), serialized.index('"b"'))
+        self.assertEqual(json.loads(json_backend.dumps(data, indent=True)), data)
+        self.assertIsInstance(json_backend.dumps_bytes(data), bytes)
+
+    def test_dumps_mappings_and_non_string_keys(self):
+        """Test serializing context views, integer keys and big integers."""
+        view = LayeredContext({"a": {"x": 1}}, {"a": {"y": 2}})
+        self.assertEqual(json.loads(json_backend.dumps(view)), {"a": {"x": 1, "y": 2}})
+        self.assertEqual(json.loads(json_backend.dumps({10: "vlan"})), {"10": "vlan"})
+        self.assertEqual(json.loads(json_backend.dumps([2 ** 64])), [2 ** 64])
+
+    def test_standard_library_fallback(self):
+        """Test that the standard library is used when orjson is unavailable."""
+        with patch.object(json_backend, "orjson", None):
+            self.assertEqual(json_backend.loads(b'{"a": 1}'), {"a": 1})
+            self.assertEqual(json.loads(json_backend.dumps({"a": "ü"})), {"a": "ü"})
+
+    def test_load_json_file(self):
+        """Test that load_json_file keeps its error message with the backend."""
+        data, error = load_json_file('{"hostname": "leaf1"}')
+        self.assertEqual(data, {"hostname": "leaf1"})
+        self.assertIsNone(error)
+        data, error = load_json_file("{hostname}")
+        self.assertIsNone(data)
+        self.assertTrue(error.startswith("Error decoding JSON: Expecting property name"))
+
+if __name__ == '__main__':
+    unittest.main()
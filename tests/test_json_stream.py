@@ -0,0 +1,101 @@
+import io
+import json
+import math
+import unittest
+from unittest.mock import patch
+
+from app.utils.data.json_stream import parse_json_stream, load_json_stream, STREAM_THRESHOLD_BYTES
+
+class TestJsonStream(unittest.TestCase):
+    """Test cases for the streaming JSON parser."""
+
+    DOCUMENTS = [
+        '{}',
+        '[]',
+        '"text"',
+        '-12.5e3',
+        'null',
+        '[1, 2.5, -3e2, "x\\u00e9\\n", true, false, null]',
+        '{"a": {"b": [[], {}, [1]]}, "c": "d", "ü": "日本"}',
+        '\n  {\n  "hostname": "leaf1",\n  "mtu": 9216\n}\n  ',
+    ]
+
+    def parse(self, document, chunk_size):
+        return parse_json_stream(io.BytesIO(document.encode("utf-8")), chunk_size=chunk_size)
+
+    def test_matches_json_loads_for_any_chunk_size(self):
+        """Test that tokens split across chunks parse like json.loads."""
+        for document in self.DOCUMENTS:
+            for chunk_size in (1, 2, 3, 7, 1024):
+                with self.subTest(document=document, chunk_size=chunk_size):
+                    self.assertEqual(self.parse(document, chunk_size), json.loads(document))
+
+    def test_constants(self):
+        """Test NaN and Infinity, which json.loads also accepts."""
+        result = self.parse("[NaN, Infinity, -Infinity]", 2)
+        self.assertTrue(math.isnan(result[0]))
+        self.assertEqual(result[1:], [float("inf"), float("-inf")])
+
+    def test_large_document(self):
+        """Test a document much larger than the chunk size."""
+        data = {"interface": {f"et-0/0/{i}": {"mtu": 9216, "ips": [f"10.0.{i}.1/31"]} for i in range(500)}}
+        self.assertEqual(self.parse(json.dumps(data, indent=2), 256), data)
+
+    def test_errors_match_json_loads(self):
+        """Test that invalid documents report the same error as json.loads."""
+        for document in ['', '{', '[1 2]', '{"a" 1}', '{"a":1,}', '{"a":1}x', 'tru', '"abc', '{1:2}']:
+            for chunk_size in (1, 1024):
+                with self.subTest(document=document, chunk_size=chunk_size):
+                    with self.assertRaises(json.JSONDecodeError) as expected:
+                        json.loads(document)
+                    with self.assertRaises(json.JSONDecodeError) as actual:
+                        self.parse(document, chunk_size)
+                    self.assertEqual(str(actual.exception), str(expected.exception))
+
+    def test_error_position_across_chunks(self):
+        """Test that error positions are relative to the whole document."""
+        document = '{\n  "a": 1,\n  "b": [1, 2 3]\n}'
+        with self.assertRaises(json.JSONDecodeError) as context:
+            self.parse(document, 4)
+        self.assertEqual((context.exception.lineno, context.exception.colno), (3, 14))
+        self.assertEqual(context.exception.pos, document.index("3]"))
+
+    def test_progress(self):
+        """Test that progress is reported after every chunk."""
+        document = json.dumps({"items": list(range(100))}).encode("utf-8")
+        reported = []
+        load_json_stream(io.BytesIO(document), progress=lambda read, total: reported.append((read, total)),
+                         total_bytes=len(document), chunk_size=64, stream_threshold=0)
+        self.assertEqual(reported[-1], (len(document), len(document)))
+        self.assertEqual(len(reported), math.ceil(len(document) / 64))
+
+    def test_small_documents_are_not_streamed(self):
+        """Test that documents up to the threshold are parsed at once, larger ones streamed."""
+        document = '\ufeff{"hostname": "leaf1", "vlans": [10, 20]}'.encode("utf-8")
+        for threshold, streamed in ((len(document), False), (len(document) - 1, True)):
+            with patch('app.utils.data.json_stream.parse_json_stream', wraps=parse_json_stream) as mock_parse:
+                data, error = load_json_stream(io.BytesIO(document), total_bytes=len(document),
+                                               stream_threshold=threshold)
+            self.assertIsNone(error)
+            self.assertEqual(data, {"hostname": "leaf1", "vlans": [10, 20]})
+            self.assertEqual(mock_parse.called, streamed)
+
+        # Uploads above the default threshold, like a full-fabric context, are streamed
+        document = json.dumps({"interfaces": ["x" * 1000] * (STREAM_THRESHOLD_BYTES // 1000)}).encode("utf-8")
+        with patch('app.utils.data.json_stream.parse_json_stream', wraps=parse_json_stream) as mock_parse:
+            data, error = load_json_stream(io.BytesIO(document), total_bytes=len(document))
+        self.assertIsNone(error)
+        self.assertEqual(len(data["interfaces"]), STREAM_THRESHOLD_BYTES // 1000)
+        mock_parse.assert_called_once()
+
+        data, error = load_json_stream(io.BytesIO(b"{hostname}"), total_bytes=10)
+        self.assertTrue(error.startswith("Error decoding JSON: Expecting property name"))
+
+    def test_load_json_stream_error(self):
+        """Test the (data, error) result of load_json_stream."""
+        data, error = load_json_stream(io.BytesIO(b"{hostname}"))
+        self.assertIsNone(data)
+        self.assertTrue(error.startswith("Error decoding JSON: Expecting property name"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+"""
+Unit tests for bounded views of JSON documents.
+"""
+
+import json
+import unittest
+
+from app.utils.config.example_data import EXAMPLE_DEVICE_CONTEXT
+from app.utils.data.json_tree import container_depths, display_depth, resolve_path, visible_tree, summarize
+from app.utils.ui.json_display_controls import calculate_max_depth
+
+class TestContainerDepths(unittest.TestCase):
+    """Test cases for precomputed container depths."""
+
+    def test_matches_calculate_max_depth(self):
+        """Test that precomputed depths give the same expansion as calculate_max_depth."""
+        context = json.loads(EXAMPLE_DEVICE_CONTEXT)
+        samples = [
+            context,
+            {"a": 1},
+            {"a": {"b": {"c": []}}},
+            [[], [1, [2]], {}],
+            {"deep": {"x": {"x": {"x": {"x": {"x": {"x": {"x": {"x": {"x": {"x": 1}}}}}}}}}}},
+            "scalar",
+            {},
+        ]
+        samples.extend(value for value in context.values() if isinstance(value, (dict, list)))
+
+        for data in samples:
+            depths = container_depths(data)
+            self.assertEqual(display_depth(depths, data), calculate_max_depth(data))
+
+    def test_every_container_is_recorded(self):
+        """Test that nested containers get their own depth."""
+        data = {"a": {"b": [1, 2]}, "c": []}
+
+        depths = container_depths(data)
+
+        self.assertEqual(depths[id(data)], 3)
+        self.assertEqual(depths[id(data["a"])], 2)
+        self.assertEqual(depths[id(data["a"]["b"])], 1)
+        self.assertNotIn(id(data["c"]), depths)
+
+class TestVisibleTree(unittest.TestCase):
+    """Test cases for building the visible part of a document."""
+
+    def test_containers_below_depth_are_summarized(self):
+        """Test that only the levels down to the expansion depth are included."""
+        data = {"interface": {"et-0/0/1": {"mtu": 9216}}, "hostname": "leaf1", "empty": {}}
+
+        self.assertEqual(
+            visible_tree(data, 1),
+            {"interface": "{…} 1 key", "hostname": "leaf1", "empty": {}}
+        )
+        self.assertEqual(visible_tree(data, 2)["interface"], {"et-0/0/1": "{…} 1 key"})
+        self.assertEqual(visible_tree(data, 3), data)
+
+    def test_large_containers_are_paged(self):
+        """Test that a container shows one page of children and counts the rest."""
+        data = {"items": list(range(250))}
+
+        shown = visible_tree(data, 2, page_size=100)
+        self.assertEqual(shown["items"][:100], list(range(100)))
+        self.assertEqual(shown["items"][100], "… 150 more items")
+
+        page = visible_tree(data["items"], 1, offset=200, page_size=100)
+        self.assertEqual(page, list(range(200, 250)))
+
+    def test_node_budget(self):
+        """Test that the number of nodes is capped, keeping the top levels."""
+        data = {f"key{i}": {f"child{j}": j for j in range(50)} for i in range(50)}
+
+        shown = visible_tree(data, 5, max_nodes=100)
+
+        self.assertEqual(len([key for key in shown if key != "…"]), 50)
+        self.assertLessEqual(sum(len(value) for value in shown.values() if isinstance(value, dict)), 50 + 50)
+        self.assertIn("more keys", json.dumps(shown))
+
+    def test_source_is_not_shared(self):
+        """Test that the visible tree can be changed without touching the document."""
+        data = {"a": {"b": 1}}
+
+        visible_tree(data, 3)["a"]["b"] = 2
+
+        self.assertEqual(data["a"]["b"], 1)
+
+    def test_summarize(self):
+        """Test the collapsed container descriptions."""
+        self.assertEqual(summarize({"a": 1, "b": 2}), "{…} 2 keys")
+        self.assertEqual(summarize([1]), "[…] 1 item")
+
+class TestResolvePath(unittest.TestCase):
+    """Test cases for finding the container the viewer shows."""
+
+    def test_existing_path(self):
+        data = {"interface": [{"name": "et-0/0/1"}]}
+        self.assertEqual(resolve_path(data, ["interface", 0]), ({"name": "et-0/0/1"}, ["interface", 0]))
+
+    def test_missing_path_falls_back_to_ancestor(self):
+        data = {"interface": [{"name": "et-0/0/1"}]}
+        self.assertEqual(resolve_path(data, ["interface", 5, "name"]), (data["interface"], ["interface"]))
+        self.assertEqual(resolve_path(data, ["bgp"]), (data, []))
+
+if __name__ == '__main__':
+    unittest.main()
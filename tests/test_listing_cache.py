@@ -0,0 +1,77 @@
+"""
+Unit tests for the Apstra listing cache.
+"""
+
+import unittest
+from unittest.mock import MagicMock, patch
+
+from app.utils.api.listing_cache import cached_listing, invalidate_listings, get_listing_cache_stats
+
+def _listing(name, response):
+    """Create a mock apstra_client function with a name, as used in cache keys."""
+    fetch = MagicMock(return_value=response)
+    fetch.__name__ = name
+    return fetch
+
+class TestListingCache(unittest.TestCase):
+    """Test cases for the listing cache."""
+
+    def setUp(self):
+        invalidate_listings()
+
+    def test_repeat_calls_are_cached(self):
+        """Test that a fresh listing is returned without calling Apstra again."""
+        fetch = _listing("get_all_blueprints", {"items": [{"id": "bp1"}]})
+
+        first = cached_listing(fetch, "apstra", "token")
+        second = cached_listing(fetch, "apstra", "token")
+
+        self.assertEqual(first, second)
+        fetch.assert_called_once_with("apstra", "token")
+
+    def test_key_includes_host_token_and_arguments(self):
+        """Test that different hosts, tokens and arguments are cached separately."""
+        fetch = _listing("get_blueprint_nodes", {"items": []})
+
+        cached_listing(fetch, "apstra", "token", "bp1")
+        cached_listing(fetch, "apstra", "token", "bp2")
+        cached_listing(fetch, "apstra", "other-token", "bp1")
+        cached_listing(fetch, "apstra2", "token", "bp1")
+
+        self.assertEqual(fetch.call_count, 4)
+
+    def test_ttl_expiry(self):
+        """Test that an expired listing is fetched again."""
+        fetch = _listing("get_configlets", {"items": []})
+
+        with patch('app.utils.api.listing_cache.time.monotonic', side_effect=[0, 301]):
+            cached_listing(fetch, "apstra", "token", ttl=300)
+            cached_listing(fetch, "apstra", "token", ttl=300)
+
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_errors_are_not_cached(self):
+        """Test that error responses are fetched again on the next rerun."""
+        fetch = _listing("get_property_sets", {"error": "Connection Error"})
+
+        cached_listing(fetch, "apstra", "token")
+        cached_listing(fetch, "apstra", "token")
+
+        self.assertEqual(fetch.call_count, 2)
+
+    def test_invalidate_on_logout(self):
+        """Test that invalidating a token only removes that token's listings."""
+        fetch = _listing("get_all_blueprints", {"items": []})
+        cached_listing(fetch, "apstra", "token-a")
+        cached_listing(fetch, "apstra", "token-b")
+
+        removed = invalidate_listings(token="token-a")
+        cached_listing(fetch, "apstra", "token-a")
+        cached_listing(fetch, "apstra", "token-b")
+
+        self.assertEqual(removed, 1)
+        self.assertEqual(fetch.call_count, 3)
+        self.assertEqual(get_listing_cache_stats()["size"], 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,167 @@
+"""
+Unit tests for debounced live rendering.
+"""
+
+import threading
+import unittest
+
+from app.utils.data.live_render import DebouncedRenderer
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestDebouncedRenderer(unittest.TestCase):
+    """Test cases for the debounced renderer."""
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.calls = []
+
+    def render(self, template):
+        self.calls.append(template)
+        if template.startswith("{%"):
+            return None, "Template Syntax Error"
+        return template.upper(), None
+
+    def renderer(self, debounce_seconds=0.3, render=None):
+        return DebouncedRenderer(render or self.render, debounce_seconds, inline_seconds=1.0, clock=self.clock)
+
+    def test_first_render_is_immediate(self):
+        """Test that the first submission renders without waiting for the window."""
+        renderer = self.renderer()
+        renderer.submit("a", "a")
+
+        status = renderer.poll()
+
+        self.assertEqual(status["output"], "A")
+        self.assertFalse(status["stale"])
+        self.assertFalse(status["pending"])
+
+    def test_edits_within_window_are_coalesced(self):
+        """Test that only the latest edit in the window is rendered."""
+        renderer = self.renderer()
+        renderer.submit("a", "a")
+        renderer.poll()
+
+        for template in ("ab", "abc", "abcd"):
+            renderer.submit(template, template)
+            self.clock.now += 0.1
+            status = renderer.poll()
+            self.assertTrue(status["pending"])
+            self.assertTrue(status["stale"])
+            self.assertEqual(status["output"], "A")
+        self.assertAlmostEqual(status["wait"], 0.2)
+
+        self.clock.now += 0.2
+        status = renderer.poll()
+
+        self.assertEqual(status["output"], "ABCD")
+        self.assertFalse(status["stale"])
+        self.assertEqual(self.calls, ["a", "abcd"])
+
+    def test_resubmitting_same_inputs_does_not_render(self):
+        """Test that reruns without edits reuse the result."""
+        renderer = self.renderer()
+        renderer.submit("a", "a")
+        renderer.poll()
+        renderer.submit("a", "a")
+
+        self.assertFalse(renderer.poll()["pending"])
+        self.assertEqual(self.calls, ["a"])
+
+    def test_stale_results_are_dropped(self):
+        """Test that a render finishing after a newer edit is discarded."""
+        release = threading.Event()
+
+        def slow_render(template):
+            release.wait(5)
+            return template, None
+
+        renderer = DebouncedRenderer(slow_render, 0.3, inline_seconds=0.0, clock=self.clock)
+        renderer.submit("old", "old")
+        self.assertTrue(renderer.poll()["pending"])
+        renderer.submit("new", "new")
+        release.set()
+
+        # Wait for the superseded render to finish
+        for _ in range(100):
+            if renderer.dropped:
+                break
+            threading.Event().wait(0.01)
+
+        self.assertEqual(renderer.dropped, 1)
+        status = renderer.poll()
+        self.assertTrue(status["pending"])
+        self.assertIsNone(status["output"])
+
+    def test_error_keeps_last_good_output(self):
+        """Test that a failing edit shows its error next to the last good output."""
+        renderer = self.renderer()
+        renderer.submit("a", "a")
+        renderer.poll()
+        renderer.submit("b", "{% if %}")
+        self.clock.now += 0.3
+
+        status = renderer.poll()
+
+        self.assertEqual(status["error"], "Template Syntax Error")
+        self.assertEqual(status["output"], "A")
+        self.assertTrue(status["stale"])
+        self.assertFalse(status["pending"])
+
+    def test_zero_window_renders_synchronously(self):
+        """Test that a zero debounce window renders every edit in poll()."""
+        renderer = self.renderer(debounce_seconds=0)
+        for template in ("a", "b"):
+            renderer.submit(template, template)
+            self.assertEqual(renderer.poll()["output"], template.upper())
+
+        self.assertEqual(self.calls, ["a", "b"])
+
+    def test_streaming_reports_partial_output(self):
+        """Test that a streaming renderer reports the chunks of a running render."""
+        chunk_rendered = threading.Event()
+        release = threading.Event()
+
+        def streaming_render(template, on_chunk):
+            on_chunk(["line 1\n", "line 2\n"])
+            chunk_rendered.set()
+            release.wait(5)
+            return template, None
+
+        renderer = DebouncedRenderer(streaming_render, 0.3, inline_seconds=0.0, clock=self.clock, stream=True)
+        renderer.submit("a", "a")
+        renderer.poll()
+        chunk_rendered.wait(5)
+
+        status = renderer.poll()
+        self.assertTrue(status["pending"])
+        self.assertEqual(status["partial"], ["line 1\n", "line 2\n"])
+
+        release.set()
+        for _ in range(100):
+            status = renderer.poll()
+            if not status["pending"]:
+                break
+            threading.Event().wait(0.01)
+        self.assertEqual(status["output"], "a")
+        self.assertEqual(status["partial"], [])
+
+    def test_render_exception_is_reported(self):
+        """Test that an exception in the render function becomes an error."""
+        def failing_render(template):
+            raise RuntimeError("boom")
+
+        renderer = self.renderer(debounce_seconds=0, render=failing_render)
+        renderer.submit("a", "a")
+
+        self.assertIn("boom", renderer.poll()["error"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Unit tests for the Prometheus metrics.
+"""
+
+import os
+import re
+import tempfile
+import unittest
+import urllib.request
+from unittest.mock import patch
+
+from app.utils.api import apstra_client
+from app.utils.data.template_engine import render_template
+from app.utils.diagnostics import metrics
+from app.utils.diagnostics.metrics import (
+    Counter,
+    Histogram,
+    disable_metrics,
+    enable_metrics,
+    estimate_size,
+    export_metrics,
+    record_session,
+    start_metrics_server,
+    write_metrics_file,
+)
+
+def _sample(exposition, line_start):
+    """Return the value of the first sample line starting with line_start."""
+    for line in exposition.splitlines():
+        if line.startswith(line_start + " "):
+            return float(line.split(" ")[-1])
+    return None
+
+class TestMetricTypes(unittest.TestCase):
+    """Test cases for the text exposition of counters and histograms."""
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test bucket counts, sum and count of a labelled histogram."""
+        histogram = Histogram("test_seconds", "Test latency.", ("endpoint",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.5, 0.7, 3.0):
+            histogram.observe(value, endpoint="nodes")
+
+        text = histogram.expose()
+
+        self.assertIn("# TYPE test_seconds histogram", text)
+        self.assertEqual(_sample(text, 'test_seconds_bucket{endpoint="nodes",le="0.1"}'), 1)
+        self.assertEqual(_sample(text, 'test_seconds_bucket{endpoint="nodes",le="1.0"}'), 3)
+        self.assertEqual(_sample(text, 'test_seconds_bucket{endpoint="nodes",le="+Inf"}'), 4)
+        self.assertAlmostEqual(_sample(text, 'test_seconds_sum{endpoint="nodes"}'), 4.25)
+        self.assertEqual(_sample(text, 'test_seconds_count{endpoint="nodes"}'), 4)
+
+    def test_counter_escapes_labels(self):
+        """Test that label values are escaped."""
+        counter = Counter("test_total", "Test counter.", ("name",))
+        counter.inc(name='say "hi"\n')
+        counter.inc(2, name='say "hi"\n')
+
+        self.assertIn('test_total{name="say \\"hi\\"\\n"} 3', counter.expose())
+
+class TestMetrics(unittest.TestCase):
+    """Test cases for recording and exporting the app's metrics."""
+
+    def setUp(self):
+        enable_metrics()
+        self.addCleanup(disable_metrics)
+        patcher = patch.dict(metrics._sessions, clear=True)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_renders_and_api_calls_are_observed(self):
+        """Test that render and Apstra spans feed the latency histograms and error counters."""
+        before = export_metrics()
+
+        render_template("{{ a }}", {"a": 1})
+        with patch("app.utils.api.apstra_client.get_request", return_value={"error": "HTTP Error: 503"}):
+            apstra_client.get_all_blueprints("apstra", "token")
+
+        after = export_metrics()
+        renders = 'configlet_render_duration_seconds_count'
+        errors = 'configlet_apstra_request_errors_total{endpoint="get_all_blueprints"}'
+        self.assertEqual(_sample(after, renders) - (_sample(before, renders) or 0), 1)
+        self.assertEqual(_sample(after, errors) - (_sample(before, errors) or 0), 1)
+        self.assertIsNotNone(_sample(after, 'configlet_apstra_request_duration_seconds_count{endpoint="get_all_blueprints"}'))
+
+    def test_cache_counters(self):
+        """Test that the caches' hit and miss counters are exported."""
+        text = export_metrics()
+
+        for cache in ("template", "render_memo", "listing"):
+            self.assertIsNotNone(_sample(text, f'configlet_cache_hits_total{{cache="{cache}"}}'))
+            self.assertIsNotNone(_sample(text, f'configlet_cache_misses_total{{cache="{cache}"}}'))
+
+    def test_sessions_and_state_size(self):
+        """Test active session counting, state size estimates and expiry of idle sessions."""
+        record_session("a", {"device_context_data": ["x" * 1000] * 10, "flag": True})
+        record_session("b", {"template": "hostname"})
+
+        text = export_metrics()
+        self.assertEqual(_sample(text, "configlet_active_sessions"), 2)
+        self.assertGreater(_sample(text, "configlet_session_state_bytes"), 1000)
+
+        with patch("app.utils.diagnostics.metrics.time.time", return_value=metrics._sessions["a"]["seen"] + metrics.SESSION_TTL + 1):
+            self.assertEqual(_sample(export_metrics(), "configlet_active_sessions"), 0)
+
+    def test_estimate_size_counts_shared_values_once(self):
+        """Test that values referenced from other keys are skipped."""
+        data = {"interfaces": ["x" * 10000]}
+        derived = (data, "fingerprint")
+
+        alone = estimate_size(derived)
+        skipped = estimate_size(derived, skip={id(data)})
+
+        self.assertGreater(alone, 10000)
+        self.assertLess(skipped, 1000)
+
+    def test_exporters(self):
+        """Test the HTTP endpoint and the metrics file."""
+        server, error = start_metrics_server(0, host="127.0.0.1")
+        self.assertIsNone(error)
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+
+        with urllib.request.urlopen(f"http://127.0.0.1:{server.server_address[1]}/metrics") as response:
+            self.assertEqual(response.headers["Content-Type"], metrics.CONTENT_TYPE)
+            self.assertIn("# TYPE configlet_render_duration_seconds histogram", response.read().decode())
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "configlet.prom")
+            self.assertIsNone(write_metrics_file(path))
+            with open(path, encoding="utf-8") as file:
+                text = file.read()
+        self.assertTrue(all(re.match(r"^(# (HELP|TYPE) |configlet_)", line) for line in text.splitlines()))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,74 @@
+"""
+Unit tests for paged display of rendered output.
+"""
+
+import unittest
+from unittest.mock import patch
+
+from app.utils.data.output_pages import page_offsets, get_page, count_lines, first_page
+from app.utils.ui.output_page_panel import render_output_page
+
+class TestOutputPages(unittest.TestCase):
+    """Test cases for splitting outputs into pages."""
+
+    def test_pages_cover_the_output(self):
+        """Test that the pages hold every line exactly once."""
+        text = "".join(f"line {i}\n" for i in range(25))
+
+        offsets = page_offsets(text, page_lines=10)
+        pages = [get_page(text, offsets, page) for page in range(len(offsets) - 1)]
+
+        self.assertEqual([page.count("\n") for page in pages], [10, 10, 5])
+        self.assertEqual("".join(pages), text)
+        self.assertTrue(pages[1].startswith("line 10\n"))
+
+    def test_last_line_without_line_break(self):
+        """Test that a last line without a line break is kept on the last page."""
+        text = "a\nb\nc"
+
+        offsets = page_offsets(text, page_lines=2)
+
+        self.assertEqual(get_page(text, offsets, 1), "c")
+        self.assertEqual(count_lines(text), 3)
+
+    def test_exact_page_multiple(self):
+        """Test that an output filling its last page does not get an empty page."""
+        self.assertEqual(page_offsets("a\nb\n", page_lines=1), [0, 2, 4])
+        self.assertEqual(page_offsets("", page_lines=1), [0, 0])
+
+    def test_page_is_clamped(self):
+        """Test that out of range page numbers return the nearest page."""
+        text = "a\nb\n"
+        offsets = page_offsets(text, page_lines=1)
+
+        self.assertEqual(get_page(text, offsets, 5), "b\n")
+        self.assertEqual(get_page(text, offsets, -1), "a\n")
+
+    def test_first_page_of_partial_output(self):
+        """Test that only the first page is joined from the chunks rendered so far."""
+        chunks = ["a\nb\n", "c\nd\n", "e\n"]
+
+        self.assertEqual(first_page(chunks, page_lines=3), "a\nb\nc\n")
+        self.assertEqual(first_page(chunks[:1], page_lines=3), "a\nb\n")
+
+class TestOutputPagePanel(unittest.TestCase):
+    """Test cases for displaying one page of an output."""
+
+    @patch('app.utils.ui.output_page_panel.DEFAULT_PAGE_LINES', 10)
+    @patch('app.utils.data.output_pages.DEFAULT_PAGE_LINES', 10)
+    @patch('app.utils.ui.output_page_panel.st')
+    def test_outputs_are_paged_under_their_own_key(self, mock_st):
+        """Test that only the selected page is shown, with a page selector per key."""
+        state = {"fleet_render_output_page": 7}
+        output = "".join(f"line {i}\n" for i in range(25))
+        mock_st.number_input.return_value = 3
+
+        render_output_page(state, output, key="fleet_render_output")
+
+        self.assertEqual(state["fleet_render_output_page"], 3)
+        self.assertEqual(mock_st.number_input.call_args.kwargs["key"], "fleet_render_output_page")
+        mock_st.code.assert_called_once_with(get_page(output, page_offsets(output, 10), 2), language="text", line_numbers=True)
+        self.assertIn("_derived_fleet_render_output_pages", state)
+
+if __name__ == '__main__':
+    unittest.main()
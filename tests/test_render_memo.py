@@ -0,0 +1,130 @@
+"""
+Unit tests for render memoization.
+"""
+
+import unittest
+from unittest.mock import patch
+
+from app.utils.data.data_helpers import fingerprint_data
+from app.utils.data.render_memo import RenderMemo
+from app.utils.config.session_state import get_derived_value
+
+class TestRenderMemo(unittest.TestCase):
+    """Test cases for the render memo."""
+
+    def setUp(self):
+        self.context = {"hostname": "leaf1"}
+        self.fingerprint = fingerprint_data(self.context)
+
+    @patch('app.utils.data.render_memo.render_template')
+    def test_unchanged_inputs_skip_render(self, mock_render):
+        """Test that a rerun with unchanged inputs reuses the previous result."""
+        mock_render.return_value = ("leaf1", None)
+        memo = RenderMemo()
+
+        first = memo.render("{{ hostname }}", self.context, None, self.fingerprint)
+        second = memo.render("{{ hostname }}", self.context, None, self.fingerprint)
+
+        self.assertEqual(first, ("leaf1", None))
+        self.assertEqual(second, first)
+        self.assertEqual(mock_render.call_count, 1)
+        self.assertEqual((memo.hits, memo.misses), (1, 1))
+
+    def test_changed_inputs_render_again(self):
+        """Test that changing the template or a fingerprint renders again."""
+        memo = RenderMemo()
+        other_context = {"hostname": "leaf2"}
+
+        memo.render("{{ hostname }}", self.context, None, self.fingerprint)
+        rendered, _ = memo.render("{{ hostname }}", other_context, None, fingerprint_data(other_context))
+        memo.render("{{ hostname }}!", self.context, None, self.fingerprint)
+
+        self.assertEqual(rendered, "leaf2")
+        self.assertEqual(memo.misses, 3)
+
+    @patch('app.utils.data.render_memo.render_template')
+    def test_errors_are_memoized(self, mock_render):
+        """Test that error results are memoized too."""
+        mock_render.return_value = (None, "Template Syntax Error")
+        memo = RenderMemo()
+
+        memo.render("{% if %}", self.context, None, self.fingerprint)
+        result = memo.render("{% if %}", self.context, None, self.fingerprint)
+
+        self.assertEqual(result, (None, "Template Syntax Error"))
+        self.assertEqual(mock_render.call_count, 1)
+
+    def test_sliced_fingerprints(self):
+        """Test that without fingerprints only changes to the paths the template reads render again."""
+        memo = RenderMemo()
+        context = {"hostname": "leaf1", "interface": {"et-0/0/1": {"mtu": 9216}}}
+
+        memo.render("{{ hostname }}", context, None, slice_context=True)
+        result = memo.render("{{ hostname }}", dict(context, interface={}), None, slice_context=True)
+        changed = memo.render("{{ hostname }}", dict(context, hostname="leaf2"), None, slice_context=True)
+
+        self.assertEqual(result, ("leaf1", None))
+        self.assertEqual(changed, ("leaf2", None))
+        self.assertEqual((memo.hits, memo.misses), (1, 2))
+
+    @patch('app.utils.data.render_memo.render_template')
+    def test_slicing_with_fingerprints(self, mock_render):
+        """Test that precomputed fingerprints still render sliced, memoized apart from unsliced renders."""
+        mock_render.return_value = ("leaf1", None)
+        memo = RenderMemo()
+
+        memo.render("{{ hostname }}", self.context, None, self.fingerprint, slice_context=True)
+        memo.render("{{ hostname }}", self.context, None, self.fingerprint, slice_context=True)
+        memo.render("{{ hostname }}", self.context, None, self.fingerprint, slice_context=False)
+
+        self.assertEqual([call.kwargs["slice_context"] for call in mock_render.call_args_list], [True, False])
+        self.assertEqual((memo.hits, memo.misses), (1, 2))
+
+    def test_full_fingerprints_by_default(self):
+        """Test that without fingerprints or slicing any change to the inputs renders again."""
+        memo = RenderMemo()
+        context = {"hostname": "leaf1", "interface": {"et-0/0/1": {"mtu": 9216}}}
+
+        with patch('app.utils.data.render_memo.DEFAULT_SLICE_CONTEXT', False):
+            memo.render("{{ hostname }}", context, None)
+            memo.render("{{ hostname }}", dict(context), None)
+            memo.render("{{ hostname }}", dict(context, interface={}), None)
+
+        self.assertEqual((memo.hits, memo.misses), (1, 2))
+
+    def test_memo_is_bounded(self):
+        """Test that the memo evicts the least recently used result."""
+        memo = RenderMemo(max_size=2)
+        for template in ("a", "b", "c"):
+            memo.render(template, self.context, None, self.fingerprint)
+
+        self.assertEqual(len(memo), 2)
+
+class TestFingerprints(unittest.TestCase):
+    """Test cases for content fingerprints."""
+
+    def test_fingerprint_is_content_based(self):
+        """Test that equal content gives equal fingerprints regardless of key order."""
+        self.assertEqual(fingerprint_data({"a": 1, "b": 2}), fingerprint_data({"b": 2, "a": 1}))
+        self.assertNotEqual(fingerprint_data({"a": 1}), fingerprint_data({"a": 2}))
+        self.assertTrue(fingerprint_data({1: "a", "b": 2}))
+
+    def test_derived_value_computed_once_per_object(self):
+        """Test that a derived value is only recomputed when the data object changes."""
+        state = {}
+        data = {"a": 1}
+        calls = []
+
+        def compute(value):
+            calls.append(value)
+            return fingerprint_data(value)
+
+        first = get_derived_value(state, "fp", data, compute)
+        second = get_derived_value(state, "fp", data, compute)
+        get_derived_value(state, "fp", {"a": 1}, compute)
+
+        self.assertEqual(first, second)
+        self.assertEqual(len(calls), 2)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,94 @@
+import unittest
+
+from app.utils.data.data_helpers import filter_json
+from app.utils.data.json_tree import container_depths
+from app.utils.data.search_index import (
+    build_search_index, find_paths, search_json, search_result_depths,
+    MATCH_SUBSTRING, MATCH_PREFIX, MATCH_EXACT
+)
+
+class TestSearchIndex(unittest.TestCase):
+    """Test cases for the device-context search index."""
+
+    def setUp(self):
+        self.data = {
+            "hostname": "leaf1",
+            "interface": {
+                "et-0/0/1": {"description": "to spine1", "ipv4_address": "10.0.0.1/31"},
+                "et-0/0/2": {"description": "to spine2", "ipv4_address": "10.0.0.3/31"}
+            },
+            "vlans": [
+                {"id": 10, "name": "data"},
+                {"id": 20, "name": "voice"}
+            ],
+            "tags": ["border", "leaf"]
+        }
+        self.index = build_search_index(self.data)
+
+    def test_substring_match_on_value(self):
+        """Test that a substring of a value returns the enclosing entries."""
+        result = search_json(self.index, self.data, "spine2")
+        self.assertEqual(result, {"interface": {"et-0/0/2": {"description": "to spine2"}}})
+
+    def test_key_match_returns_subtree(self):
+        """Test that matching a key returns its whole subtree."""
+        result = search_json(self.index, self.data, "et-0/0/1")
+        self.assertEqual(result, {"interface": {"et-0/0/1": self.data["interface"]["et-0/0/1"]}})
+
+    def test_list_items(self):
+        """Test that list items are matched and kept in order."""
+        self.assertEqual(search_json(self.index, self.data, "voice"), {"vlans": [{"name": "voice"}]})
+        self.assertEqual(search_json(self.index, self.data, "border"), {"tags": ["border"]})
+
+    def test_prefix_match(self):
+        """Test prefix matching of keys, values and paths."""
+        result = search_json(self.index, self.data, "10.0.0", MATCH_PREFIX)
+        self.assertEqual(len(result["interface"]), 2)
+        self.assertEqual(search_json(self.index, self.data, "0.0.1", MATCH_PREFIX), {})
+        self.assertEqual(search_json(self.index, self.data, "0.0.1", MATCH_SUBSTRING),
+                         {"interface": {"et-0/0/1": {"ipv4_address": "10.0.0.1/31"}}})
+
+    def test_path_match(self):
+        """Test that JSON paths are searchable."""
+        result = search_json(self.index, self.data, "interface.et-0/0/2.ipv4_address", MATCH_EXACT)
+        self.assertEqual(result, {"interface": {"et-0/0/2": {"ipv4_address": "10.0.0.3/31"}}})
+
+    def test_exact_match(self):
+        """Test that exact matching ignores partial matches and case."""
+        self.assertEqual(search_json(self.index, self.data, "LEAF", MATCH_EXACT), {"tags": ["leaf"]})
+        self.assertEqual(search_json(self.index, self.data, "lea", MATCH_EXACT), {})
+
+    def test_nested_matches_collapse(self):
+        """Test that a match inside another match is not reported separately."""
+        paths = find_paths(self.index, "interface")
+        self.assertEqual(paths, [("interface",)])
+
+    def test_no_match_and_empty_query(self):
+        """Test empty results and empty queries."""
+        self.assertEqual(search_json(self.index, self.data, "nonexistent"), {})
+        self.assertIs(search_json(self.index, self.data, ""), self.data)
+
+    def test_results_are_reused(self):
+        """Test that repeating a query returns the same result object."""
+        result = search_json(self.index, self.data, "spine")
+
+        self.assertIs(search_json(self.index, self.data, " Spine "), result)
+        self.assertIsNot(search_json(self.index, self.data, "spine", MATCH_EXACT), result)
+
+    def test_result_depths_match_a_full_walk(self):
+        """Test that result depths from the index equal the depths of walking the result."""
+        for query in ("spine2", "interface", "voice", "leaf"):
+            result = search_json(self.index, self.data, query)
+            expected = container_depths(result)
+            depths = search_result_depths(self.index, result)
+
+            self.assertEqual({key: depths[key] for key in expected}, expected, query)
+
+    def test_filter_json_exact_match(self):
+        """Test the exact_match option of filter_json."""
+        result = filter_json(self.data, "leaf1", exact_match=True)
+        self.assertEqual(result, {"hostname": "leaf1"})
+        self.assertEqual(filter_json(self.data, "leaf", exact_match=True), {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,88 @@
+"""
+Unit tests for page sections and run timings.
+"""
+
+import unittest
+from unittest.mock import patch, MagicMock
+
+from app.utils.ui import sections
+
+class TestSections(unittest.TestCase):
+    """Test cases for running page sections."""
+
+    def setUp(self):
+        self.state = {}
+        patcher = patch('app.utils.ui.sections.get_state', return_value=self.state)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_app_run_records_section_times(self):
+        """Test that a full run records the time of every section it ran."""
+        calls = []
+        sections.start_app_run()
+        sections.render_section("sidebar", lambda: calls.append("sidebar"), fragment=False)
+        sections.render_section("template", lambda: calls.append("template"), fragment=False)
+        sections.finish_app_run()
+
+        timings = sections.get_run_timings()
+        self.assertEqual(calls, ["sidebar", "template"])
+        self.assertEqual(len(timings), 1)
+        self.assertEqual(timings[0]["scope"], "app")
+        self.assertEqual(set(timings[0]["sections"]), {"sidebar", "template"})
+        self.assertGreaterEqual(timings[0]["seconds"], 0)
+
+    def test_section_rerun_is_recorded_on_its_own(self):
+        """Test that a section running outside an app run is recorded as its own run."""
+        sections.render_section("context", lambda: None, fragment=False)
+
+        timings = sections.get_run_timings()
+        self.assertEqual([run["scope"] for run in timings], ["context"])
+
+    def test_history_is_bounded(self):
+        """Test that only the most recent runs are kept."""
+        for _ in range(sections.RUN_TIMING_HISTORY + 5):
+            sections.render_section("context", lambda: None, fragment=False)
+
+        self.assertEqual(len(sections.get_run_timings()), sections.RUN_TIMING_HISTORY)
+
+    @patch('app.utils.ui.sections.st')
+    def test_sections_run_as_fragments(self, mock_st):
+        """Test that sections are wrapped in a fragment when enabled."""
+        mock_st.fragment.side_effect = lambda func, run_every=None: func
+        calls = []
+
+        with patch.object(sections, "FRAGMENTS_ENABLED", True):
+            sections.render_section("context", lambda: calls.append("context"))
+            sections.render_section("output", lambda: calls.append("output"), run_every=0.2)
+
+        self.assertEqual(mock_st.fragment.call_args_list[1].kwargs, {"run_every": 0.2})
+        self.assertEqual(calls, ["context", "output"])
+
+    def test_nested_sections_are_timed_with_their_section(self):
+        """Test that a section drawn inside another is not recorded on its own."""
+        rerunning = []
+
+        def render_template():
+            sections.render_section("output", lambda: rerunning.append(sections.section_rerunning("output")), fragment=False)
+
+        sections.render_section("template", render_template, fragment=False)
+        sections.render_section("output", lambda: rerunning.append(sections.section_rerunning("output")), fragment=False)
+
+        timings = sections.get_run_timings()
+        self.assertEqual([run["scope"] for run in timings], ["template", "output"])
+        self.assertEqual(rerunning, [False, True])
+
+    @patch('app.utils.ui.sections.st')
+    def test_changed_render_inputs_rerun_the_app(self, mock_st):
+        """Test that the whole app reruns only when a render input changed."""
+        self.state.update(prop_error=None, prop_set_loaded=False)
+
+        sections.update_render_inputs(self.state, prop_error=None, prop_set_loaded=False)
+        mock_st.rerun.assert_not_called()
+
+        sections.update_render_inputs(self.state, prop_error="Invalid YAML", prop_set_loaded=False)
+        mock_st.rerun.assert_called_once_with()
+        self.assertEqual(self.state["prop_error"], "Invalid YAML")
+
+if __name__ == '__main__':
+    unittest.main()
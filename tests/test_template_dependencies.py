@@ -0,0 +1,186 @@
+import unittest
+
+import jinja2
+
+from app.utils.data.template_dependencies import (
+    analyze_template_ast, format_dependency, reduce_paths, project_context, WILDCARD, KEYS, WHOLE_CONTEXT
+)
+from app.utils.data.template_engine import render_template
+
+class TestTemplateDependencies(unittest.TestCase):
+    """Test cases for the Jinja2 AST dependency analyzer."""
+
+    def setUp(self):
+        self.environment = jinja2.Environment()
+
+    def analyze(self, source):
+        return analyze_template_ast(self.environment.parse(source), self.environment.globals)
+
+    def test_variables_and_attribute_paths(self):
+        """Test plain variables, attribute and subscript paths."""
+        self.assertEqual(
+            self.analyze("{{ hostname }} {{ interface['IF-et-0/0/1'].mtu }} {{ vlans[0].id }}"),
+            {("hostname",), ("interface", "IF-et-0/0/1", "mtu"), ("vlans", 0, "id")}
+        )
+
+    def test_for_loop_items(self):
+        """Test that loop variables map to wildcard paths."""
+        source = "{% for name, data in interface.items() %}{{ name }} {{ data.ipv4_address }}{% endfor %}"
+        self.assertEqual(self.analyze(source), {("interface", WILDCARD, "ipv4_address")})
+
+    def test_loop_without_used_values_reads_keys(self):
+        """Test that a loop whose variable is unused only needs the keys."""
+        self.assertEqual(self.analyze("{% for i in interface %}-{% endfor %}"), {("interface", KEYS)})
+
+    def test_set_if_and_default(self):
+        """Test references through set, if conditions and default values."""
+        source = (
+            "{% set lo = ip['lo0.0'] %}{% if role == 'leaf' %}"
+            "{{ lo.ipv4_address }} {{ bgp.asn | default(fallback_asn) }}{% endif %}"
+        )
+        self.assertEqual(
+            self.analyze(source),
+            {("role",), ("ip", "lo0.0", "ipv4_address"), ("bgp", "asn"), ("fallback_asn",)}
+        )
+
+    def test_unused_set_still_requires_value(self):
+        """Test that an evaluated but unused assignment is still a dependency."""
+        self.assertEqual(self.analyze("{% set lo = ip['lo0.0'] %}"), {("ip", "lo0.0")})
+
+    def test_filters_with_attributes(self):
+        """Test selectattr, sort and map with attribute arguments."""
+        source = (
+            "{% for v in vlans | selectattr('enabled') | sort(attribute='id') %}{{ v.name }}{% endfor %}"
+            "{{ vrfs | map(attribute='rd') | join(',') }}"
+        )
+        self.assertEqual(self.analyze(source), {
+            ("vlans", WILDCARD, "enabled"), ("vlans", WILDCARD, "id"),
+            ("vlans", WILDCARD, "name"), ("vrfs", WILDCARD, "rd")
+        })
+
+    def test_whole_value_use_covers_paths(self):
+        """Test that using a value as a whole covers paths below it."""
+        source = "{{ interface | tojson }}{% for k, v in interface.items() %}{{ v.mtu }}{% endfor %}"
+        self.assertEqual(self.analyze(source), {("interface",)})
+
+    def test_locals_and_globals_are_not_dependencies(self):
+        """Test that loop, namespace and environment globals are not context paths."""
+        source = (
+            "{% set ns = namespace(count=0) %}{% for i in range(3) %}{{ loop.index }}"
+            "{% set ns.count = ns.count + 1 %}{% endfor %}{{ ns.count }}"
+        )
+        self.assertEqual(self.analyze(source), frozenset())
+
+    def test_macro_arguments_are_read_whole(self):
+        """Test that macro arguments are recorded as read in full."""
+        source = "{% macro m(x) %}{{ x.a }}{{ hostname }}{% endmacro %}{{ m(foo.bar) }}"
+        self.assertEqual(self.analyze(source), {("foo", "bar"), ("hostname",)})
+
+    def test_filtered_collections_are_renumbered(self):
+        """Test that indexing a filtered or sorted collection reads every element."""
+        self.assertEqual(
+            self.analyze("{{ (xs|selectattr('a')|list)[0].name }}"),
+            {("xs", WILDCARD, "a"), ("xs", WILDCARD, "name")}
+        )
+        self.assertEqual(self.analyze("{{ (interface|dictsort)[0][1].desc }}"), {("interface", WILDCARD, "desc")})
+
+    def test_loop_neighbours_are_elements(self):
+        """Test that loop.previtem and loop.nextitem read elements of the iterable."""
+        source = "{% for x in xs %}{{ loop.previtem.a if not loop.first }}{% endfor %}"
+        self.assertEqual(self.analyze(source), {("xs", WILDCARD, "a")})
+
+    def test_includes_read_the_whole_context(self):
+        """Test that a template the analysis can't follow depends on the whole context."""
+        self.assertEqual(self.analyze("{{ a.b }}{% include 'other' %}"), {WHOLE_CONTEXT})
+
+    def test_reduce_paths(self):
+        """Test that covered paths are removed."""
+        paths = {("a",), ("a", "b"), ("c", WILDCARD), ("c", "d", "e"), ("c", KEYS), ("f", KEYS), ("f", "g")}
+        self.assertEqual(reduce_paths(paths), {("a",), ("c", WILDCARD), ("f", KEYS), ("f", "g")})
+
+    def test_format_dependency(self):
+        """Test the display format of paths."""
+        self.assertEqual(format_dependency(("interface", WILDCARD, "ipv4_address")), "interface.*.ipv4_address")
+        self.assertEqual(format_dependency(("ip", "lo0.0", "mtu")), "ip['lo0.0'].mtu")
+        self.assertEqual(format_dependency(("vlans", 0)), "vlans[0]")
+        self.assertEqual(format_dependency(("interface", KEYS)), "interface.keys()")
+
+class TestProjectContext(unittest.TestCase):
+    """Test cases for projecting a context onto dependency paths."""
+
+    def setUp(self):
+        self.context = {
+            "hostname": "leaf1",
+            "interface": {
+                "et-0/0/1": {"mtu": 9216, "description": "uplink"},
+                "et-0/0/2": {"mtu": 1500, "description": "server"},
+            },
+            "vlans": [{"id": 10, "name": "a"}, {"id": 20, "name": "b"}, {"id": 30, "name": "c"}],
+        }
+
+    def test_keeps_only_dependency_paths(self):
+        """Test that keys off every path are dropped and full subtrees are shared."""
+        projected = project_context(self.context, {("hostname",), ("interface", "et-0/0/1")})
+        self.assertEqual(projected, {
+            "hostname": "leaf1",
+            "interface": {"et-0/0/1": {"mtu": 9216, "description": "uplink"}},
+        })
+        self.assertIs(projected["interface"]["et-0/0/1"], self.context["interface"]["et-0/0/1"])
+
+    def test_wildcards_and_keys(self):
+        """Test wildcard paths and paths that read only the keys of a mapping."""
+        self.assertEqual(
+            project_context(self.context, {("interface", WILDCARD, "mtu")}),
+            {"interface": {"et-0/0/1": {"mtu": 9216}, "et-0/0/2": {"mtu": 1500}}}
+        )
+        self.assertEqual(
+            project_context(self.context, {("interface", KEYS)}),
+            {"interface": {"et-0/0/1": None, "et-0/0/2": None}}
+        )
+
+    def test_lists_keep_their_length(self):
+        """Test that list positions are preserved, including negative indexes."""
+        self.assertEqual(
+            project_context(self.context, {("vlans", 0, "id"), ("vlans", -1, "name")}),
+            {"vlans": [{"id": 10}, None, {"name": "c"}]}
+        )
+
+    def test_none_and_empty_paths(self):
+        """Test a missing property set and a template reading nothing."""
+        self.assertIsNone(project_context(None, {("hostname",)}))
+        self.assertEqual(project_context(self.context, set()), {})
+
+class TestSlicedRenders(unittest.TestCase):
+    """Test cases checking that sliced renders match renders of the full context."""
+
+    context = {
+        "interface": {"et-0/0/1": {"desc": "uplink", "mtu": 9216}, "et-0/0/0": {"desc": "server", "mtu": 1500}},
+        "xs": [{"a": 1, "name": "one"}, {"a": 3, "name": "three"}, {"a": 2, "name": "two"}],
+    }
+
+    templates = [
+        "{{ (interface|list)[0] }}",
+        "{{ (xs|reverse|list)[0].name }}",
+        "{% set y = xs|selectattr('a','gt',1)|list %}{{ y[0].name }}",
+        "{{ (xs|sort(attribute='a', reverse=true))[0].name }}",
+        "{{ (interface|dictsort)[0][1].desc }}",
+        "{{ (interface.items()|list)[0][1].desc }}",
+        "{{ (interface|dictsort|sort(attribute='1.mtu'))[0][0] }}",
+        "{{ (xs[1:])[0].name }}",
+        "{{ (xs|batch(2)|list)[1][0].name }}",
+        "{% for x in xs %}{{ loop.nextitem.a if not loop.last }}{% endfor %}",
+        "{% for x in xs %}{{ loop.previtem.a if not loop.first }}{% endfor %}",
+        "{% for k, v in interface|dictsort %}{{ loop.previtem[1].desc if not loop.first }}{% endfor %}",
+        "{% for x in xs %}{{ loop.cycle(xs[0], xs[1]).name }}{% endfor %}",
+    ]
+
+    def test_sliced_output_is_identical(self):
+        """Test sliced and unsliced renders of templates reading reordered or neighbouring elements."""
+        for template in self.templates:
+            with self.subTest(template=template):
+                expected = render_template(template, self.context, slice_context=False)
+                self.assertIsNone(expected[1])
+                self.assertEqual(render_template(template, self.context, slice_context=True), expected)
+
+if __name__ == '__main__':
+    unittest.main()
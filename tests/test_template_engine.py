@@ -1,6 +1,19 @@
 # tests/test_template_engine.py
+import time
 import unittest
-from app.utils.data.template_engine import render_template
+import unittest.mock
+import os
+import tempfile
+from app.utils.data.template_engine import (
+    render_template,
+    get_compiled_template,
+    get_template_cache_stats,
+    clear_template_cache,
+    configure_bytecode_cache,
+    get_bytecode_cache_stats,
+    get_template_dependencies,
+    slice_render_context
+)
 
 class TestTemplateEngine(unittest.TestCase):
     """Test cases for the template engine."""
@@ -47,5 +60,312 @@ class TestTemplateEngine(unittest.TestCase):
         self.assertIsNotNone(error)
         self.assertIn("Undefined variable", error)
 
+    def test_nested_property_set_merge(self):
+        """Test that nested property set values override the device context."""
+        template = "{{ interface.et1.mtu }} {{ interface.et1.description }} {{ interface | tojson }}"
+        context = {"interface": {"et1": {"description": "uplink", "mtu": 1500}}}
+        property_set = {"interface": {"et1": {"mtu": 9216}}}
+
+        rendered, error = render_template(template, context, property_set)
+
+        self.assertIsNone(error)
+        self.assertEqual(
+            rendered,
+            '9216 uplink {"et1": {"description": "uplink", "mtu": 9216}}'
+        )
+        self.assertEqual(context["interface"]["et1"]["mtu"], 1500)
+
+    def test_invalid_property_set(self):
+        """Test that a property set that is not a dictionary is reported."""
+        rendered, error = render_template("{{ a }}", {"a": 1}, ["not", "a", "dict"])
+
+        self.assertIsNone(rendered)
+        self.assertIn("Error merging property set", error)
+
+class TestTemplateCache(unittest.TestCase):
+    """Test cases for the compiled-template cache."""
+
+    def setUp(self):
+        clear_template_cache()
+
+    def test_repeat_render_hits_cache(self):
+        """Test that rendering an unchanged template reuses the compiled template."""
+        template = "{{ hostname }}"
+        render_template(template, {"hostname": "leaf1"})
+        rendered, error = render_template(template, {"hostname": "leaf2"})
+
+        self.assertIsNone(error)
+        self.assertEqual(rendered, "leaf2")
+        stats = get_template_cache_stats()
+        self.assertEqual(stats["misses"], 1)
+        self.assertEqual(stats["hits"], 1)
+        self.assertIs(get_compiled_template(template), get_compiled_template(template))
+
+    def test_cache_is_bounded(self):
+        """Test that the least recently used template is evicted at the size limit."""
+        from app.utils.data import template_engine
+
+        with unittest.mock.patch.object(template_engine, "TEMPLATE_CACHE_SIZE", 2):
+            first = get_compiled_template("a")
+            get_compiled_template("b")
+            get_compiled_template("c")
+
+            self.assertEqual(get_template_cache_stats()["size"], 2)
+            self.assertIsNot(get_compiled_template("a"), first)
+
+    def test_syntax_error_is_not_cached(self):
+        """Test that templates failing to compile are not stored."""
+        render_template("{% if x %}", {"x": True})
+
+        self.assertEqual(get_template_cache_stats()["size"], 0)
+
+class TestTemplateDependencyCache(unittest.TestCase):
+    """Test cases for the cached dependency analysis."""
+
+    def setUp(self):
+        clear_template_cache()
+
+    def test_analysis_shares_the_render_parse(self):
+        """Test that rendering and dependency analysis parse the source once."""
+        from app.utils.data import template_engine
+
+        template = "{% for name, data in interface.items() %}{{ data.mtu }}{% endfor %}"
+        environment = template_engine.get_environment()
+        with unittest.mock.patch.object(environment, "parse", wraps=environment.parse) as parse:
+            render_template(template, {"interface": {"et-0/0/1": {"mtu": 9216}}})
+            dependencies = get_template_dependencies(template)
+            get_template_dependencies(template)
+
+        self.assertEqual(parse.call_count, 1)
+        self.assertEqual(dependencies, frozenset({("interface", "*", "mtu")}))
+
+    def test_analysis_before_render(self):
+        """Test that analyzing first also caches the compiled template."""
+        get_template_dependencies("{{ hostname }}")
+        rendered, error = render_template("{{ hostname }}", {"hostname": "leaf1"})
+
+        self.assertEqual(rendered, "leaf1")
+        self.assertEqual(get_template_cache_stats()["hits"], 1)
+
+    def test_syntax_error(self):
+        """Test that unparsable templates raise TemplateSyntaxError."""
+        import jinja2
+
+        with self.assertRaises(jinja2.exceptions.TemplateSyntaxError):
+            get_template_dependencies("{% if x %}")
+
+class TestContextSlicing(unittest.TestCase):
+    """Test cases for rendering against the sliced context."""
+
+    def setUp(self):
+        self.context = {
+            "hostname": "leaf1",
+            "role": "leaf",
+            "interface": {
+                "et-0/0/1": {"mtu": 9216, "description": "uplink", "ips": ["10.0.0.1/31"]},
+                "et-0/0/2": {"mtu": 1500},
+            },
+            "vlans": [{"id": 10, "name": "a"}, {"id": 20}],
+            "unused": {"large": list(range(100))},
+        }
+        self.property_set = {"ntp": {"servers": ["10.1.1.1"]}, "interface": {"et-0/0/2": {"mtu": 9000}}}
+
+    def test_sliced_render_matches_full_render(self):
+        """Test that slicing never changes the output or the error."""
+        templates = [
+            "{{ hostname }} {{ interface['et-0/0/1'].mtu }}",
+            "{% for name, data in interface.items() %}{{ name }} {{ data.mtu }} {{ data.description | default('-') }}\n{% endfor %}",
+            "{% for name in interface %}{{ name }}{% endfor %} {{ interface | length }}",
+            "{% set first = vlans[0] %}{{ first.id }} {{ vlans[-1].id }} {{ vlans | map(attribute='id') | join(',') }}",
+            "{% for vlan in vlans %}{{ loop.index }}:{{ vlan.name | default('none') }} {% endfor %}",
+            "{% if role == 'leaf' %}{{ ntp.servers | join(' ') }}{% endif %}",
+            "{{ hostname.upper() }} {{ interface['et-0/0/1'].ips[0].split('/')[0] }}",
+            "{{ missing.key }}",
+            "{{ interface['et-0/0/3'].mtu }}",
+            "{{ interface | tojson }}",
+        ]
+        for template in templates:
+            with self.subTest(template=template):
+                self.assertEqual(
+                    render_template(template, self.context, self.property_set, slice_context=True),
+                    render_template(template, self.context, self.property_set, slice_context=False)
+                )
+
+    def test_slice_contains_only_dependencies(self):
+        """Test that the slices hold only the paths the template reads."""
+        device_context, property_set = slice_render_context(
+            "{{ hostname }} {{ ntp.servers[0] }}", self.context, self.property_set
+        )
+
+        self.assertEqual(device_context, {"hostname": "leaf1"})
+        self.assertEqual(property_set, {"ntp": {"servers": ["10.1.1.1"]}})
+
+    def test_syntax_error_is_reported(self):
+        """Test that slicing an unparsable template still returns the syntax error."""
+        rendered, error = render_template("{% if x %}", self.context, slice_context=True)
+
+        self.assertIsNone(rendered)
+        self.assertIn("Template Syntax Error", error)
+
+class TestRenderBudget(unittest.TestCase):
+    """Test cases for the render time and output budget and the sandbox."""
+
+    def test_timeout_stops_runaway_loops(self):
+        """Test that a loop producing no output is stopped at the deadline."""
+        template = "{% for i in range(100000) %}{% for j in range(100000) %}{% endfor %}{% endfor %}"
+
+        rendered, error = render_template(template, {}, timeout=0.2)
+
+        self.assertIsNone(rendered)
+        self.assertIn("Render Budget Exceeded", error)
+        self.assertIn("0.2 seconds", error)
+
+    def test_timeout_stops_loops_over_lists(self):
+        """Test that nested loops without lookups or calls are stopped close to the deadline."""
+        template = "{% set x = range(20000)|list %}{% for i in x %}{% for j in x %}{% endfor %}{% endfor %}"
+
+        start = time.monotonic()
+        rendered, error = render_template(template, {}, timeout=0.2)
+
+        self.assertIsNone(rendered)
+        self.assertIn("Render Budget Exceeded", error)
+        self.assertLess(time.monotonic() - start, 1.0)
+
+    def test_timeout_stops_recursive_macros(self):
+        """Test that a recursive macro fanning out is stopped at the deadline."""
+        template = (
+            "{% macro walk(n) %}{% for i in range(10) %}{{ walk(n + 1) if n < 20 else '' }}{% endfor %}{% endmacro %}"
+            "{{ walk(0) }}"
+        )
+
+        rendered, error = render_template(template, {}, timeout=0.2)
+
+        self.assertIsNone(rendered)
+        self.assertIn("took longer than", error)
+
+    def test_chunks_are_streamed_while_rendering(self):
+        """Test that on_chunk receives the whole output in order while rendering."""
+        chunks = []
+
+        rendered, error = render_template(
+            "{% for i in range(1000) %}{{ i }}\n{% endfor %}", {}, on_chunk=chunks.extend
+        )
+
+        self.assertIsNone(error)
+        self.assertEqual("".join(chunks), rendered)
+
+    def test_output_limit(self):
+        """Test that rendering stops once the output exceeds the limit."""
+        rendered, error = render_template("{% for i in range(100000) %}0123456789{% endfor %}", {}, max_output=1000)
+        self.assertIsNone(rendered)
+        self.assertIn("exceeded 1000 characters", error)
+
+        # Repeating a string is checked before the result is built
+        rendered, error = render_template("{{ 'x' * 10000000000 }}", {}, max_output=1000)
+        self.assertIn("exceeded 1000 characters", error)
+
+    def test_concatenation_and_formatting_limits(self):
+        """Test that joining and formatting strings are checked before the result is built."""
+        template = "{% set s = namespace(v='x' * 100) %}{% for i in range(30) %}{% set s.v = s.v + s.v %}{% endfor %}"
+        rendered, error = render_template(template, {}, max_output=1000)
+        self.assertIn("exceeded 1000 characters", error)
+
+        for template in ("{{ '%0999999999d' % 1 }}", "{{ '%.999999999f' % 1.5 }}", "{{ '%*s' % (999999999, 'x') }}"):
+            rendered, error = render_template(template, {}, max_output=1000)
+            self.assertIsNone(rendered, template)
+            self.assertIn("exceeded 1000 characters", error)
+
+        rendered, error = render_template("{{ '%s-%05d' % ('leaf', 7) }} {{ 7 % 4 }} {{ 'a' + 'b' }} {{ 1 + 2 }}", {})
+        self.assertIsNone(error)
+        self.assertEqual(rendered, "leaf-00007 3 ab 3")
+
+    def test_limits_can_be_disabled(self):
+        """Test that a budget of 0 disables the limit."""
+        rendered, error = render_template("{{ 'x' * 5000 }}", {}, timeout=0, max_output=0)
+
+        self.assertIsNone(error)
+        self.assertEqual(len(rendered), 5000)
+
+    def test_sandbox(self):
+        """Test that unsafe attributes, huge ranges and huge powers are refused."""
+        rendered, error = render_template("{{ hostname.__class__.__mro__ }}", {"hostname": "leaf1"})
+        self.assertIn("Template Security Error", error)
+
+        rendered, error = render_template("{{ range(1000000000) | length }}", {})
+        self.assertIsNone(rendered)
+        self.assertIn("Range too big", error)
+
+        rendered, error = render_template("{{ 2 ** 100000000 }}", {})
+        self.assertIn("too large", error)
+
+    def test_budget_does_not_change_output(self):
+        """Test that ordinary templates render as before."""
+        template = "{% for name, data in interface.items() %}{{ name }} {{ data.mtu * 2 }} {{ '-' * 3 }}\n{% endfor %}"
+
+        rendered, error = render_template(template, {"interface": {"et-0/0/1": {"mtu": 1500}}})
+
+        self.assertIsNone(error)
+        self.assertEqual(rendered, "et-0/0/1 3000 ---\n")
+
+class TestBytecodeCache(unittest.TestCase):
+    """Test cases for the on-disk bytecode cache."""
+
+    def setUp(self):
+        self.cache_dir = tempfile.TemporaryDirectory()
+        clear_template_cache()
+
+    def tearDown(self):
+        configure_bytecode_cache(None)
+        clear_template_cache()
+        self.cache_dir.cleanup()
+
+    def test_cold_start_loads_bytecode(self):
+        """Test that a restart with an empty memory cache reuses bytecode from disk."""
+        configure_bytecode_cache(self.cache_dir.name)
+        template = "{% for i in items %}{{ i }}{% endfor %}"
+        render_template(template, {"items": [1, 2]})
+
+        # Simulate a restart: new cache instance, empty in-memory cache
+        clear_template_cache()
+        configure_bytecode_cache(self.cache_dir.name)
+        rendered, error = render_template(template, {"items": [3, 4]})
+
+        self.assertIsNone(error)
+        self.assertEqual(rendered, "34")
+        stats = get_bytecode_cache_stats()
+        self.assertTrue(stats["enabled"])
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["entries"], 1)
+        self.assertEqual(stats["hit_rate"], 1.0)
+        # Bytecode loaded from disk has no AST, so the analysis parses on demand
+        self.assertEqual(get_template_dependencies(template), frozenset({("items", "*")}))
+
+    def test_size_limit_evicts_entries(self):
+        """Test that the cache directory is kept under its size limit."""
+        configure_bytecode_cache(self.cache_dir.name, max_bytes=1)
+        render_template("{{ a }}", {"a": 1})
+        render_template("{{ b }}", {"b": 2})
+
+        stats = get_bytecode_cache_stats()
+        self.assertLessEqual(stats["size_bytes"], 1)
+        self.assertEqual(len(os.listdir(self.cache_dir.name)), 0)
+
+    def test_sandboxed_bytecode_is_kept_apart(self):
+        """Test that sandboxed and plain environments never share bytecode."""
+        import jinja2
+        from app.utils.data.template_engine import get_environment
+
+        cache = configure_bytecode_cache(self.cache_dir.name)
+        plain = jinja2.Environment()
+        sandboxed_bucket = cache.get_bucket(get_environment(), "key", None, "{{ a }}")
+        plain_bucket = cache.get_bucket(plain, "key", None, "{{ a }}")
+
+        self.assertNotEqual(sandboxed_bucket.key, plain_bucket.key)
+
+    def test_disabled_by_default(self):
+        """Test that the cache reports disabled when no directory is configured."""
+        configure_bytecode_cache(None)
+        self.assertEqual(get_bytecode_cache_stats(), {"enabled": False})
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
@@ -0,0 +1,103 @@
+"""
+Unit tests for template render profiling.
+"""
+
+import json
+import sys
+import unittest
+
+from app.utils.data.template_engine import render_template
+from app.utils.data.template_profiler import TemplateProfiler, merge_profile_reports
+from app.utils.data.fleet_render import render_fleet
+
+TEMPLATE = """hostname {{ hostname }}
+{% macro describe(name) -%}
+description {{ name | upper }}
+{%- endmacro %}
+{% for interface in interfaces %}
+interface {{ interface.name }}
+{% for vlan in interface.vlans %}
+ vlan {{ vlan }}
+{% endfor %}
+{{ describe(interface.name) }}
+{% endfor %}
+"""
+
+CONTEXT = {
+    "hostname": "leaf1",
+    "interfaces": [{"name": f"et-0/0/{i}", "vlans": list(range(20))} for i in range(4)],
+}
+
+class TestTemplateProfiler(unittest.TestCase):
+    """Test cases for the template profiler."""
+
+    def profile(self, template=TEMPLATE, context=CONTEXT):
+        profiler = TemplateProfiler(template)
+        output, error = render_template(template, context, profiler=profiler)
+        self.assertIsNone(error)
+        return output, profiler.report()
+
+    def test_output_is_unchanged(self):
+        """Test that a profiled render produces the same output as a plain render."""
+        output, _ = self.profile()
+        expected, error = render_template(TEMPLATE, CONTEXT)
+
+        self.assertIsNone(error)
+        self.assertEqual(output, expected)
+
+    def test_loop_iterations_are_counted(self):
+        """Test that every for loop reports its total number of iterations."""
+        _, report = self.profile()
+
+        loops = {block["line"]: block["iterations"] for block in report["blocks"] if block["kind"] == "for"}
+        self.assertEqual(loops, {5: 4, 7: 80})
+
+    def test_times_are_mapped_to_lines_and_blocks(self):
+        """Test that time is reported per template line and per block."""
+        _, report = self.profile()
+
+        lines = {line["line"]: line for line in report["lines"]}
+        self.assertIn(8, lines)
+        self.assertEqual(lines[8]["source"], "vlan {{ vlan }}")
+        self.assertGreater(report["total_time"], 0)
+        self.assertTrue(all(line["time"] >= 0 for line in report["lines"]))
+
+        kinds = {block["kind"] for block in report["blocks"]}
+        self.assertIn("macro describe", kinds)
+        outer = next(block for block in report["blocks"] if block["line"] == 5)
+        inner = next(block for block in report["blocks"] if block["line"] == 7)
+        self.assertEqual(outer["end_line"], 10)
+        self.assertGreaterEqual(outer["time"], inner["time"])
+        json.dumps(report)
+
+    def test_trace_function_is_restored(self):
+        """Test that profiling restores the trace function that was active."""
+        previous = sys.gettrace()
+        self.profile()
+
+        self.assertIs(sys.gettrace(), previous)
+
+    def test_merge_reports(self):
+        """Test that reports of many renders are summed."""
+        _, first = self.profile()
+        _, second = self.profile()
+
+        merged = merge_profile_reports([first, None, second])
+
+        self.assertEqual(merged["renders"], 2)
+        self.assertAlmostEqual(merged["total_time"], first["total_time"] + second["total_time"])
+        loops = {block["line"]: block["iterations"] for block in merged["blocks"] if block["kind"] == "for"}
+        self.assertEqual(loops, {5: 8, 7: 160})
+
+    def test_fleet_profile(self):
+        """Test that a profiled fleet render reports per device and merged profiles."""
+        contexts = {"n1": CONTEXT, "n2": dict(CONTEXT, hostname="leaf2")}
+
+        report = render_fleet(TEMPLATE, contexts, max_workers=1, profile=True)
+
+        self.assertEqual(report["profile"]["renders"], 2)
+        self.assertIsNotNone(report["results"]["n1"]["profile"])
+        self.assertNotIn("profile", render_fleet(TEMPLATE, contexts, max_workers=1))
+
+if __name__ == '__main__':
+    unittest.main()
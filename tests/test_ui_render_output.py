@@ -2,6 +2,7 @@
 Unit tests for the render output UI component.
 """
 
+import importlib
 import unittest
 from unittest.mock import patch, MagicMock
 import streamlit as st
@@ -40,4 +41,77 @@ class TestRenderOutput(unittest.TestCase):
         render_output()
         
         # Assert template engine was called with correct parameters
-        mock_
\ No newline at end of file
+        mock_
+
+
+class TestRenderOutputSection(unittest.TestCase):
+    """Test cases for polling a pending render from the output section."""
+
+    def setUp(self):
+        self.state = MagicMock()
+        patcher = patch('app.ui.render_output.get_state', return_value=self.state)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def _render_section(self, wait):
+        module = importlib.import_module('app.ui.render_output')
+        self.status = ("", None, False, None, [])
+
+        def poll_render(state):
+            state.live_render_wait = wait
+            return self.status
+
+        with patch.object(module, 'poll_render', side_effect=poll_render) as self.mock_poll, \
+                patch.object(module, 'render_section') as mock_render_section:
+            module.render_output_section()
+        return mock_render_section
+
+    def test_pending_render_is_polled_on_a_timer(self):
+        """Test that the output section reruns on a timer while a render is pending."""
+        from app.ui.render_output import LIVE_RENDER_POLL_SECONDS
+
+        mock_render_section = self._render_section(0.3)
+
+        args, kwargs = mock_render_section.call_args
+        self.assertEqual(args[0], "output_live")
+        self.assertEqual(kwargs, {"run_every": LIVE_RENDER_POLL_SECONDS})
+
+    def test_finished_render_is_not_polled(self):
+        """Test that the output section has no timer once nothing is pending."""
+        mock_render_section = self._render_section(None)
+
+        args, kwargs = mock_render_section.call_args
+        self.assertEqual(args[0], "output")
+        self.assertEqual(kwargs, {})
+
+    @patch('app.ui.render_output.render_live_output')
+    @patch('app.ui.render_output.render_output')
+    def test_inputs_are_polled_once_per_run(self, mock_render_output, mock_render_live_output):
+        """Test that the section is drawn from the poll that chose it, and its reruns poll again."""
+        for wait, mock_render in ((None, mock_render_output), (0.3, mock_render_live_output)):
+            render = self._render_section(wait).call_args.args[1]
+
+            render()
+            mock_render.assert_called_once_with(self.status)
+            render()
+            mock_render.assert_called_with(None)
+            self.assertEqual(self.mock_poll.call_count, 1)
+
+    @patch('app.ui.render_output.st')
+    @patch('app.ui.render_output.render_output')
+    def test_timer_is_dropped_once_rendered(self, mock_render_output, mock_st):
+        """Test that the app reruns once when a polled render has finished."""
+        from app.ui.render_output import render_live_output
+
+        self.state.live_render_wait = None
+        with patch('app.ui.render_output.section_rerunning', return_value=True):
+            render_live_output()
+        mock_st.rerun.assert_called_once_with()
+
+        mock_st.rerun.reset_mock()
+        with patch('app.ui.render_output.section_rerunning', return_value=False):
+            render_live_output()
+        mock_st.rerun.assert_not_called()
+
+if __name__ == '__main__':
+    unittest.main()
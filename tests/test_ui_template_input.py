@@ -121,6 +121,18 @@ class TestTemplateInput(unittest.TestCase):
         self.assertIn("Comments", tab_names)
         self.assertIn("Whitespace", tab_names)
 
+    @patch('app.ui.template_input.st')
+    def test_analysis_of_template_reading_whole_context(self, mock_st):
+        """Test that templates with includes are analyzed without failing on the whole-context path."""
+        from app.ui.template_input import analyze_template
+
+        analyze_template('{% include "x" %}{{ a }}', state=MagicMock(device_context_data={"b": 1}, property_set_data=None))
+
+        mock_st.error.assert_not_called()
+        self.assertIn("whole context", mock_st.info.call_args_list[0].args[0])
+        codes = [call.args[0] for call in mock_st.code.call_args_list]
+        self.assertIn("(entire context)", codes)
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file